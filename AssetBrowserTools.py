@@ -5,15 +5,27 @@ from pathlib import Path
 
 from bpy_extras import asset_utils
 
+from .AssetCatalog import (
+    CATALOG_FILE_NAME,
+    CatalogLockError,
+    ensure_catalog_path,
+    ensure_catalog_paths,
+    read_catalogs,
+    sanitize_catalog_component,
+)
+from .AssetPreviewQueue import queue_asset_previews
+from .MeshGroupIndex import (
+    find_indexed_asset_instance,
+    is_mesh_group_instance,
+    update_instance_index_object,
+)
 from .util import (
     GROUP_MOD,
     MG_SOCKET_GROUP,
-    check_is_mesh_group_instance,
 )
 
 ASSET_STORAGE_SCENE = "_CAT_AssetInstances"
 ASSET_CATALOG_PATH = "Concept Art Tools/Instances"
-ASSET_CATALOG_SIMPLE_NAME = "Instances"
 ASSET_CATALOG_UUID = str(
     uuid.uuid5(uuid.NAMESPACE_URL, "ConceptArtTools.MeshGroupInstances")
 )
@@ -80,21 +92,6 @@ def object_is_in_scene(obj, scene):
     return any(scene_object == obj for scene_object in scene.objects)
 
 
-# 解析 Asset Catalog Definition File 中的 catalog 行。
-# 参数:
-#     line: CDF 文件中的单行文本。
-def parse_catalog_line(line):
-    stripped_line = line.strip()
-    if not stripped_line or stripped_line.startswith("#") or stripped_line.startswith("VERSION"):
-        return None
-
-    parts = stripped_line.split(":", 2)
-    if len(parts) != 3:
-        return None
-
-    return parts[0], parts[1], parts[2]
-
-
 # 获取当前 Asset Browser 选中的 Catalog UUID。
 # 参数:
 #     context: 当前 Blender operator context。
@@ -112,55 +109,49 @@ def get_active_asset_browser_catalog_id(context):
     return None
 
 
-# 确保当前 blend 文件目录中存在本工具使用的 asset catalog。
+# 生成 source Collection 独立的子 catalog 路径。
 # 参数:
-#     context: 当前 Blender operator context，用于未保存文件时复用当前 Asset Browser Catalog。
-def ensure_instance_asset_catalog(context):
-    if not bpy.data.filepath:
-        return get_active_asset_browser_catalog_id(context)
-
-    catalog_file = Path(bpy.data.filepath).parent / "blender_assets.cats.txt"
-    catalog_line = (
-        f"{ASSET_CATALOG_UUID}:{ASSET_CATALOG_PATH}:{ASSET_CATALOG_SIMPLE_NAME}"
-    )
-
-    if not catalog_file.exists():
-        catalog_file.write_text(
-            "# This is an Asset Catalog Definition file for Blender.\n"
-            "# Empty lines and lines starting with # are ignored.\n"
-            "VERSION 1\n\n"
-            f"{catalog_line}\n",
-            encoding="utf-8",
-        )
-        return ASSET_CATALOG_UUID
-
-    lines = catalog_file.read_text(encoding="utf-8").splitlines()
-    for line in lines:
-        parsed_line = parse_catalog_line(line)
-        if parsed_line is None:
-            continue
+#     base_path: 本工具 catalog 在文件中的实际路径。
+#     source_collection: Mesh Group instance 引用的 source Collection。
+def get_source_catalog_path(base_path, source_collection):
+    source_name = strip_blender_numeric_suffix(source_collection.name)
+    return f"{base_path}/{sanitize_catalog_component(source_name)}"
 
-        catalog_id, catalog_path, _simple_name = parsed_line
-        if catalog_path == ASSET_CATALOG_PATH:
-            return catalog_id
-        if catalog_id == ASSET_CATALOG_UUID:
-            return catalog_id
 
-    lines.append(catalog_line)
-    catalog_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
-    return ASSET_CATALOG_UUID
+# 确保当前 blend 文件目录中存在本工具使用的 asset catalog，返回 source Collection -> Catalog UUID。
+# catalog 文件未变化时只读缓存；缺失的 catalog 一次性加锁追加。
+# 参数:
+#     context: 当前 Blender operator context，用于未保存文件时复用当前 Asset Browser Catalog。
+#     source_collections: 需要 catalog 的 source Collection 列表。
+#     per_source: 是否为每个 source Collection 建立嵌套子 catalog。
+def ensure_instance_asset_catalogs(context, source_collections, per_source=False):
+    if not bpy.data.filepath:
+        catalog_id = get_active_asset_browser_catalog_id(context)
+        return {source_collection: catalog_id for source_collection in source_collections}
+
+    catalog_file = Path(bpy.data.filepath).parent / CATALOG_FILE_NAME
+    base_id = ensure_catalog_path(catalog_file, ASSET_CATALOG_PATH, ASSET_CATALOG_UUID)
+    if not per_source:
+        return {source_collection: base_id for source_collection in source_collections}
+
+    # 用户可能在 Asset Browser 中改过本工具 catalog 的路径，子 catalog 跟随实际路径
+    base_path = read_catalogs(catalog_file)["paths_by_id"].get(base_id, ASSET_CATALOG_PATH)
+    source_paths = {
+        source_collection: get_source_catalog_path(base_path, source_collection)
+        for source_collection in source_collections
+    }
+    catalog_ids = ensure_catalog_paths(catalog_file, source_paths.values())
+    return {
+        source_collection: catalog_ids[catalog_path]
+        for source_collection, catalog_path in source_paths.items()
+    }
 
 
 # 查找已经 mark asset 且引用同一个 source Collection 的 Mesh Group instance。
 # 参数:
 #     source_collection: Mesh Group instance 引用的 source Collection。
 def find_asset_instance_by_source_collection(source_collection):
-    for obj in bpy.data.objects:
-        if obj.asset_data is None or not check_is_mesh_group_instance(obj):
-            continue
-        if get_instance_source_collection(obj) == source_collection:
-            return obj
-    return None
+    return find_indexed_asset_instance(source_collection)
 
 
 # 复制 Mesh Group instance 到 asset storage scene。
@@ -178,6 +169,7 @@ def copy_instance_to_asset_storage(instance_object, storage_scene, replace_objec
     rename_object_cleanly(asset_object, asset_name, replace_object)
     asset_object[ASSET_SOURCE_COLLECTION_PROP] = source_collection.name_full
     storage_scene.collection.objects.link(asset_object)
+    update_instance_index_object(asset_object)
     return asset_object
 
 
@@ -191,7 +183,8 @@ def mark_object_as_instance_asset(asset_object, catalog_id):
     if catalog_id:
         asset_object.asset_data.catalog_id = catalog_id
     asset_object.asset_data.description = "Concept Art Tools Mesh Group Instance"
-    asset_object.asset_generate_preview()
+    update_instance_index_object(asset_object)
+    queue_asset_previews([asset_object])
 
 
 # 刷新当前 Screen 中打开的 Asset Browser 区域。
@@ -231,28 +224,44 @@ class CAT_OT_add_selected_instances_to_asset_browser(bpy.types.Operator):
     bl_description = "Copy selected Mesh Group instances to asset storage and mark them as assets"
     bl_options = {"REGISTER", "UNDO"}
 
+    catalog_per_source: bpy.props.BoolProperty(
+        name="Catalog per Source",
+        description="Put each source group in its own sub-catalog under the instances catalog",
+        default=False,
+    )
+
     @classmethod
     def poll(cls, context):
         return context.mode == "OBJECT" and bool(context.selected_objects)
 
     def execute(self, context):
         storage_scene = get_or_create_asset_storage_scene()
-        catalog_id = ensure_instance_asset_catalog(context)
-        source_collections = set()
-        added_count = 0
+        source_collections = {}
         skipped_count = 0
-        replaced_count = 0
-
         for obj in context.selected_objects:
-            if not check_is_mesh_group_instance(obj):
+            if not is_mesh_group_instance(obj):
                 continue
-
             source_collection = get_instance_source_collection(obj)
             if source_collection in source_collections:
                 skipped_count += 1
                 continue
-            source_collections.add(source_collection)
+            source_collections[source_collection] = obj
+
+        catalog_warning = None
+        try:
+            catalog_ids = ensure_instance_asset_catalogs(
+                context,
+                list(source_collections),
+                self.catalog_per_source,
+            )
+        except (CatalogLockError, OSError) as error:
+            catalog_ids = {}
+            catalog_warning = str(error)
+        added_count = 0
+        replaced_count = 0
 
+        for source_collection, obj in source_collections.items():
+            catalog_id = catalog_ids.get(source_collection)
             existing_asset = find_asset_instance_by_source_collection(source_collection)
             if existing_asset and object_is_in_scene(existing_asset, storage_scene):
                 rename_object_cleanly(existing_asset, get_asset_object_name(source_collection))
@@ -262,6 +271,7 @@ class CAT_OT_add_selected_instances_to_asset_browser(bpy.types.Operator):
 
             if existing_asset:
                 existing_asset.asset_clear()
+                update_instance_index_object(existing_asset)
 
             asset_object = copy_instance_to_asset_storage(
                 obj,
@@ -283,13 +293,16 @@ class CAT_OT_add_selected_instances_to_asset_browser(bpy.types.Operator):
         message = f"Added {added_count}, skipped {skipped_count}"
         if replaced_count:
             message += f", replaced {replaced_count} unsafe asset(s)"
-        if not catalog_id:
+        if catalog_warning:
+            self.report({"WARNING"}, f"{message}; catalog not updated: {catalog_warning}")
+            return {"FINISHED"}
+        if not all(catalog_ids.values()):
             message += "; save the file or select a catalog first"
         self.report({"INFO"}, message)
         return {"FINISHED"}
 
     def invoke(self, context, event):
-        if not any(check_is_mesh_group_instance(obj) for obj in context.selected_objects):
+        if not any(is_mesh_group_instance(obj) for obj in context.selected_objects):
             self.report({"WARNING"}, "Selected objects do not have any Mesh Group instance")
             return {"CANCELLED"}
 
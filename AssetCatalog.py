@@ -0,0 +1,253 @@
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+# 纯 Python 的 Asset Catalog Definition File 读写，不依赖 bpy，可以脱离 Blender 测试。
+
+CATALOG_FILE_NAME = "blender_assets.cats.txt"
+CATALOG_HEADER = (
+    "# This is an Asset Catalog Definition file for Blender.\n"
+    "# Empty lines and lines starting with # are ignored.\n"
+    "VERSION 1\n"
+    "\n"
+)
+CATALOG_UUID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "ConceptArtTools.AssetCatalog")
+CATALOG_LOCK_SUFFIX = ".lock"
+CATALOG_LOCK_TIMEOUT = 10.0
+CATALOG_LOCK_STALE_SECONDS = 60.0
+CATALOG_LOCK_POLL_SECONDS = 0.05
+
+# catalog 文件路径 -> (stat key, 解析结果)，文件未变化时跳过重新解析。
+_catalog_cache = {}
+
+
+class CatalogLockError(RuntimeError):
+    pass
+
+
+# 解析 Asset Catalog Definition File 中的 catalog 行。
+# 参数:
+#     line: CDF 文件中的单行文本。
+def parse_catalog_line(line):
+    stripped_line = line.strip()
+    if not stripped_line or stripped_line.startswith("#") or stripped_line.startswith("VERSION"):
+        return None
+
+    parts = stripped_line.split(":", 2)
+    if len(parts) != 3:
+        return None
+
+    return parts[0], parts[1], parts[2]
+
+
+# 清理 catalog 路径中的单级名称，冒号会破坏 CDF 格式，斜杠会被当作层级。
+# 参数:
+#     name: 要放进 catalog 路径的名称。
+def sanitize_catalog_component(name):
+    return name.replace(":", "-").replace("/", "-").replace("\\", "-").strip() or "Unnamed"
+
+
+# 根据 catalog 路径生成稳定的 UUID，多人同时添加同一路径时得到同一个 ID。
+# 参数:
+#     catalog_path: 以 / 分隔的 catalog 路径。
+def catalog_path_to_uuid(catalog_path):
+    return str(uuid.uuid5(CATALOG_UUID_NAMESPACE, catalog_path))
+
+
+# 生成 Blender 默认格式的 simple name。
+# 参数:
+#     catalog_path: 以 / 分隔的 catalog 路径。
+def get_catalog_simple_name(catalog_path):
+    return catalog_path.replace("/", "-")
+
+
+# 获取 catalog 路径本身及其全部父级路径，父级在前。
+# 参数:
+#     catalog_path: 以 / 分隔的 catalog 路径。
+def iter_catalog_path_parents(catalog_path):
+    parts = catalog_path.split("/")
+    for index in range(1, len(parts) + 1):
+        yield "/".join(parts[:index])
+
+
+# 获取文件的 stat key，文件被替换、修改或改变大小后 key 都会变化。
+# 参数:
+#     catalog_file: catalog 文件路径。
+def get_catalog_stat_key(catalog_file):
+    try:
+        stat = os.stat(catalog_file)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+# 解析 catalog 文本，返回原始行与 path -> id、id -> path 两个查找表。
+# 参数:
+#     text: catalog 文件全文。
+def parse_catalog_text(text):
+    lines = text.splitlines()
+    ids_by_path = {}
+    paths_by_id = {}
+    for line in lines:
+        parsed_line = parse_catalog_line(line)
+        if parsed_line is None:
+            continue
+        catalog_id, catalog_path, _simple_name = parsed_line
+        ids_by_path.setdefault(catalog_path, catalog_id)
+        paths_by_id[catalog_id] = catalog_path
+    return {"lines": lines, "ids_by_path": ids_by_path, "paths_by_id": paths_by_id}
+
+
+# 读取 catalog 文件，按 mtime/size/inode 缓存解析结果；文件不存在时返回空结果。
+# 参数:
+#     catalog_file: catalog 文件路径。
+def read_catalogs(catalog_file):
+    cache_key = str(catalog_file)
+    stat_key = get_catalog_stat_key(catalog_file)
+    if stat_key is None:
+        _catalog_cache.pop(cache_key, None)
+        return parse_catalog_text("")
+
+    cached = _catalog_cache.get(cache_key)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+
+    with open(catalog_file, encoding="utf-8") as file:
+        catalogs = parse_catalog_text(file.read())
+    # 读取期间文件可能被替换，只有 stat 仍一致时才写入缓存
+    if get_catalog_stat_key(catalog_file) == stat_key:
+        _catalog_cache[cache_key] = (stat_key, catalogs)
+    return catalogs
+
+
+# 清空 catalog 解析缓存。
+# 参数: 无。
+def clear_catalog_cache():
+    _catalog_cache.clear()
+
+
+# 用 O_EXCL lock 文件串行化多个进程对同一 catalog 文件的写入。
+# 参数:
+#     catalog_file: catalog 文件路径。
+#     timeout: 等待锁的最长秒数。
+#     stale_after: lock 文件超过该秒数未更新时视为残留并删除。
+@contextmanager
+def catalog_file_lock(
+    catalog_file,
+    timeout=CATALOG_LOCK_TIMEOUT,
+    stale_after=CATALOG_LOCK_STALE_SECONDS,
+):
+    lock_path = str(catalog_file) + CATALOG_LOCK_SUFFIX
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            lock_fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > stale_after:
+                    os.remove(lock_path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise CatalogLockError(f"Timed out waiting for {lock_path}")
+            time.sleep(CATALOG_LOCK_POLL_SECONDS)
+
+    try:
+        os.write(lock_fd, str(os.getpid()).encode("ascii"))
+        os.close(lock_fd)
+        yield
+    finally:
+        try:
+            os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+
+
+# 先写同目录临时文件再 os.replace，读者只会看到完整的旧文件或新文件。
+# 参数:
+#     file_path: 要写入的文件路径。
+#     text: 要写入的全文。
+def write_text_atomic(file_path, text):
+    file_path = Path(file_path)
+    temp_fd, temp_path = tempfile.mkstemp(
+        dir=file_path.parent,
+        prefix=f".{file_path.name}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(temp_fd, "w", encoding="utf-8", newline="\n") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+# 确保 catalog 文件中存在指定路径（包括父级），返回 path -> catalog UUID。
+# 全部已存在时只读缓存，不加锁也不写文件；缺失时在锁内重新读取、追加并原子写入。
+# 参数:
+#     catalog_file: catalog 文件路径。
+#     catalog_paths: 需要存在的 catalog 路径。
+#     preferred_ids: 可选的 path -> UUID，指定新建 catalog 使用的 ID；
+#         该 ID 已存在于其它路径时（例如用户改名）直接复用。
+def ensure_catalog_paths(catalog_file, catalog_paths, preferred_ids=None):
+    preferred_ids = preferred_ids or {}
+    catalog_paths = list(dict.fromkeys(catalog_paths))
+    for catalog_path in catalog_paths:
+        if ":" in catalog_path:
+            raise ValueError(f"Catalog path cannot contain ':': {catalog_path}")
+
+    def resolve(catalogs, catalog_path):
+        preferred_id = preferred_ids.get(catalog_path)
+        if preferred_id and preferred_id in catalogs["paths_by_id"]:
+            return preferred_id
+        return catalogs["ids_by_path"].get(catalog_path)
+
+    catalogs = read_catalogs(catalog_file)
+    resolved = {path: resolve(catalogs, path) for path in catalog_paths}
+    if all(resolved.values()):
+        return resolved
+
+    with catalog_file_lock(catalog_file):
+        # 其它进程可能刚写过，锁内以磁盘内容为准
+        catalogs = read_catalogs(catalog_file)
+        new_lines = []
+        known_paths = set(catalogs["ids_by_path"])
+        for catalog_path in catalog_paths:
+            if resolve(catalogs, catalog_path):
+                continue
+            for parent_path in iter_catalog_path_parents(catalog_path):
+                if parent_path in known_paths or resolve(catalogs, parent_path):
+                    continue
+                catalog_id = preferred_ids.get(parent_path) or catalog_path_to_uuid(parent_path)
+                new_lines.append(
+                    f"{catalog_id}:{parent_path}:{get_catalog_simple_name(parent_path)}"
+                )
+                known_paths.add(parent_path)
+
+        if new_lines:
+            lines = catalogs["lines"] or CATALOG_HEADER.splitlines()
+            write_text_atomic(catalog_file, "\n".join([*lines, *new_lines]) + "\n")
+            catalogs = read_catalogs(catalog_file)
+
+    return {path: resolve(catalogs, path) for path in catalog_paths}
+
+
+# 确保单个 catalog 路径存在并返回其 UUID。
+# 参数:
+#     catalog_file: catalog 文件路径。
+#     catalog_path: 以 / 分隔的 catalog 路径。
+#     catalog_id: 可选，新建时使用的 UUID。
+def ensure_catalog_path(catalog_file, catalog_path, catalog_id=None):
+    preferred_ids = {catalog_path: catalog_id} if catalog_id else None
+    return ensure_catalog_paths(catalog_file, [catalog_path], preferred_ids)[catalog_path]
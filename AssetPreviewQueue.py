@@ -0,0 +1,77 @@
+import bpy
+from bpy.app.handlers import persistent
+
+from .util import get_id_key, resolve_id_key
+
+PREVIEW_BATCH_SIZE = 4
+PREVIEW_TIMER_INTERVAL = 0.1
+
+# 待生成 preview 的 Object key，dict 保持加入顺序并自动去重。
+_preview_queue = {}
+
+
+# 获取当前还在排队的 preview 数量。
+# 参数: 无。
+def get_pending_preview_count():
+    return len(_preview_queue)
+
+
+# 获取每次 timer tick 生成 preview 的数量，来自 Scene 上的 UI 参数。
+# 参数: 无。
+def get_preview_batch_size():
+    scene = bpy.context.scene
+    params = getattr(scene, "cat_params", None) if scene else None
+    if params is None:
+        return PREVIEW_BATCH_SIZE
+    return max(1, params.preview_batch_size)
+
+
+# 把 asset Object 加入 preview 队列，operator 可以立即返回，由 timer 分批生成。
+# 参数:
+#     asset_objects: 需要重新生成 preview 的 asset Object。
+def queue_asset_previews(asset_objects):
+    for asset_object in asset_objects:
+        _preview_queue[get_id_key(asset_object)] = None
+    if _preview_queue and not bpy.app.timers.is_registered(process_preview_queue):
+        bpy.app.timers.register(process_preview_queue, first_interval=PREVIEW_TIMER_INTERVAL)
+
+
+# 清空 preview 队列并停止 timer。
+# 参数: 无。
+def clear_preview_queue():
+    _preview_queue.clear()
+    if bpy.app.timers.is_registered(process_preview_queue):
+        bpy.app.timers.unregister(process_preview_queue)
+
+
+# timer 回调：每次生成一批 preview，队列为空时停止。
+# 参数: 无。
+def process_preview_queue():
+    for _ in range(min(get_preview_batch_size(), len(_preview_queue))):
+        object_key = next(iter(_preview_queue))
+        del _preview_queue[object_key]
+        # 排队期间 Object 可能被删除、改名或取消 asset 标记
+        asset_object = resolve_id_key(bpy.data.objects, object_key)
+        if asset_object is None or asset_object.asset_data is None:
+            continue
+        asset_object.asset_generate_preview()
+
+    if not _preview_queue:
+        return None
+    return PREVIEW_TIMER_INTERVAL
+
+
+@persistent
+def on_load_post(*_args):
+    clear_preview_queue()
+
+
+def register():
+    if on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(on_load_post)
+
+
+def unregister():
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
+    clear_preview_queue()
@@ -0,0 +1,307 @@
+import bpy
+import json
+import os
+import time
+from pathlib import Path
+
+from bpy_extras.io_utils import ExportHelper
+
+from .AssetBrowserTools import (
+    ASSET_STORAGE_SCENE,
+    find_asset_instance_by_source_collection,
+    get_instance_source_collection,
+    object_is_in_scene,
+)
+from .AssetCatalog import write_text_atomic
+from .MeshGroupIndex import is_mesh_group_instance
+from .SourceFingerprint import update_source_fingerprint
+from .util import GROUP_MOD, MG_SOCKET_OFFSET
+
+PUBLISH_MANIFEST_SUFFIX = ".publish.json"
+PUBLISH_MANIFEST_VERSION = 2
+# 浮点数写入发布记录前保留的小数位，避免 float32 误差让比较结果抖动。
+PUBLISH_FLOAT_DIGITS = 6
+
+
+# 获取 library .blend 旁边的发布记录文件路径。
+# 参数:
+#     library_path: 发布目标 library .blend 路径。
+def get_publish_manifest_path(library_path):
+    return Path(library_path).with_suffix(PUBLISH_MANIFEST_SUFFIX)
+
+
+# 读取发布记录，文件不存在或无法解析时返回空记录。
+# 参数:
+#     manifest_path: 发布记录文件路径。
+def read_publish_manifest(manifest_path):
+    try:
+        with open(manifest_path, encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return {"version": PUBLISH_MANIFEST_VERSION, "assets": {}}
+    if manifest.get("version") != PUBLISH_MANIFEST_VERSION:
+        return {"version": PUBLISH_MANIFEST_VERSION, "assets": {}}
+    manifest.setdefault("assets", {})
+    return manifest
+
+
+# 规范化 .blend 路径，用于判断发布记录属于哪个源文件。未保存的文件为空字符串。
+# 参数:
+#     filepath: .blend 文件路径。
+def normalize_source_file(filepath):
+    if not filepath:
+        return ""
+    return os.path.normcase(os.path.abspath(filepath))
+
+
+# 获取发布记录中 asset 所属的源文件，旧记录只在顶层保存 source_file。
+# 参数:
+#     manifest: read_publish_manifest 的结果。
+#     entry: manifest["assets"] 中的一条记录。
+def get_entry_source_file(manifest, entry):
+    return normalize_source_file(entry.get("source_file", manifest.get("source_file", "")))
+
+
+# 获取 bpy.data 中全部 ID 的 session_uid，用于找出本次 append 进来的 datablock。
+# 参数: 无。
+def get_all_id_uids():
+    return {id_data.session_uid for id_data in bpy.data.user_map()}
+
+
+# 从已有的 library .blend 中 append 其他源文件发布的 asset 与 source Collection。
+# 任何一项无法载入时抛出 RuntimeError，避免覆盖写入时把它从 library 中删除。
+# 参数:
+#     library_path: 发布目标 library .blend 路径。
+#     foreign_entries: asset 名称 -> 其他源文件写入的发布记录。
+def append_foreign_assets(library_path, foreign_entries):
+    collection_names = sorted({entry["source_collection"] for entry in foreign_entries.values()})
+    with bpy.data.libraries.load(str(library_path), link=False) as (data_from, data_to):
+        data_to.objects = [name for name in foreign_entries if name in data_from.objects]
+        data_to.collections = [name for name in collection_names if name in data_from.collections]
+
+    appended = [id_data for id_data in (*data_to.objects, *data_to.collections) if id_data]
+    if len(appended) != len(foreign_entries) + len(collection_names):
+        raise RuntimeError(f"Cannot load assets published by other files from {library_path}")
+    return appended
+
+
+# 获取 asset 自身需要发布的状态：pivot 偏移（包含 bounds_mode 的计算结果）、变换与 asset metadata。
+# 这些字段与 source fingerprint 一起决定是否需要重新发布。
+# 参数:
+#     asset_object: storage scene 中的 Mesh Group asset Object。
+def get_asset_publish_state(asset_object):
+    group_modifier = asset_object.modifiers.get(GROUP_MOD)
+    pivot_offset = group_modifier.get(MG_SOCKET_OFFSET) if group_modifier else None
+    asset_data = asset_object.asset_data
+    return {
+        "pivot_offset": [round(value, PUBLISH_FLOAT_DIGITS) for value in pivot_offset or (0, 0, 0)],
+        "matrix_world": [
+            round(value, PUBLISH_FLOAT_DIGITS) for row in asset_object.matrix_world for value in row
+        ],
+        "catalog_id": asset_data.catalog_id,
+        "description": asset_data.description,
+        "author": asset_data.author,
+        "tags": sorted(tag.name for tag in asset_data.tags),
+    }
+
+
+# 获取 asset storage scene 中全部 Mesh Group asset，按名称索引。
+# 参数: 无。
+def get_storage_assets():
+    storage_scene = bpy.data.scenes.get(ASSET_STORAGE_SCENE)
+    if storage_scene is None:
+        return {}
+    return {
+        obj.name_full: obj
+        for obj in storage_scene.objects
+        if obj.asset_data is not None and is_mesh_group_instance(obj)
+    }
+
+
+# 获取选中 Object 对应的 storage asset，选中的可以是 instance 或 asset 本身。
+# 参数:
+#     selected_objects: 当前选中的 Object。
+#     storage_assets: get_storage_assets 的结果。
+def get_selected_storage_assets(selected_objects, storage_assets):
+    storage_scene = bpy.data.scenes.get(ASSET_STORAGE_SCENE)
+    assets = {}
+    for obj in selected_objects:
+        if obj.name_full in storage_assets:
+            assets[obj.name_full] = obj
+            continue
+        if not is_mesh_group_instance(obj):
+            continue
+        asset_object = find_asset_instance_by_source_collection(
+            get_instance_source_collection(obj)
+        )
+        if asset_object is None or not object_is_in_scene(asset_object, storage_scene):
+            continue
+        assets[asset_object.name_full] = asset_object
+    return assets
+
+
+# 一次性把 asset 与 source Collection 写入 library .blend，并更新发布记录。
+# 其他源文件发布的 asset 先从 library 中 append 进来一起写入，写入后再删除。
+# 参数:
+#     library_path: 发布目标 library .blend 路径。
+#     assets: asset 名称 -> asset Object。
+#     fingerprints: asset 名称 -> source fingerprint。
+#     asset_states: asset 名称 -> get_asset_publish_state 的结果。
+#     foreign_entries: asset 名称 -> 其他源文件写入的发布记录，原样保留。
+def write_publish_library(library_path, assets, fingerprints, asset_states, foreign_entries):
+    source_collections = {
+        name: get_instance_source_collection(asset_object) for name, asset_object in assets.items()
+    }
+    datablocks = set(assets.values()) | set(source_collections.values())
+    existing_uids = get_all_id_uids() if foreign_entries else None
+    try:
+        if foreign_entries:
+            datablocks.update(append_foreign_assets(library_path, foreign_entries))
+        bpy.data.libraries.write(
+            str(library_path),
+            datablocks,
+            path_remap="RELATIVE_ALL",
+            fake_user=True,
+            compress=True,
+        )
+    finally:
+        if existing_uids is not None:
+            appended_ids = [
+                id_data for id_data in bpy.data.user_map() if id_data.session_uid not in existing_uids
+            ]
+            if appended_ids:
+                bpy.data.batch_remove(appended_ids)
+
+    published_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+    entries = dict(foreign_entries)
+    for name in assets:
+        entries[name] = {
+            "source_file": bpy.data.filepath,
+            "source_collection": source_collections[name].name_full,
+            "fingerprint": fingerprints[name],
+            "asset_state": asset_states[name],
+            "published_at": published_at,
+        }
+    manifest = {
+        "version": PUBLISH_MANIFEST_VERSION,
+        "assets": {name: entries[name] for name in sorted(entries)},
+    }
+    write_text_atomic(
+        get_publish_manifest_path(library_path),
+        json.dumps(manifest, indent=2, ensure_ascii=False) + "\n",
+    )
+
+
+class CAT_OT_publish_mesh_group_assets(bpy.types.Operator, ExportHelper):
+    bl_idname = "cat.publish_mesh_group_assets"
+    bl_label = "Publish Mesh Group Assets"
+    bl_description = (
+        "Write Mesh Group assets and their source groups to a library .blend, "
+        "skipping the write when no asset or source group changed since the last publish"
+    )
+
+    filename_ext = ".blend"
+    filter_glob: bpy.props.StringProperty(default="*.blend", options={"HIDDEN"})
+    scope: bpy.props.EnumProperty(
+        name="Scope",
+        items=[
+            ("SELECTED", "Selected", "Publish assets of the selected instances", 1),
+            ("ALL", "All", f"Publish every asset in the {ASSET_STORAGE_SCENE} scene", 2),
+        ],
+        default="ALL",
+    )
+    force: bpy.props.BoolProperty(
+        name="Force",
+        description="Write the library even if no asset or source group changed",
+        default=False,
+    )
+
+    def execute(self, context):
+        library_path = Path(bpy.path.abspath(self.filepath))
+        if bpy.data.filepath and library_path == Path(bpy.data.filepath):
+            self.report({"WARNING"}, "Cannot publish into the current file")
+            return {"CANCELLED"}
+
+        storage_assets = get_storage_assets()
+        if self.scope == "SELECTED":
+            requested_assets = get_selected_storage_assets(context.selected_objects, storage_assets)
+        else:
+            requested_assets = dict(storage_assets)
+        if not requested_assets:
+            self.report({"WARNING"}, "No Mesh Group assets to publish")
+            return {"CANCELLED"}
+
+        # libraries.write 会整体覆盖文件，之前发布过的 asset 也要一起写入。
+        # 只删除本文件发布过、现在已不存在的 asset，其他文件发布的 asset 原样保留。
+        manifest = read_publish_manifest(get_publish_manifest_path(library_path))
+        published_entries = manifest["assets"]
+        source_file = normalize_source_file(bpy.data.filepath)
+        assets = dict(requested_assets)
+        dropped_names = []
+        foreign_entries = {}
+        for name, entry in published_entries.items():
+            entry_source_file = get_entry_source_file(manifest, entry)
+            if entry_source_file != source_file:
+                foreign_entries[name] = dict(entry, source_file=entry_source_file)
+            elif name in storage_assets:
+                assets.setdefault(name, storage_assets[name])
+            elif name not in assets:
+                dropped_names.append(name)
+
+        conflicts = sorted(set(foreign_entries) & set(assets))
+        if conflicts:
+            owner = Path(foreign_entries[conflicts[0]]["source_file"]).name or "an unsaved file"
+            self.report(
+                {"WARNING"},
+                f"Asset '{conflicts[0]}' in {library_path.name} is published by {owner}, "
+                f"rename it before publishing ({len(conflicts)} conflict(s))",
+            )
+            return {"CANCELLED"}
+
+        fingerprints = {
+            name: update_source_fingerprint(get_instance_source_collection(asset_object))
+            for name, asset_object in assets.items()
+        }
+        asset_states = {
+            name: get_asset_publish_state(asset_object) for name, asset_object in assets.items()
+        }
+        changed_names = [
+            name
+            for name, fingerprint in fingerprints.items()
+            if published_entries.get(name, {}).get("fingerprint") != fingerprint
+            or published_entries.get(name, {}).get("asset_state") != asset_states[name]
+        ]
+        if (
+            not self.force
+            and not changed_names
+            and not dropped_names
+            and os.path.isfile(library_path)
+        ):
+            self.report(
+                {"INFO"},
+                f"{len(assets)} asset(s) already up to date in {library_path.name}",
+            )
+            return {"FINISHED"}
+
+        try:
+            write_publish_library(
+                library_path,
+                assets,
+                fingerprints,
+                asset_states,
+                foreign_entries,
+            )
+        except (OSError, RuntimeError) as error:
+            self.report({"ERROR"}, f"Publish failed: {error}")
+            return {"CANCELLED"}
+
+        message = (
+            f"Published {len(assets)} asset(s) to {library_path.name}, "
+            f"{len(changed_names)} changed"
+        )
+        if dropped_names:
+            message += f", dropped {len(dropped_names)} missing from this file"
+        if foreign_entries:
+            message += f", kept {len(foreign_entries)} published by other files"
+        self.report({"INFO"}, message)
+        return {"FINISHED"}
@@ -1,61 +1,201 @@
 import bpy
+import json
 
-# 获取当前选中的数据块（从 Outliner 中选中）
-def get_selected_datablock():
-    # 获取 Outliner 的上下文
-    for area in bpy.context.screen.areas:
-        if area.type == 'OUTLINER':
-            for region in area.regions:
-                if region.type == 'WINDOW':
-                    with bpy.context.temp_override(area=area, region=region):
-                        # 获取 Outliner 中选中的数据块
-                        if bpy.context.selected_ids:
-                            return bpy.context.selected_ids[0]  # 返回第一个选中的 ID（数据块）
-    return None
-
-# 查找引用指定数据块的所有用户
-def find_users(datablock):
-    users = []
-    # 遍历所有可能的 Blender 数据块集合
-    for collection_name in dir(bpy.data):
-        collection = getattr(bpy.data, collection_name)
-        # 确保是 bpy_prop_collection 类型（例如 bpy.data.objects, bpy.data.materials 等）
-        if isinstance(collection, bpy.types.bpy_prop_collection):
-            for item in collection:
-                # 检查 item 是否有属性引用了目标数据块
-                for prop in dir(item):
-                    try:
-                        value = getattr(item, prop)
-                        # 如果属性值是指向目标数据块的引用
-                        if value == datablock:
-                            users.append(f"{collection_name}.{item.name}")
-                    except (AttributeError, TypeError):
+from .ReferenceGraph import get_reference_graph, get_user_map
+
+# 查找引用路径时跳过的 RNA 属性：反向引用、派生数据或体量巨大的几何数据。
+SKIPPED_REFERENCE_PROPERTIES = {
+    "rna_type",
+    "id_data",
+    "original",
+    "users_collection",
+    "users_scene",
+    "children_recursive",
+    "all_objects",
+    "vertices",
+    "edges",
+    "loops",
+    "polygons",
+    "loop_triangles",
+    "loop_triangle_polygons",
+    "attributes",
+    "color_attributes",
+    "uv_layers",
+    "vertex_colors",
+    "vertex_normals",
+    "polygon_normals",
+    "corner_normals",
+    "keyframe_points",
+    "points",
+    "bound_box",
+}
+# Object.children 是反向引用，Collection.children 是正向引用，只跳过前者。
+SKIPPED_OBJECT_PROPERTIES = {"children"}
+MAX_REFERENCE_DEPTH = 6
+MAX_REFERENCE_COLLECTION_ITEMS = 4096
+USERS_REPORT_TEXT = "CAT_AssetUsers.json"
+
+
+# 获取当前在 Outliner 中选中的全部数据块。
+# 参数:
+#     context: 当前 Blender context。
+def get_selected_datablocks(context):
+    if context.screen is None:
+        return []
+    for area in context.screen.areas:
+        if area.type != "OUTLINER":
+            continue
+        for region in area.regions:
+            if region.type != "WINDOW":
+                continue
+            with context.temp_override(area=area, region=region):
+                selected_ids = list(bpy.context.selected_ids)
+            if selected_ids:
+                return list(dict.fromkeys(selected_ids))
+    return []
+
+
+# 在 user ID 的 RNA 结构中查找指向目标数据块的属性路径。
+# 只会深入非 ID 的子结构和 embedded ID（例如材质的 node_tree），不会跨到其它 ID。
+# 参数:
+#     user_id: 引用目标的 ID。
+#     targets: 目标数据块集合。
+def find_reference_paths(user_id, targets):
+    paths = []
+    visited = set()
+
+    def walk(struct, path, depth):
+        pointer = struct.as_pointer()
+        if pointer in visited or depth > MAX_REFERENCE_DEPTH:
+            return
+        visited.add(pointer)
+        is_object = isinstance(struct, bpy.types.Object)
+        for prop in struct.bl_rna.properties:
+            identifier = prop.identifier
+            if identifier in SKIPPED_REFERENCE_PROPERTIES:
+                continue
+            if is_object and identifier in SKIPPED_OBJECT_PROPERTIES:
+                continue
+            if prop.type == "POINTER":
+                try:
+                    value = getattr(struct, identifier)
+                except (AttributeError, RuntimeError):
+                    continue
+                visit(value, f"{path}.{identifier}" if path else identifier, depth)
+            elif prop.type == "COLLECTION":
+                try:
+                    items = getattr(struct, identifier)
+                    if len(items) > MAX_REFERENCE_COLLECTION_ITEMS:
                         continue
-    return users
+                except (AttributeError, RuntimeError, TypeError):
+                    continue
+                for index, item in enumerate(items):
+                    item_name = getattr(item, "name", None)
+                    item_key = f'"{item_name}"' if item_name else str(index)
+                    item_path = f"{identifier}[{item_key}]"
+                    visit(item, f"{path}.{item_path}" if path else item_path, depth)
+
+    def visit(value, path, depth):
+        if value is None:
+            return
+        if isinstance(value, bpy.types.ID):
+            if value in targets:
+                paths.append((value, path))
+            elif value.is_embedded_data:
+                walk(value, path, depth + 1)
+            return
+        if isinstance(value, bpy.types.bpy_struct):
+            walk(value, path, depth + 1)
+
+    walk(user_id, "", 0)
+    return paths
+
+
+# 从缓存的反向引用图查询全部目标的用户，返回 目标 -> 结构化结果列表。
+# 引用图没有覆盖到的 user 由 user_map 补充，再单独查找引用路径。
+# 参数:
+#     datablocks: 要查询用户的数据块列表。
+def find_users_batch(datablocks):
+    references = get_reference_graph()
+    user_map = get_user_map()
+    results = {}
+    for datablock in datablocks:
+        entries = list(references.get(datablock, ()))
+        covered_users = {user for user, _path in entries}
+        for user in user_map.get(datablock, ()):
+            if user in covered_users:
+                continue
+            paths = [path for _target, path in find_reference_paths(user, {datablock})]
+            entries.extend((user, path) for path in paths or [""])
+
+        entries.sort(key=lambda entry: (entry[0].id_type, entry[0].name_full, entry[1]))
+        results[datablock] = [
+            {
+                "user": user.name_full,
+                "id_type": user.id_type,
+                "path": path,
+            }
+            for user, path in entries
+        ]
+    return results
+
+
+# 查找引用指定数据块的所有用户。
+# 参数:
+#     datablock: 要查询用户的数据块。
+def find_users(datablock):
+    return find_users_batch([datablock])[datablock]
+
+
+# 把查询结果转成 JSON 文本，每个被查询的数据块一条记录。
+# 参数:
+#     results: find_users_batch 返回的结果。
+def users_report_to_json(results):
+    report = {
+        "datablocks": [
+            {
+                "id_type": datablock.id_type,
+                "name": datablock.name_full,
+                "library": datablock.library.filepath if datablock.library else "",
+                "users": users,
+            }
+            for datablock, users in results.items()
+        ],
+    }
+    return json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+
+
+# 把 JSON 报告写入 Text datablock，方便在 Text Editor 中查看。
+# 参数:
+#     json_text: users_report_to_json 生成的文本。
+def write_users_report_text(json_text):
+    text = bpy.data.texts.get(USERS_REPORT_TEXT)
+    if text is None:
+        text = bpy.data.texts.new(USERS_REPORT_TEXT)
+    text.from_string(json_text)
+    return text
 
 
 class CAT_OT_find_asset_users(bpy.types.Operator):
     bl_idname = "cat.find_asset_users"
     bl_label = "Find Asset Users"
+    bl_description = (
+        "List the users of the data-blocks selected in the Outliner "
+        f"and store the result in the {USERS_REPORT_TEXT} text"
+    )
 
     def execute(self, context):
-        print("Finding users...")
-        selected = get_selected_datablock()
-        
+        selected = get_selected_datablocks(context)
         if not selected:
-            print("No datablock selected in the Outliner.")
-            return
-        
-        print(f"Selected datablock: {selected.name} (Type: {type(selected).__name__})")
-        
-        # 查找用户
-        users = find_users(selected)
-        
-        if users:
-            print(f"Users of '{selected.name}':")
-            for user in users:
-                print(f" - {user}")
-        else:
-            print(f"No users found for '{selected.name}'.")
-        return {"FINISHED"}
+            self.report({"WARNING"}, "No datablock selected in the Outliner")
+            return {"CANCELLED"}
 
+        results = find_users_batch(selected)
+        write_users_report_text(users_report_to_json(results))
+        user_count = sum(len(users) for users in results.values())
+        self.report(
+            {"INFO"},
+            f"Found {user_count} reference(s) to {len(selected)} datablock(s), "
+            f"see {USERS_REPORT_TEXT}",
+        )
+        return {"FINISHED"}
@@ -1,11 +1,21 @@
 import bpy
-from mathutils import Vector
+from mathutils import Quaternion, Vector
+from .MeshGroupPivotCache import get_source_collection_bounds
 from .util import *
 
 EDIT_SCENE_PREFIX = "_CAT_temp:"
+# 每个文件复用同一个 isolate 场景，进入时只切换 source Collection
+EDIT_SCENE_NAME = f"{EDIT_SCENE_PREFIX}Isolate"
 LIGHT_COLLECTION_NAME = "_CAT_Lights"
 EDIT_OFFSET_PROP = "_CAT_isolate_group_edit_offset"
 ORIGINAL_SCENE_PROP = "_CAT_isolate_group_original_scene"
+ORIGINAL_VIEW_PROP = "_CAT_isolate_group_original_view"
+# 嵌套 isolate 时保存上一层的 source、平移量与视图，退出时逐层还原
+ISOLATE_STACK_PROP = "_CAT_isolate_group_stack"
+ISOLATE_MODE_ITEMS = [
+    ("TRANSLATE", "Move Source", "Move the source group to the instance location (legacy)", 1),
+    ("VIEW", "Frame View", "Leave source objects in place and frame the view on them", 2),
+]
 
 
 def get_all_lights():
@@ -75,6 +85,194 @@ def get_original_scene(scene):
     return bpy.data.scenes.get(original_scene_name)
 
 
+def get_edit_scene():
+    """
+    获取可复用的 isolate 场景，不存在时用 data API 创建，避免 bpy.ops.scene.new 的开销。
+    参数: 无。
+    """
+    edit_scene = bpy.data.scenes.get(EDIT_SCENE_NAME)
+    if edit_scene is None:
+        edit_scene = bpy.data.scenes.new(EDIT_SCENE_NAME)
+    return edit_scene
+
+
+def release_edit_scene_sources(edit_scene):
+    """
+    把 isolate 场景中的 source Collection 平移回原位、隐藏并解除链接。
+    参数:
+        edit_scene: Blender Scene，可复用的 isolate 场景。
+    """
+    edit_offset = get_scene_edit_offset(edit_scene)
+    for coll in get_source_scene_collections(edit_scene):
+        translate_collection_roots(coll, -edit_offset)
+        coll.hide_viewport = True
+        edit_scene.collection.children.unlink(coll)
+    set_scene_edit_offset(edit_scene, WORLD_ORIGIN)
+
+
+def retarget_edit_scene(edit_scene, source_group):
+    """
+    让 isolate 场景只链接目标 source Collection，上次未正常退出的残留会先还原。
+    参数:
+        edit_scene: Blender Scene，可复用的 isolate 场景。
+        source_group: 本次要编辑的 source Collection。
+    """
+    release_edit_scene_sources(edit_scene)
+    edit_scene.collection.children.link(source_group)
+
+
+def get_isolate_stack(edit_scene):
+    """
+    读取嵌套 isolate 的层级记录，最后一项是上一层。
+    参数:
+        edit_scene: Blender Scene，可复用的 isolate 场景。
+    """
+    return [level.to_dict() for level in edit_scene.get(ISOLATE_STACK_PROP, ())]
+
+
+def set_isolate_stack(edit_scene, stack):
+    """
+    保存嵌套 isolate 的层级记录，为空时删除属性。
+    参数:
+        edit_scene: Blender Scene，可复用的 isolate 场景。
+        stack: get_isolate_stack 格式的层级列表。
+    """
+    if stack:
+        edit_scene[ISOLATE_STACK_PROP] = stack
+    elif ISOLATE_STACK_PROP in edit_scene:
+        del edit_scene[ISOLATE_STACK_PROP]
+
+
+def push_isolate_level(edit_scene):
+    """
+    在 isolate 场景内再次 isolate 时，记录当前层的 source、平移量与视图，然后还原当前 source。
+    参数:
+        edit_scene: Blender Scene，可复用的 isolate 场景。
+    """
+    level = {
+        "sources": [coll.name for coll in get_source_scene_collections(edit_scene)],
+        "offset": list(get_scene_edit_offset(edit_scene)),
+    }
+    view_state = edit_scene.get(ORIGINAL_VIEW_PROP)
+    if view_state is not None:
+        level["view"] = list(view_state)
+        del edit_scene[ORIGINAL_VIEW_PROP]
+    set_isolate_stack(edit_scene, get_isolate_stack(edit_scene) + [level])
+    release_edit_scene_sources(edit_scene)
+
+
+def pop_isolate_level(edit_scene):
+    """
+    退出一层嵌套 isolate，重新链接上一层的 source 并恢复平移量与视图记录。
+    没有上一层时返回 False。
+    参数:
+        edit_scene: Blender Scene，可复用的 isolate 场景。
+    """
+    stack = get_isolate_stack(edit_scene)
+    if not stack:
+        return False
+    level = stack.pop()
+    set_isolate_stack(edit_scene, stack)
+
+    edit_offset = Vector(level["offset"])
+    for source_name in level["sources"]:
+        coll = bpy.data.collections.get(source_name)
+        if coll is None:
+            continue
+        edit_scene.collection.children.link(coll)
+        coll.hide_viewport = False
+        translate_collection_roots(coll, edit_offset)
+    set_scene_edit_offset(edit_scene, edit_offset)
+    if "view" in level:
+        edit_scene[ORIGINAL_VIEW_PROP] = level["view"]
+    return True
+
+
+def sync_edit_scene_lights(edit_scene):
+    """
+    按差异同步 isolate 场景中的灯光，只链接新增灯光、移除已不存在的灯光。
+    参数:
+        edit_scene: Blender Scene，可复用的 isolate 场景。
+    """
+    all_lights = set(get_all_lights())
+    light_collection = edit_scene.collection.children.get(LIGHT_COLLECTION_NAME)
+    if light_collection is None:
+        if not all_lights:
+            return 0, 0
+        light_collection = bpy.data.collections.new(LIGHT_COLLECTION_NAME)
+        edit_scene.collection.children.link(light_collection)
+        light_collection.hide_select = True
+
+    linked_lights = set(light_collection.objects)
+    added_lights = all_lights - linked_lights
+    removed_lights = linked_lights - all_lights
+    for light in added_lights:
+        light_collection.objects.link(light)
+    for light in removed_lights:
+        light_collection.objects.unlink(light)
+    return len(added_lights), len(removed_lights)
+
+
+def get_view_region_3d(context):
+    """
+    获取当前 3D 视图的 RegionView3D，找不到时返回 None。
+    参数:
+        context: 当前 Blender context。
+    """
+    space = context.space_data
+    if space and space.type == "VIEW_3D":
+        return space.region_3d
+    for area in context.window.screen.areas if context.window else ():
+        if area.type == "VIEW_3D":
+            return area.spaces.active.region_3d
+    return None
+
+
+def save_view_state(scene, region_3d):
+    """
+    记录进入 isolate 前的视图位置，退出时还原。
+    参数:
+        scene: Blender Scene，保存 isolate 状态的临时场景。
+        region_3d: 当前 3D 视图的 RegionView3D。
+    """
+    scene[ORIGINAL_VIEW_PROP] = [
+        *region_3d.view_location,
+        *region_3d.view_rotation,
+        region_3d.view_distance,
+    ]
+
+
+def restore_view_state(scene, region_3d):
+    """
+    还原 save_view_state 记录的视图位置并清除记录。
+    参数:
+        scene: Blender Scene，保存 isolate 状态的临时场景。
+        region_3d: 当前 3D 视图的 RegionView3D，可以为 None。
+    """
+    view_state = scene.get(ORIGINAL_VIEW_PROP)
+    if view_state is None:
+        return
+    del scene[ORIGINAL_VIEW_PROP]
+    if region_3d is None:
+        return
+    view_state = list(view_state)
+    region_3d.view_location = Vector(view_state[0:3])
+    region_3d.view_rotation = Quaternion(view_state[3:7])
+    region_3d.view_distance = view_state[7]
+
+
+def frame_view_on_bounds(region_3d, bounds_min, bounds_max):
+    """
+    直接设置视图中心与距离，代替选中全部 source Object 后 view_selected。
+    参数:
+        region_3d: 当前 3D 视图的 RegionView3D。
+        bounds_min: mathutils.Vector，world space 包围盒最小点。
+        bounds_max: mathutils.Vector，world space 包围盒最大点。
+    """
+    region_3d.view_location = (bounds_min + bounds_max) / 2
+    region_3d.view_distance = max((bounds_max - bounds_min).length, 0.1)
+
+
 def translate_collection_roots(collection, offset):
     """
     按 world offset 平移 Collection 根 Object，保持子 Object 相对父级的位置。
@@ -99,25 +297,40 @@ class CAT_OT_isolate_group(bpy.types.Operator):
     bl_description = "Toggle Edit Source Group, good for material authorin"
     bl_options = {"REGISTER", "UNDO"}
 
+    isolate_mode: bpy.props.EnumProperty(
+        name="Mode",
+        items=ISOLATE_MODE_ITEMS,
+        default="TRANSLATE",
+    )
+
     def quit_edit_scene(self):
-        """remove temp edit collection-instance scene and clean up data"""
+        """restore source collections, keep the reusable edit scene, return timing text"""
         scene = bpy.context.scene
         if not scene.name.startswith(EDIT_SCENE_PREFIX):
-            return False
+            return None
+
+        timer = StageTimer()
+        release_edit_scene_sources(scene)
+        timer.mark("restore")
 
-        source_collections = get_source_scene_collections(scene)
-        edit_offset = get_scene_edit_offset(scene)
-        for coll in source_collections:
-            translate_collection_roots(coll, -edit_offset)
-            coll.hide_viewport = True
+        # 嵌套 isolate 只退出一层，回到上一层的 source
+        restore_view_state(scene, get_view_region_3d(bpy.context))
+        if pop_isolate_level(scene):
+            timer.mark("switch")
+            return timer.format()
 
         original_scene = get_original_scene(scene)
         if original_scene and bpy.context.window:
             bpy.context.window.scene = original_scene
+        timer.mark("switch")
 
-        bpy.data.scenes.remove(scene)
-        bpy.ops.outliner.orphans_purge(do_local_ids=True)
-        return True
+        # 旧版本按 source 命名的临时场景不再复用，退出时删除
+        if scene.name != EDIT_SCENE_NAME:
+            bpy.data.scenes.remove(scene)
+        return timer.format()
+
+    def report_quit_edit(self, quit_timing):
+        self.report({"INFO"}, f"Already in edit scene mode, Quit Edit in {quit_timing}")
 
     def execute(self, context):
         # prefs = context.preferences.addons[package_name].preferences
@@ -127,7 +340,7 @@ class CAT_OT_isolate_group(bpy.types.Operator):
         if len(selected_objects) == 0:
             quit_edit = self.quit_edit_scene()
             if quit_edit:
-                self.report({"INFO"}, "Already in edit scene mode, Quit Edit")
+                self.report_quit_edit(quit_edit)
             return {"FINISHED"}
 
         # 检查ActiveObject是否Mesh Group Instance
@@ -135,7 +348,7 @@ class CAT_OT_isolate_group(bpy.types.Operator):
             print("No active object")
             quit_edit = self.quit_edit_scene()
             if quit_edit:
-                self.report({"INFO"}, "Already in edit scene mode, Quit Edit")
+                self.report_quit_edit(quit_edit)
                 return {"FINISHED"}
             self.report({"WARNING"}, "No active object")
             return {"CANCELLED"}
@@ -152,58 +365,64 @@ class CAT_OT_isolate_group(bpy.types.Operator):
             print("Active item is not a Mesh Group Instance")
             quit_edit = self.quit_edit_scene()
             if quit_edit:
-                self.report({"INFO"}, "Already in edit scene mode, Quit Edit")
+                self.report_quit_edit(quit_edit)
                 return {"FINISHED"}
 
             self.report({"WARNING"}, "Active item is not a Mesh Group Instance")
             return {"CANCELLED"}
 
-        # print(f"Editing Group: {source_group.name}")
-        self.report({"INFO"}, f"Editing Group: {source_group.name}")
-
+        timer = StageTimer()
         original_scene = context.scene
-        all_lights = get_all_lights()
         # get current world, get current world node tree
         scene_world = original_scene.world
         scene_world_tree = scene_world.node_tree if scene_world else None
 
-        # temp_scene_name
-        scene_name = f"{EDIT_SCENE_PREFIX}{source_group.name}"
-        bpy.ops.scene.new(type="EMPTY")
-        edit_scene = bpy.context.scene
-        edit_scene.name = scene_name
-        set_original_scene(edit_scene, original_scene)
-        bpy.context.window.scene = edit_scene
-        edit_scene.collection.children.link(source_group)
-
-        # 把主场景中的灯光复制到编辑场景中，确保显示效果一致
-        if len(all_lights) > 0:
-            light_collection = bpy.data.collections.new(LIGHT_COLLECTION_NAME)
-            edit_scene.collection.children.link(light_collection)
-            light_collection.hide_select = True
-            for light in all_lights:
-                light_collection.objects.link(light)
+        edit_scene = get_edit_scene()
+        if original_scene == edit_scene:
+            # 在 isolate 场景内再次 isolate，保留原始 Scene，当前层压入层级记录
+            push_isolate_level(edit_scene)
+        else:
+            set_original_scene(edit_scene, original_scene)
+            set_isolate_stack(edit_scene, [])
+        retarget_edit_scene(edit_scene, source_group)
+        timer.mark("scene")
+
+        # 把主场景中的灯光链接到编辑场景中，确保显示效果一致；只同步差异
+        sync_edit_scene_lights(edit_scene)
+        timer.mark("lights")
         # 复制主场景的Wolrd shader， 保证环境光一致
         if scene_world_tree and scene_world_tree.nodes:  # use base scene background
             edit_scene.world = scene_world
-        elif not scene_world_tree:  # create a new world when there is no world
-            edit_scene.world = bpy.data.worlds.new(bpy.context.scene.name)
+        elif not scene_world_tree and edit_scene.world in (None, scene_world):
+            # create a new world once when there is no world
+            edit_scene.world = bpy.data.worlds.new(EDIT_SCENE_NAME)
             edit_scene.world.use_nodes = True
             tree = edit_scene.world.node_tree
             tree.nodes["Background"].inputs["Color"].default_value = (0.3, 0.3, 0.3, 1)
+        bpy.context.window.scene = edit_scene
 
         # Select the collection
         bpy.context.view_layer.active_layer_collection = (
             bpy.context.view_layer.layer_collection.children[source_group.name]
         )
         source_group.hide_viewport = False
-        edit_offset = inst_location + inst_offset
-        set_scene_edit_offset(edit_scene, edit_offset)
-        translate_collection_roots(source_group, edit_offset)
-        source_objs = source_group.all_objects
-        for obj in source_objs:
-            obj.select_set(True)
-
-        bpy.ops.view3d.view_selected()
-
+        region_3d = get_view_region_3d(context)
+        if self.isolate_mode == "VIEW" and region_3d is not None:
+            # source 保持原位，不写 transform，instance 不会被重新计算
+            save_view_state(edit_scene, region_3d)
+            frame_view_on_bounds(region_3d, *get_source_collection_bounds(source_group))
+            timer.mark("view")
+        else:
+            edit_offset = inst_location + inst_offset
+            set_scene_edit_offset(edit_scene, edit_offset)
+            translate_collection_roots(source_group, edit_offset)
+            source_objs = source_group.all_objects
+            for obj in source_objs:
+                obj.select_set(True)
+            timer.mark("source")
+
+            bpy.ops.view3d.view_selected()
+            timer.mark("view")
+
+        self.report({"INFO"}, f"Editing Group: {source_group.name} in {timer.format()}")
         return {"FINISHED"}
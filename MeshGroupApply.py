@@ -1,39 +1,186 @@
 import bpy
+import numpy as np
 from mathutils import Vector
 
+from .MeshGroupIndex import is_mesh_group_instance
 from .util import (
     CUSTOM_NAME,
+    GEOMETRY_OBJECT_TYPES,
     GROUP_MOD,
     INSTANCE_NAME,
+    MESH_ATTRIBUTE_FORMATS,
     MG_SOCKET_GROUP,
     MG_SOCKET_OFFSET,
     PIVOT_NAME,
-    check_is_mesh_group_instance,
+    StageTimer,
+    estimate_mesh_bytes,
+    format_bytes,
 )
 
-READONLY_MODIFIER_ATTRIBUTES = {
-    "bl_rna",
+# 这些 modifier 把数据存放在 mesh datablock 上，共用 mesh 时会互相影响，需要 single user。
+SINGLE_USER_MODIFIER_TYPES = {"MULTIRES"}
+# 这些属性由 Blender 管理或决定 Modifier 身份，复制 Modifier 本身时跳过。
+SKIPPED_MODIFIER_PROPERTIES = {
     "error_location",
     "error_rotation",
     "execution_time",
     "is_active",
     "name",
+    "persistent_uid",
     "rna_type",
     "type",
 }
+# 只有这些由 Modifier 自己持有的嵌套 struct 递归复制，修改点位后需要调用 update() 重新计算内部数据。
+# 其它非 ID pointer（如 bake 指回的 node）指向 Modifier 之外的数据，不复制。
+UPDATED_NESTED_STRUCT_TYPES = {"CurveMapping", "CurveProfile"}
+# 嵌套 struct 的最大递归深度，防止异常的 pointer 循环。
+MAX_STRUCT_COPY_DEPTH = 6
+# edge 由 calc_edges 重建，只有 point、face 与 corner 上的 attribute 能按顺序拼接。
+MERGED_ATTRIBUTE_DOMAINS = {"POINT", "FACE", "CORNER"}
+# 这些 attribute 已经通过顶点坐标、材质索引与 smooth 单独处理。
+MERGED_BUILTIN_ATTRIBUTES = {"position", "material_index", "sharp_face"}
+# bl_rna identifier -> ((属性名, 复制方式), ...)，每种 RNA 类型只解析一次。
+# 复制方式: VALUE 直接 setattr，COLLECTION 按元素复制，STRUCT 递归复制自有的嵌套 struct。
+_struct_schema_cache = {}
 
 
-# 复制 Modifier 可写参数。
+# 判断 RNA struct 定义是否为 ID 类型。
+# 参数:
+#     struct_rna: pointer 属性的 fixed_type。
+def rna_struct_is_id(struct_rna):
+    while struct_rna is not None:
+        if struct_rna.identifier == "ID":
+            return True
+        struct_rna = struct_rna.base
+    return False
+
+
+# 获取 RNA struct 可复制的属性列表，按 bl_rna identifier 缓存。
+# 参数:
+#     struct: Modifier，或 Modifier 下的嵌套 struct、collection 元素。
+def get_struct_copy_schema(struct):
+    bl_rna = struct.bl_rna
+    schema = _struct_schema_cache.get(bl_rna.identifier)
+    if schema is not None:
+        return schema
+
+    # 只有 Modifier 本身跳过 name，collection 元素的 name 需要复制
+    skipped = SKIPPED_MODIFIER_PROPERTIES if isinstance(struct, bpy.types.Modifier) else {"rna_type"}
+    fields = []
+    for prop in bl_rna.properties:
+        identifier = prop.identifier
+        if identifier in skipped:
+            continue
+        if prop.type == "COLLECTION":
+            fields.append((identifier, "COLLECTION"))
+        elif prop.type == "POINTER" and not rna_struct_is_id(prop.fixed_type):
+            # custom_profile 等嵌套 struct 的 pointer 本身只读，但内容可以修改
+            if prop.fixed_type.identifier in UPDATED_NESTED_STRUCT_TYPES:
+                fields.append((identifier, "STRUCT"))
+        elif not prop.is_readonly:
+            # 普通值、数组、enum flag 与 ID pointer 都可以直接 setattr
+            fields.append((identifier, "VALUE"))
+    schema = _struct_schema_cache[bl_rna.identifier] = tuple(fields)
+    return schema
+
+
+# 为目标 collection 新建一个元素，支持 add()/new() 无参数或以点位坐标为参数。
+# 参数:
+#     target_collection: 目标 collection。
+#     source_item: 对应的源元素，点位类 collection 用它的 location 作为参数。
+def add_collection_item(target_collection, source_item):
+    for function_name in ("add", "new"):
+        function = getattr(target_collection, function_name, None)
+        if function is None:
+            continue
+        try:
+            return function()
+        except TypeError:
+            location = getattr(source_item, "location", None)
+            if location is None:
+                return None
+            try:
+                return function(*location)
+            except (TypeError, RuntimeError, ValueError):
+                return None
+        except RuntimeError:
+            return None
+    return None
+
+
+# 删除目标 collection 的最后一个元素，成功时返回 True。
+# 参数:
+#     target_collection: 目标 collection。
+def remove_last_collection_item(target_collection):
+    function = getattr(target_collection, "remove", None)
+    if function is None:
+        return False
+    for argument in (target_collection[-1], len(target_collection) - 1):
+        try:
+            function(argument)
+            return True
+        except (TypeError, RuntimeError, ValueError):
+            continue
+    return False
+
+
+# 让目标 collection 的元素数量与源 collection 一致，RNA 不允许增删时保持原样。
+# 参数:
+#     source_collection: 源 collection。
+#     target_collection: 目标 collection。
+def match_collection_length(source_collection, target_collection):
+    while len(target_collection) < len(source_collection):
+        if add_collection_item(target_collection, source_collection[len(target_collection)]) is None:
+            break
+    while len(target_collection) > len(source_collection):
+        if not remove_last_collection_item(target_collection):
+            break
+
+
+# 按缓存的 schema 复制 RNA struct 的可写属性。
+# collection 先对齐元素数量再逐个复制，自有的嵌套 struct 递归复制。
+# 参数:
+#     source_struct: 被复制的 struct。
+#     target_struct: 同类型的目标 struct。
+#     depth: 当前递归深度。
+def copy_struct_properties(source_struct, target_struct, depth=0):
+    for identifier, copy_mode in get_struct_copy_schema(source_struct):
+        if copy_mode == "COLLECTION":
+            source_collection = getattr(source_struct, identifier)
+            target_collection = getattr(target_struct, identifier)
+            match_collection_length(source_collection, target_collection)
+            for source_item, target_item in zip(source_collection, target_collection):
+                copy_struct_properties(source_item, target_item, depth + 1)
+            continue
+        if copy_mode == "STRUCT":
+            if depth >= MAX_STRUCT_COPY_DEPTH:
+                continue
+            source_value = getattr(source_struct, identifier)
+            target_value = getattr(target_struct, identifier)
+            if source_value is None or target_value is None:
+                continue
+            if source_value.as_pointer() == target_value.as_pointer():
+                continue
+            copy_struct_properties(source_value, target_value, depth + 1)
+            target_value.update()
+            continue
+        try:
+            setattr(target_struct, identifier, getattr(source_struct, identifier))
+        except (AttributeError, TypeError, ValueError):
+            continue
+
+
+# 复制 Modifier 可写参数，以及 Geometry Nodes socket 等 IDProperty。
 # 参数:
 #     source_modifier: 原 Object 上的 Modifier。
 #     target_modifier: 新 Object 上同类型的 Modifier。
 def copy_modifier_settings(source_modifier, target_modifier):
-    for attribute_name in dir(source_modifier):
-        if attribute_name.startswith("_") or attribute_name in READONLY_MODIFIER_ATTRIBUTES:
-            continue
+    # node_group 等 pointer 先赋值，Geometry Nodes 的 socket IDProperty 才会存在
+    copy_struct_properties(source_modifier, target_modifier)
+    for key in source_modifier.keys():
         try:
-            setattr(target_modifier, attribute_name, getattr(source_modifier, attribute_name))
-        except (AttributeError, TypeError):
+            target_modifier[key] = source_modifier[key]
+        except (KeyError, TypeError, ValueError):
             continue
 
 
@@ -66,11 +213,385 @@ def get_instance_translation_offset(instance_object, group_modifier):
     return instance_object.matrix_world.translation.copy() + mesh_group_offset
 
 
-# 把单个 Mesh Group instance 转成真实 Object。
+# 判断 apply 出来的 Object 是否必须使用独立的 data。
+# 参数:
+#     source_object: source Collection 中被复制的 Object。
+#     modifiers_to_copy: 从 instance 复制到新 Object 上的 Modifier 列表。
+def requires_single_user_data(source_object, modifiers_to_copy):
+    return any(
+        modifier.type in SINGLE_USER_MODIFIER_TYPES
+        for modifier in (*source_object.modifiers, *modifiers_to_copy)
+    )
+
+
+# 为新 Object 指定 data：link 模式下共用 source data，否则或必要时复制。
+# 参数:
+#     new_object: source_object.copy() 得到的新 Object。
+#     source_object: source Collection 中被复制的 Object。
+#     modifiers_to_copy: 从 instance 复制到新 Object 上的 Modifier 列表。
+#     link_data: 是否尽量共用 source data。
+#     stats: 可选的统计字典，记录共用的 data 数量与节省的 mesh 内存估算。
+def assign_applied_object_data(new_object, source_object, modifiers_to_copy, link_data, stats):
+    source_data = source_object.data
+    if not source_data:
+        return
+    if not link_data or requires_single_user_data(source_object, modifiers_to_copy):
+        new_object.data = source_data.copy()
+        return
+
+    new_object.data = source_data
+    if stats is None:
+        return
+    stats["linked_data"] = stats.get("linked_data", 0) + 1
+    if isinstance(source_data, bpy.types.Mesh):
+        mesh_bytes = stats.setdefault("mesh_bytes", {})
+        if source_data not in mesh_bytes:
+            mesh_bytes[source_data] = estimate_mesh_bytes(source_data)
+        stats["saved_bytes"] = stats.get("saved_bytes", 0) + mesh_bytes[source_data]
+
+
+# 把 source Object 复制到 instance 的位置并复制 instance 上的 Modifier，新 Object 尚未链接到 Collection。
+# 参数:
+#     source_object: source Collection 中被复制的 Object。
+#     source_matrix: source Object 的 world matrix。
+#     instance_offset: get_instance_translation_offset 的结果。
+#     modifiers_to_copy: 从 instance 复制到新 Object 上的 Modifier 列表。
+#     link_data: 是否尽量共用 source data。
+#     stats: 可选的统计字典，由 assign_applied_object_data 填写。
+def copy_source_object(
+    source_object,
+    source_matrix,
+    instance_offset,
+    modifiers_to_copy,
+    link_data=False,
+    stats=None,
+):
+    new_object = source_object.copy()
+    assign_applied_object_data(
+        new_object,
+        source_object,
+        modifiers_to_copy,
+        link_data,
+        stats,
+    )
+    new_object.name = CUSTOM_NAME + source_object.name
+    new_object.parent = None
+
+    matrix_world = source_matrix.copy()
+    matrix_world.translation += instance_offset
+    new_object.matrix_world = matrix_world
+
+    for source_modifier in modifiers_to_copy:
+        new_modifier = new_object.modifiers.new(source_modifier.name, source_modifier.type)
+        copy_modifier_settings(source_modifier, new_modifier)
+    return new_object
+
+
+# 读取 evaluated mesh 上可以合并的 attribute，无法合并的数据记录在 unmerged 中。
+# 参数:
+#     mesh: source Object 的 evaluated mesh。
+#     unmerged: 记录丢失数据说明的集合。
+def read_mesh_attributes(mesh, unmerged):
+    uv_names = {uv_layer.name for uv_layer in mesh.uv_layers}
+    attributes = {}
+    for attribute in mesh.attributes:
+        name = attribute.name
+        if attribute.is_internal or name.startswith(".") or name in uv_names:
+            continue
+        if name in MERGED_BUILTIN_ATTRIBUTES:
+            continue
+        attribute_format = MESH_ATTRIBUTE_FORMATS.get(attribute.data_type)
+        if attribute_format is None or attribute.domain not in MERGED_ATTRIBUTE_DOMAINS:
+            unmerged.add(f"attribute '{name}'")
+            continue
+        key, width, dtype = attribute_format
+        values = np.empty(len(attribute.data) * width, dtype=dtype)
+        attribute.data.foreach_get(key, values)
+        attributes[name] = (attribute.domain, attribute.data_type, values.reshape(-1, width))
+    if mesh.has_custom_normals:
+        unmerged.add("custom normals")
+    return attributes
+
+
+# 读取 source Object evaluated mesh 的顶点、边、loop 与面数据，顶点已变换到 source world space。
+# 参数:
+#     source_object: source Collection 中的 Object。
+#     source_matrix: source Object 的 world matrix。
+#     depsgraph: 当前 evaluated depsgraph。
+def read_source_mesh_buffers(source_object, source_matrix, depsgraph):
+    object_eval = source_object.evaluated_get(depsgraph)
+    mesh = object_eval.to_mesh()
+    if mesh is None:
+        object_eval.to_mesh_clear()
+        return None
+
+    try:
+        vertex_count = len(mesh.vertices)
+        edge_count = len(mesh.edges)
+        loop_count = len(mesh.loops)
+        face_count = len(mesh.polygons)
+
+        co = np.empty(vertex_count * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        edges = np.empty(edge_count * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edges)
+        loop_vertices = np.empty(loop_count, dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vertices)
+        loop_starts = np.empty(face_count, dtype=np.int32)
+        mesh.polygons.foreach_get("loop_start", loop_starts)
+        loop_totals = np.empty(face_count, dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_totals)
+        material_indices = np.empty(face_count, dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", material_indices)
+        smooth = np.empty(face_count, dtype=bool)
+        mesh.polygons.foreach_get("use_smooth", smooth)
+        uvs = {}
+        for uv_layer in mesh.uv_layers:
+            uv = np.empty(loop_count * 2, dtype=np.float32)
+            uv_layer.data.foreach_get("uv", uv)
+            uvs[uv_layer.name] = uv.reshape(-1, 2)
+        unmerged = set()
+        attributes = read_mesh_attributes(mesh, unmerged)
+        if object_eval.vertex_groups:
+            unmerged.add("vertex groups")
+        if getattr(source_object.data, "shape_keys", None) is not None:
+            unmerged.add("shape keys")
+    finally:
+        object_eval.to_mesh_clear()
+
+    matrix = np.array(source_matrix, dtype=np.float64)
+    co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    if face_count and np.linalg.det(matrix[:3, :3]) < 0:
+        # 负缩放会让法线朝内，把每个面的 loop 顺序反转
+        loop_faces = np.repeat(np.arange(face_count), loop_totals)
+        face_starts = loop_starts[loop_faces]
+        loop_corners = np.arange(loop_count) - face_starts
+        loop_order = face_starts + loop_totals[loop_faces] - 1 - loop_corners
+        loop_vertices = loop_vertices[loop_order]
+        uvs = {name: uv[loop_order] for name, uv in uvs.items()}
+        attributes = {
+            name: (domain, data_type, values[loop_order] if domain == "CORNER" else values)
+            for name, (domain, data_type, values) in attributes.items()
+        }
+
+    slot_materials = [slot.material for slot in object_eval.material_slots] or [None]
+    return {
+        "co": co,
+        "edges": edges,
+        "loop_vertices": loop_vertices,
+        "loop_starts": loop_starts,
+        "material_indices": np.clip(material_indices, 0, len(slot_materials) - 1),
+        "slot_materials": slot_materials,
+        "smooth": smooth,
+        "uvs": uvs,
+        "attributes": attributes,
+        "unmerged": unmerged,
+    }
+
+
+# 用 foreach_set 把多个 source mesh 的数据拼成一个 Mesh。
+# 材质按 Material 合并，UV 与 attribute 按名称合并，缺少该层的 mesh 填 0。
+# 参数:
+#     name: 新 Mesh 的名称。
+#     buffers: read_source_mesh_buffers 返回的数据列表。
+#     offset: 所有顶点统一加上的平移量。
+#     unmerged: 记录丢失数据说明的集合，同名但 domain 或类型不同的 attribute 记录在这里。
+def build_merged_mesh(name, buffers, offset, unmerged):
+    materials = []
+    material_lookup = {}
+    uv_names = []
+    attribute_specs = {}
+    for buffer in buffers:
+        for material in buffer["slot_materials"]:
+            if material not in material_lookup:
+                material_lookup[material] = len(materials)
+                materials.append(material)
+        uv_names.extend(uv_name for uv_name in buffer["uvs"] if uv_name not in uv_names)
+        for attribute_name, (domain, data_type, _values) in buffer["attributes"].items():
+            spec = attribute_specs.setdefault(attribute_name, (domain, data_type))
+            if spec != (domain, data_type):
+                unmerged.add(f"attribute '{attribute_name}'")
+
+    co_parts, edge_parts, loop_parts, start_parts, material_parts = [], [], [], [], []
+    uv_parts = {uv_name: [] for uv_name in uv_names}
+    attribute_parts = {attribute_name: [] for attribute_name in attribute_specs}
+    vertex_offset = loop_offset = 0
+    for buffer in buffers:
+        loop_count = len(buffer["loop_vertices"])
+        domain_sizes = {
+            "POINT": len(buffer["co"]),
+            "FACE": len(buffer["loop_starts"]),
+            "CORNER": loop_count,
+        }
+        co_parts.append(buffer["co"])
+        edge_parts.append(buffer["edges"] + vertex_offset)
+        loop_parts.append(buffer["loop_vertices"] + vertex_offset)
+        start_parts.append(buffer["loop_starts"] + loop_offset)
+        material_remap = np.array(
+            [material_lookup[material] for material in buffer["slot_materials"]],
+            dtype=np.int32,
+        )
+        material_parts.append(material_remap[buffer["material_indices"]])
+        for uv_name in uv_names:
+            uv = buffer["uvs"].get(uv_name)
+            uv_parts[uv_name].append(
+                uv if uv is not None else np.zeros((loop_count, 2), dtype=np.float32)
+            )
+        for attribute_name, (domain, data_type) in attribute_specs.items():
+            attribute = buffer["attributes"].get(attribute_name)
+            if attribute is not None and attribute[:2] == (domain, data_type):
+                attribute_parts[attribute_name].append(attribute[2])
+                continue
+            _key, width, dtype = MESH_ATTRIBUTE_FORMATS[data_type]
+            attribute_parts[attribute_name].append(
+                np.zeros((domain_sizes[domain], width), dtype=dtype)
+            )
+        vertex_offset += len(buffer["co"])
+        loop_offset += loop_count
+
+    co = np.concatenate(co_parts) + np.asarray(offset, dtype=np.float64)
+    loop_starts = np.concatenate(start_parts)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.astype(np.float32).ravel())
+    edges = np.concatenate(edge_parts)
+    mesh.edges.add(len(edges) // 2)
+    mesh.edges.foreach_set("vertices", edges)
+    loop_vertices = np.concatenate(loop_parts)
+    mesh.loops.add(len(loop_vertices))
+    mesh.loops.foreach_set("vertex_index", loop_vertices)
+    # Blender 4.x 中 loop_total 只读，由 loop_start 推导
+    mesh.polygons.add(len(loop_starts))
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    mesh.polygons.foreach_set("material_index", np.concatenate(material_parts))
+    mesh.polygons.foreach_set(
+        "use_smooth",
+        np.concatenate([buffer["smooth"] for buffer in buffers]),
+    )
+
+    for material in materials:
+        mesh.materials.append(material)
+    for uv_name in uv_names:
+        uv_layer = mesh.uv_layers.new(name=uv_name)
+        uv_layer.data.foreach_set("uv", np.concatenate(uv_parts[uv_name]).ravel())
+    for attribute_name, (domain, data_type) in attribute_specs.items():
+        key = MESH_ATTRIBUTE_FORMATS[data_type][0]
+        attribute = mesh.attributes.new(attribute_name, data_type, domain)
+        attribute.data.foreach_set(key, np.concatenate(attribute_parts[attribute_name]).ravel())
+
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+# 把单个 Mesh Group instance 合并成一个 Object，替代每个 source Object 各生成一个 Object。
+# empty、灯光等无法合并的成员保留为独立 Object；没有生成任何 Object 时返回空列表。
+# 参数:
+#     instance_object: 当前要 apply 的 Mesh Group instance。
+#     parent_collection: 新 Object 要链接到的 Collection。
+#     source_template: get_source_group_template 的结果。
+#     depsgraph: 当前 evaluated depsgraph。
+#     source_buffers: source Object -> read_source_mesh_buffers 结果的缓存，跨 instance 共用。
+#     stats: 可选的统计字典，记录保留的独立 Object 数量与未合并的数据。
+def merge_mesh_group_instance(
+    instance_object,
+    parent_collection,
+    source_template,
+    depsgraph,
+    source_buffers,
+    stats=None,
+):
+    group_modifier = instance_object.modifiers[GROUP_MOD]
+    buffers = []
+    kept_members = []
+    for source_object, source_matrix in source_template:
+        buffer = None
+        if source_object.type in GEOMETRY_OBJECT_TYPES:
+            if source_object not in source_buffers:
+                source_buffers[source_object] = read_source_mesh_buffers(
+                    source_object,
+                    source_matrix,
+                    depsgraph,
+                )
+            buffer = source_buffers[source_object]
+        if buffer is not None:
+            buffers.append(buffer)
+        else:
+            kept_members.append((source_object, source_matrix))
+    if not buffers and not kept_members:
+        return []
+
+    modifiers_to_copy = [
+        modifier for modifier in instance_object.modifiers if modifier.name != GROUP_MOD
+    ]
+    instance_offset = get_instance_translation_offset(instance_object, group_modifier)
+    unmerged = set()
+    applied_objects = []
+    if buffers:
+        # 顶点相对 instance 原点存放，新 Object 放在 instance 的位置
+        instance_location = instance_object.matrix_world.translation.copy()
+        mesh_offset = instance_offset - instance_location
+        merged_name = CUSTOM_NAME + instance_object.name
+        merged_object = bpy.data.objects.new(
+            merged_name,
+            build_merged_mesh(merged_name, buffers, mesh_offset, unmerged),
+        )
+        merged_object.location = instance_location
+        parent_collection.objects.link(merged_object)
+        for source_modifier in modifiers_to_copy:
+            new_modifier = merged_object.modifiers.new(source_modifier.name, source_modifier.type)
+            copy_modifier_settings(source_modifier, new_modifier)
+        applied_objects.append(merged_object)
+        for buffer in buffers:
+            unmerged.update(buffer["unmerged"])
+
+    for source_object, source_matrix in kept_members:
+        # 只有几何类型的 Object 能挂 Modifier
+        member_modifiers = modifiers_to_copy if source_object.type in GEOMETRY_OBJECT_TYPES else ()
+        new_object = copy_source_object(
+            source_object,
+            source_matrix,
+            instance_offset,
+            member_modifiers,
+        )
+        parent_collection.objects.link(new_object)
+        applied_objects.append(new_object)
+
+    if stats is not None:
+        stats["kept_objects"] = stats.get("kept_objects", 0) + len(kept_members)
+        stats.setdefault("unmerged", set()).update(unmerged)
+
+    axis_object = find_custom_axis_object(instance_object)
+    if axis_object:
+        axis_world_matrix = axis_object.matrix_world.copy()
+        axis_object.parent = None
+        axis_object.matrix_world = axis_world_matrix
+        applied_objects.append(axis_object)
+    return applied_objects
+
+
+# 预先读取 source Collection 的 Object 列表与 world matrix，同一 source 的 instance 共用。
+# 参数:
+#     source_group: Mesh Group modifier 引用的 source Collection。
+def get_source_group_template(source_group):
+    return tuple((obj, obj.matrix_world.copy()) for obj in source_group.all_objects)
+
+
+# 把单个 Mesh Group instance 转成真实 Object，instance 本身留给调用方统一删除。
+# source Collection 为空时不生成任何 Object，返回空列表。
 # 参数:
 #     instance_object: 当前要 apply 的 Mesh Group instance。
 #     parent_collection: 新 Collection 要挂载到的父 Collection。
-def apply_mesh_group_instance(instance_object, parent_collection):
+#     link_data: 是否共用 source Object 的 data，而不是每个 Object 深拷贝一份。
+#     stats: 可选的统计字典，由 assign_applied_object_data 填写。
+#     source_template: 可选的 get_source_group_template 结果，批量 apply 时复用。
+def apply_mesh_group_instance(
+    instance_object,
+    parent_collection,
+    link_data=False,
+    stats=None,
+    source_template=None,
+):
     group_modifier = instance_object.modifiers.get(GROUP_MOD)
     if group_modifier is None:
         raise RuntimeError(f"Object {instance_object.name} does not have {GROUP_MOD}")
@@ -78,77 +599,210 @@ def apply_mesh_group_instance(instance_object, parent_collection):
     source_group = group_modifier[MG_SOCKET_GROUP]
     if source_group is None:
         raise RuntimeError(f"Object {instance_object.name} has no source group")
+    if source_template is None:
+        source_template = get_source_group_template(source_group)
+    if not source_template:
+        return []
 
     instance_offset = get_instance_translation_offset(instance_object, group_modifier)
     new_collection = bpy.data.collections.new(instance_object.name)
-    parent_collection.children.link(new_collection)
 
     applied_objects = []
     modifiers_to_copy = [
         modifier for modifier in instance_object.modifiers if modifier.name != GROUP_MOD
     ]
     axis_object = find_custom_axis_object(instance_object)
-    axis_world_matrix = axis_object.matrix_world.copy() if axis_object else None
-
-    for source_object in source_group.all_objects:
-        new_object = source_object.copy()
-        if source_object.data:
-            new_object.data = source_object.data.copy()
-        new_object.name = CUSTOM_NAME + source_object.name
-        new_object.parent = None
-        new_collection.objects.link(new_object)
-
-        matrix_world = source_object.matrix_world.copy()
-        matrix_world.translation += instance_offset
-        new_object.matrix_world = matrix_world
-
-        for source_modifier in modifiers_to_copy:
-            new_modifier = new_object.modifiers.new(source_modifier.name, source_modifier.type)
-            copy_modifier_settings(source_modifier, new_modifier)
 
+    # 先把 Object 链接到尚未挂进场景的 Collection，最后一次性挂载，避免逐个触发场景关系更新
+    for source_object, source_matrix in source_template:
+        new_object = copy_source_object(
+            source_object,
+            source_matrix,
+            instance_offset,
+            modifiers_to_copy,
+            link_data,
+            stats,
+        )
+        new_collection.objects.link(new_object)
         applied_objects.append(new_object)
 
     if axis_object:
+        axis_world_matrix = axis_object.matrix_world.copy()
         for collection in list(axis_object.users_collection):
             collection.objects.unlink(axis_object)
         new_collection.objects.link(axis_object)
+        # 解除 parent，instance 删除后 Empty 仍保持原位置
+        axis_object.parent = None
         axis_object.matrix_world = axis_world_matrix
         applied_objects.append(axis_object)
 
-    bpy.data.objects.remove(instance_object)
+    parent_collection.children.link(new_collection)
     return applied_objects
 
 
+# 按 source Collection 分组批量 apply，每个 source 只读取一次 Object 列表与 matrix。
+# 参数:
+#     context: 当前 Blender context，用于进度条。
+#     instance_objects: 要 apply 的 Mesh Group instance 列表。
+#     link_data: 是否共用 source Object 的 data。
+#     stats: 可选的统计字典，由 assign_applied_object_data 填写。
+#     merge: 是否把每个 instance 合并成单个 Object。
+def apply_mesh_group_instances(
+    context,
+    instance_objects,
+    link_data=False,
+    stats=None,
+    merge=False,
+):
+    instance_groups = {}
+    for obj in instance_objects:
+        source_group = obj.modifiers[GROUP_MOD][MG_SOCKET_GROUP]
+        if source_group is not None:
+            instance_groups.setdefault(source_group, []).append(obj)
+
+    window_manager = context.window_manager
+    window_manager.progress_begin(0, max(len(instance_objects), 1))
+    depsgraph = context.evaluated_depsgraph_get() if merge else None
+    source_buffers = {}
+    applied_objects = []
+    applied_instances = []
+    skipped_instances = []
+    try:
+        for source_group, instances in instance_groups.items():
+            source_template = get_source_group_template(source_group)
+            for obj in instances:
+                window_manager.progress_update(len(applied_instances))
+                parent_collection = get_parent_collection(obj, context.scene)
+                if merge:
+                    new_objects = merge_mesh_group_instance(
+                        obj,
+                        parent_collection,
+                        source_template,
+                        depsgraph,
+                        source_buffers,
+                        stats,
+                    )
+                else:
+                    new_objects = apply_mesh_group_instance(
+                        obj,
+                        parent_collection,
+                        link_data,
+                        stats,
+                        source_template,
+                    )
+                if not new_objects:
+                    # 没有生成任何 Object 时保留 instance，避免数据丢失
+                    skipped_instances.append(obj)
+                    continue
+                applied_objects.extend(new_objects)
+                applied_instances.append(obj)
+
+        bpy.data.batch_remove(applied_instances)
+    finally:
+        window_manager.progress_end()
+    if stats is not None and skipped_instances:
+        stats["skipped_instances"] = len(skipped_instances)
+    return len(applied_instances), applied_objects
+
+
 class CAT_OT_apply_mesh_group(bpy.types.Operator):
     bl_idname = "cat.apply_mesh_group"
     bl_label = "Apply Mesh Group"
     bl_options = {"REGISTER", "UNDO"}
     bl_description = "Turn Mesh Group instances into real mesh objects"
 
+    scope: bpy.props.EnumProperty(
+        name="Scope",
+        items=[
+            ("SELECTED", "Selected", "Apply the selected Mesh Group instances", 1),
+            ("SCENE", "Scene", "Apply every Mesh Group instance in the current scene", 2),
+        ],
+        default="SELECTED",
+    )
+    output_mode: bpy.props.EnumProperty(
+        name="Output",
+        items=[
+            ("OBJECTS", "Objects", "Create one object per source object in a new collection", 1),
+            ("MERGED", "Merged Mesh", "Join each instance into a single mesh object", 2),
+        ],
+        default="OBJECTS",
+    )
+    data_mode: bpy.props.EnumProperty(
+        name="Object Data",
+        items=[
+            ("COPY", "Copy", "Give every applied object its own copy of the source data", 1),
+            (
+                "LINK",
+                "Link",
+                "Share source data between applied objects, copy only when a modifier needs it",
+                2,
+            ),
+        ],
+        default="COPY",
+    )
+
     @classmethod
     def poll(cls, context):
-        return context.mode == "OBJECT" and bool(context.selected_objects)
+        return context.mode == "OBJECT"
 
-    def execute(self, context):
-        selected_objects = list(context.selected_objects)
-        applied_objects = []
-        count = 0
-
-        for obj in selected_objects:
-            if not check_is_mesh_group_instance(obj):
-                continue
-
-            parent_collection = get_parent_collection(obj, context.scene)
-            applied_objects.extend(apply_mesh_group_instance(obj, parent_collection))
-            count += 1
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "scope")
+        layout.prop(self, "output_mode")
+        # 合并输出总是生成新的 mesh，不存在可共用的 data
+        row = layout.row()
+        row.active = self.output_mode != "MERGED"
+        row.prop(self, "data_mode")
 
-        if count == 0:
+    def execute(self, context):
+        timer = StageTimer()
+        candidates = context.scene.objects if self.scope == "SCENE" else context.selected_objects
+        instance_objects = [obj for obj in candidates if is_mesh_group_instance(obj)]
+        if not instance_objects:
             self.report({"INFO"}, "No Mesh Groups found to apply")
             return {"FINISHED"}
+        timer.mark("collect")
+
+        stats = {}
+        merge = self.output_mode == "MERGED"
+        link_data = self.data_mode == "LINK" and not merge
+        count, applied_objects = apply_mesh_group_instances(
+            context,
+            instance_objects,
+            link_data,
+            stats,
+            merge,
+        )
+        timer.mark("apply")
 
-        bpy.ops.object.select_all(action="DESELECT")
-        for obj in applied_objects:
+        for obj in context.selected_objects:
+            obj.select_set(False)
+        # 被排除的 Collection 中的 Object 不在 view layer 里，不能选中
+        view_layer_objects = set(context.view_layer.objects)
+        selectable_objects = [obj for obj in applied_objects if obj in view_layer_objects]
+        for obj in selectable_objects:
             obj.select_set(True)
+        if selectable_objects:
+            context.view_layer.objects.active = selectable_objects[0]
+        timer.mark("select")
 
-        self.report({"INFO"}, f"Applied {count} Mesh Group(s)")
-        return {"FINISHED"}
\ No newline at end of file
+        message = f"Applied {count} Mesh Group(s) in {timer.format()}"
+        if link_data:
+            message += (
+                f", linked {stats.get('linked_data', 0)} data block(s), "
+                f"saved ~{format_bytes(stats.get('saved_bytes', 0))}"
+            )
+        warnings = []
+        if merge and self.data_mode == "LINK":
+            warnings.append("Object Data Link is ignored for merged output")
+        if stats.get("skipped_instances"):
+            warnings.append(f"kept {stats['skipped_instances']} instance(s) with nothing to apply")
+        if stats.get("kept_objects"):
+            warnings.append(f"kept {stats['kept_objects']} non-mesh object(s) separate")
+        if stats.get("unmerged"):
+            warnings.append(f"not carried into merged mesh: {', '.join(sorted(stats['unmerged']))}")
+        if warnings:
+            self.report({"WARNING"}, f"{message}, {', '.join(warnings)}")
+            return {"FINISHED"}
+        self.report({"INFO"}, message)
+        return {"FINISHED"}
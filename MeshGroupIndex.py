@@ -0,0 +1,324 @@
+import bpy
+from bpy.app.handlers import persistent
+
+from .util import (
+    GROUP_MOD,
+    GROUP_NODE,
+    MG_SOCKET_GROUP,
+    check_is_mesh_group_instance,
+)
+
+# Mesh Group instance 反向索引，以 session_uid 为 key，改名不会让记录失效。
+# sources: source Collection uid -> instance Object uid 集合。
+# assets: source Collection uid -> 已 mark asset 的 instance Object uid 集合。
+# instance_sources: instance Object uid -> source Collection uid。
+# object_count: 上次确认索引完整时 bpy.data.objects 的数量，数量增加说明可能有 handler 没有报告的新 Object。
+_index_state = {
+    "dirty": True,
+    "object_count": -1,
+    "sources": {},
+    "assets": {},
+    "instance_sources": {},
+}
+
+# session_uid -> ID 的查找表，不跨 generation 保存 ID 指针，避免持有已删除的 ID。
+_id_lookup = {
+    "generation": -1,
+    "objects": {},
+    "collections": {},
+}
+
+
+# Mesh Group instance 判定的 memo，generation 在每次 depsgraph 更新、undo 与载入文件时递增。
+# memo: Object session_uid -> bool，只在同一个 generation 内有效。
+_classification_state = {
+    "generation": 0,
+    "memo_generation": -1,
+    "memo": {},
+    "group_node": None,
+}
+
+
+# 让当前 generation 的判定 memo 失效。
+# 参数: 无。
+def bump_classification_generation():
+    _classification_state["generation"] += 1
+
+
+# 判断 Object 是否为 Mesh Group instance，同一 generation 内重复查询为 O(1)。
+# 参数:
+#     obj: 需要检查的 Blender Object。
+def is_mesh_group_instance(obj):
+    state = _classification_state
+    if state["memo_generation"] != state["generation"]:
+        state["memo"] = {}
+        state["group_node"] = bpy.data.node_groups.get(GROUP_NODE)
+        state["memo_generation"] = state["generation"]
+
+    object_uid = obj.session_uid
+    result = state["memo"].get(object_uid)
+    if result is None:
+        result = check_is_mesh_group_instance(obj, state["group_node"])
+        state["memo"][object_uid] = result
+    return result
+
+
+# 标记索引失效，下一次查询时整体重建。
+# 参数: 无。
+def mark_instance_index_dirty():
+    _index_state["dirty"] = True
+
+
+# 获取当前 generation 的 session_uid 查找表，generation 变化后重建。
+# 参数: 无。
+def get_id_lookup():
+    generation = _classification_state["generation"]
+    if _id_lookup["generation"] != generation:
+        _id_lookup["objects"] = {obj.session_uid: obj for obj in bpy.data.objects}
+        _id_lookup["collections"] = {
+            collection.session_uid: collection for collection in bpy.data.collections
+        }
+        _id_lookup["generation"] = generation
+    return _id_lookup
+
+
+# 把本 generation 内新建的 ID 加入查找表；查找表已过期时不需要处理，重建时会包含它。
+# 参数:
+#     lookup_name: objects 或 collections。
+#     id_data: 要加入的 ID。
+def remember_session_uid(lookup_name, id_data):
+    if _id_lookup["generation"] == _classification_state["generation"]:
+        _id_lookup[lookup_name][id_data.session_uid] = id_data
+
+
+# 通过 session_uid 取回 ID，找不到或 ID 已被删除时返回 None。
+# 参数:
+#     lookup_name: objects 或 collections。
+#     uid: ID 的 session_uid。
+def resolve_session_uid(lookup_name, uid):
+    id_data = get_id_lookup()[lookup_name].get(uid)
+    if id_data is None:
+        return None
+    try:
+        if id_data.session_uid != uid:
+            return None
+    except ReferenceError:
+        return None
+    return id_data
+
+
+# 读取 instance Object 引用的 source Collection uid。
+# 参数:
+#     obj: 需要检查的 Blender Object。
+def get_instance_source_key(obj):
+    if not is_mesh_group_instance(obj):
+        return None
+    group_modifier = obj.modifiers.get(GROUP_MOD)
+    if group_modifier is None:
+        return None
+    source_collection = group_modifier.get(MG_SOCKET_GROUP)
+    if source_collection is None:
+        return None
+    remember_session_uid("collections", source_collection)
+    return source_collection.session_uid
+
+
+# 从索引中移除单个 Object uid。
+# 参数:
+#     object_key: Object 的 session_uid。
+def _unindex_object_key(object_key):
+    source_key = _index_state["instance_sources"].pop(object_key, None)
+    if source_key is None:
+        return
+    for index_name in ("sources", "assets"):
+        object_keys = _index_state[index_name].get(source_key)
+        if object_keys is None:
+            continue
+        object_keys.discard(object_key)
+        if not object_keys:
+            del _index_state[index_name][source_key]
+
+
+# 把单个 Object 写入索引，非 Mesh Group instance 会被忽略。
+# 参数:
+#     obj: 需要写入索引的 Blender Object。
+def _index_object(obj):
+    source_key = get_instance_source_key(obj)
+    if source_key is None:
+        return
+    object_key = obj.session_uid
+    remember_session_uid("objects", obj)
+    _index_state["instance_sources"][object_key] = source_key
+    _index_state["sources"].setdefault(source_key, set()).add(object_key)
+    if obj.asset_data is not None:
+        _index_state["assets"].setdefault(source_key, set()).add(object_key)
+
+
+# 遍历一次 bpy.data.objects 重建整个索引。
+# 参数: 无。
+def rebuild_instance_index():
+    _index_state["sources"] = {}
+    _index_state["assets"] = {}
+    _index_state["instance_sources"] = {}
+    _id_lookup["generation"] = -1
+    for obj in bpy.data.objects:
+        _index_object(obj)
+    _index_state["object_count"] = len(bpy.data.objects)
+    _index_state["dirty"] = False
+
+
+# 确保索引可用，失效或 Object 数量增加时重建。
+# 其它 Scene 中新建或 append 的 Object 不会出现在当前 depsgraph 更新中，用数量增加兜底；
+# 删除的 Object 在查询时按 session_uid 解析失败后移除，数量减少不需要重建。
+# 参数: 无。
+def ensure_instance_index():
+    object_count = len(bpy.data.objects)
+    if _index_state["dirty"] or object_count > _index_state["object_count"]:
+        rebuild_instance_index()
+    else:
+        _index_state["object_count"] = object_count
+
+
+# 增量刷新单个 Object 的索引记录，Operator 修改 instance 后可直接调用。
+# 参数:
+#     obj: 新建或修改过的 Blender Object。
+def update_instance_index_object(obj):
+    _classification_state["memo"].pop(obj.session_uid, None)
+    if _index_state["dirty"]:
+        return
+    _unindex_object_key(obj.session_uid)
+    _index_object(obj)
+
+
+# 判断索引中的 Object 是否仍然属于指定 source Collection。
+# 参数:
+#     index_name: 要查询的索引名称，sources 或 assets。
+#     obj: 索引中的 Object。
+#     source_key: source Collection uid。
+def _indexed_object_matches(index_name, obj, source_key):
+    if get_instance_source_key(obj) != source_key:
+        return False
+    return index_name != "assets" or obj.asset_data is not None
+
+
+# 取回索引中仍然有效的 Object，删除或修改后失效的记录会被重新索引。
+# 重新索引后仍属于该 source Collection 的 Object 也会一并返回。
+# 参数:
+#     index_name: 要查询的索引名称，sources 或 assets。
+#     source_key: source Collection uid。
+def _resolve_indexed_objects(index_name, source_key):
+    objects = []
+    stale_objects = []
+    for object_key in sorted(_index_state[index_name].get(source_key, ())):
+        obj = resolve_session_uid("objects", object_key)
+        if obj is not None and _indexed_object_matches(index_name, obj, source_key):
+            objects.append(obj)
+            continue
+        _unindex_object_key(object_key)
+        if obj is not None:
+            stale_objects.append(obj)
+
+    for obj in stale_objects:
+        _index_object(obj)
+        if _indexed_object_matches(index_name, obj, source_key):
+            objects.append(obj)
+    return objects
+
+
+# 获取引用指定 source Collection 的全部 Mesh Group instance。
+# 参数:
+#     source_collection: Mesh Group modifier 引用的 source Collection。
+def get_source_collection_instances(source_collection):
+    ensure_instance_index()
+    return _resolve_indexed_objects("sources", source_collection.session_uid)
+
+
+# 获取当前文件中仍被 Mesh Group instance 引用的 source Collection。
+# 参数: 无。
+def get_indexed_source_collections():
+    return set(get_indexed_instance_groups())
+
+
+# 获取全部 source Collection 到其 instance 列表的映射。
+# 解析过程中重新索引的 Object 可能指向新的 source Collection，循环直到没有新的 key。
+# 参数: 无。
+def get_indexed_instance_groups():
+    ensure_instance_index()
+    instance_groups = {}
+    visited_keys = set()
+    pending_keys = list(_index_state["sources"])
+    while pending_keys:
+        for source_key in pending_keys:
+            visited_keys.add(source_key)
+            instances = _resolve_indexed_objects("sources", source_key)
+            source_collection = resolve_session_uid("collections", source_key)
+            if instances and source_collection is not None:
+                instance_groups[source_collection] = instances
+        pending_keys = [key for key in _index_state["sources"] if key not in visited_keys]
+    return instance_groups
+
+
+# 查找已经 mark asset 且引用指定 source Collection 的 instance。
+# 参数:
+#     source_collection: Mesh Group instance 引用的 source Collection。
+def find_indexed_asset_instance(source_collection):
+    ensure_instance_index()
+    asset_objects = _resolve_indexed_objects("assets", source_collection.session_uid)
+    return asset_objects[0] if asset_objects else None
+
+
+# 查找与指定 instance 共用 source Collection 的 asset instance。
+# 参数:
+#     instance_object: 当前 Mesh Group instance Object。
+def find_asset_instance_for_instance(instance_object):
+    ensure_instance_index()
+    source_key = get_instance_source_key(instance_object)
+    if source_key is None:
+        return None
+    asset_objects = _resolve_indexed_objects("assets", source_key)
+    return asset_objects[0] if asset_objects else None
+
+
+@persistent
+def on_depsgraph_update_post(scene, depsgraph):
+    bump_classification_generation()
+    if _index_state["dirty"]:
+        return
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Object):
+            update_instance_index_object(update.id.original)
+        elif isinstance(update.id, bpy.types.Collection):
+            # Collection 改名或增删成员后，重新读取引用它的 instance
+            for object_key in list(_index_state["sources"].get(update.id.original.session_uid, ())):
+                obj = resolve_session_uid("objects", object_key)
+                _unindex_object_key(object_key)
+                if obj is not None:
+                    _index_object(obj)
+
+
+@persistent
+def on_file_or_undo_change(*_args):
+    bump_classification_generation()
+    mark_instance_index_dirty()
+
+
+INDEX_HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update_post),
+    (bpy.app.handlers.load_post, on_file_or_undo_change),
+    (bpy.app.handlers.undo_post, on_file_or_undo_change),
+    (bpy.app.handlers.redo_post, on_file_or_undo_change),
+)
+
+
+def register():
+    for handler_list, handler in INDEX_HANDLERS:
+        if handler not in handler_list:
+            handler_list.append(handler)
+    mark_instance_index_dirty()
+
+
+def unregister():
+    for handler_list, handler in INDEX_HANDLERS:
+        if handler in handler_list:
+            handler_list.remove(handler)
+    mark_instance_index_dirty()
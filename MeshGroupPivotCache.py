@@ -0,0 +1,141 @@
+import bpy
+from bpy.app.handlers import persistent
+from mathutils import Vector
+
+from .util import (
+    calculate_bb_pivots,
+    get_objs_world_bb_corners,
+)
+
+# 缓存以 session_uid 为 key，改名不会让缓存失效记录对不上。
+# source Collection uid -> {"pivots": calculate_bb_pivots 结果, "bounds": (min, max), "members": 成员 uid 集合}。
+# members 包含成员 Object 与 source 自身及其子 Collection。
+_pivot_cache = {}
+# 成员 Object 或 Collection uid -> 包含它的 source Collection uid 集合，用于按 ID 失效。
+_member_sources = {}
+
+
+# 清空全部 pivot 缓存。
+# 参数: 无。
+def clear_pivot_cache():
+    _pivot_cache.clear()
+    _member_sources.clear()
+
+
+# 使单个 source Collection 的 pivot 缓存失效。
+# 参数:
+#     source_key: source Collection 的 session_uid。
+def invalidate_source_pivots(source_key):
+    entry = _pivot_cache.pop(source_key, None)
+    if entry is None:
+        return
+    for member_key in entry["members"]:
+        source_keys = _member_sources.get(member_key)
+        if source_keys is None:
+            continue
+        source_keys.discard(source_key)
+        if not source_keys:
+            del _member_sources[member_key]
+
+
+# 使包含指定 Object 或 Collection 的全部 source Collection pivot 缓存失效。
+# 参数:
+#     member_key: 成员 Object 或 Collection 的 session_uid。
+def invalidate_member_pivots(member_key):
+    for source_key in list(_member_sources.get(member_key, ())):
+        invalidate_source_pivots(source_key)
+
+
+# 获取 source Collection 的缓存条目，未命中时计算一次 pivot 与 world bounds。
+# 参数:
+#     source_collection: Mesh Group modifier 引用的 source Collection。
+def get_source_collection_entry(source_collection):
+    source_key = source_collection.session_uid
+    entry = _pivot_cache.get(source_key)
+    if entry is not None:
+        return entry
+
+    source_objects = list(source_collection.all_objects)
+    world_corners = get_objs_world_bb_corners(source_objects)
+    if len(world_corners):
+        bounds = (Vector(world_corners.min(axis=0)), Vector(world_corners.max(axis=0)))
+    else:
+        bounds = (Vector((0, 0, 0)), Vector((0, 0, 0)))
+    member_keys = {obj.session_uid for obj in source_objects}
+    member_keys.add(source_key)
+    member_keys.update(child.session_uid for child in source_collection.children_recursive)
+    entry = {
+        "pivots": calculate_bb_pivots(world_corners),
+        "bounds": bounds,
+        "members": member_keys,
+    }
+    _pivot_cache[source_key] = entry
+    for member_key in member_keys:
+        _member_sources.setdefault(member_key, set()).add(source_key)
+    return entry
+
+
+# 获取 source Collection 的全部 pivot，未命中时计算一次并缓存。
+# 参数:
+#     source_collection: Mesh Group modifier 引用的 source Collection。
+def get_source_collection_pivots(source_collection):
+    return get_source_collection_entry(source_collection)["pivots"]
+
+
+# 获取 source Collection 的 world space 包围盒 (min, max)，返回可修改的副本。
+# 参数:
+#     source_collection: Mesh Group modifier 引用的 source Collection。
+def get_source_collection_bounds(source_collection):
+    bounds_min, bounds_max = get_source_collection_entry(source_collection)["bounds"]
+    return bounds_min.copy(), bounds_max.copy()
+
+
+# 获取 source Collection 指定模式的 pivot，返回可修改的副本。
+# 参数:
+#     source_collection: Mesh Group modifier 引用的 source Collection。
+#     pivot: CENTER 或 LOWEST。
+#     bounds_mode: CORNERS 或 AABB。
+def get_source_collection_pivot(source_collection, pivot="CENTER", bounds_mode="CORNERS"):
+    return get_source_collection_pivots(source_collection)[(pivot, bounds_mode)].copy()
+
+
+@persistent
+def on_depsgraph_update_post(scene, depsgraph):
+    if not _pivot_cache:
+        return
+    for update in depsgraph.updates:
+        id_data = update.id
+        if isinstance(id_data, bpy.types.Collection):
+            # 成员增删只影响包含该 Collection 的 source
+            invalidate_member_pivots(id_data.original.session_uid)
+        elif isinstance(id_data, bpy.types.Object) and (
+            update.is_updated_transform or update.is_updated_geometry
+        ):
+            invalidate_member_pivots(id_data.original.session_uid)
+
+
+@persistent
+def on_file_or_undo_change(*_args):
+    clear_pivot_cache()
+
+
+PIVOT_CACHE_HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update_post),
+    (bpy.app.handlers.load_post, on_file_or_undo_change),
+    (bpy.app.handlers.undo_post, on_file_or_undo_change),
+    (bpy.app.handlers.redo_post, on_file_or_undo_change),
+)
+
+
+def register():
+    for handler_list, handler in PIVOT_CACHE_HANDLERS:
+        if handler not in handler_list:
+            handler_list.append(handler)
+    clear_pivot_cache()
+
+
+def unregister():
+    for handler_list, handler in PIVOT_CACHE_HANDLERS:
+        if handler in handler_list:
+            handler_list.remove(handler)
+    clear_pivot_cache()
@@ -0,0 +1,209 @@
+import bpy
+import csv
+import io
+import json
+from pathlib import Path
+
+from bpy_extras.io_utils import ExportHelper
+
+from .MeshGroupIndex import get_indexed_instance_groups
+from .util import (
+    GEOMETRY_OBJECT_TYPES,
+    GROUP_MOD,
+    MG_SOCKET_REALIZE,
+    estimate_mesh_bytes,
+    format_bytes,
+)
+
+MEMORY_REPORT_TEXT = "CAT_MeshGroupMemory.json"
+# 未 realize 的 instance 只保存一个 4x4 变换与 instance 引用
+INSTANCE_REFERENCE_BYTES = 72
+MEMORY_REPORT_FIELDS = (
+    "source_collection",
+    "instance_count",
+    "realized_count",
+    "unrealized_count",
+    "source_object_count",
+    "vertices",
+    "faces",
+    "source_bytes",
+    "instanced_bytes",
+    "realized_bytes",
+    "saved_bytes",
+)
+
+
+# 统计 source Object 的 evaluated mesh 数据，按 Object 缓存避免嵌套 Collection 重复计算。
+# 参数:
+#     obj: source Collection 中的 Object。
+#     depsgraph: 当前 evaluated depsgraph。
+#     object_stats: Object -> (vertices, faces, bytes) 的缓存字典。
+def get_evaluated_object_stats(obj, depsgraph, object_stats):
+    stats = object_stats.get(obj)
+    if stats is not None:
+        return stats
+
+    stats = (0, 0, 0)
+    if obj.type in GEOMETRY_OBJECT_TYPES:
+        object_eval = obj.evaluated_get(depsgraph)
+        mesh = object_eval.to_mesh()
+        if mesh is not None:
+            stats = (len(mesh.vertices), len(mesh.polygons), estimate_mesh_bytes(mesh))
+        object_eval.to_mesh_clear()
+    object_stats[obj] = stats
+    return stats
+
+
+# 计算单个 source Collection 的 instance 数量与内存估算。
+# 参数:
+#     source_collection: Mesh Group instance 引用的 source Collection。
+#     instances: 引用该 source Collection 的 instance Object 列表。
+#     depsgraph: 当前 evaluated depsgraph。
+#     object_stats: 跨 source Collection 共用的 Object 统计缓存。
+def build_source_memory_row(source_collection, instances, depsgraph, object_stats):
+    realized_count = sum(
+        1 for obj in instances if obj.modifiers[GROUP_MOD].get(MG_SOCKET_REALIZE)
+    )
+    unrealized_count = len(instances) - realized_count
+
+    source_objects = list(source_collection.all_objects)
+    vertices = faces = source_bytes = 0
+    for obj in source_objects:
+        object_vertices, object_faces, object_bytes = get_evaluated_object_stats(
+            obj,
+            depsgraph,
+            object_stats,
+        )
+        vertices += object_vertices
+        faces += object_faces
+        source_bytes += object_bytes
+
+    instanced_bytes = (
+        source_bytes
+        + unrealized_count * INSTANCE_REFERENCE_BYTES
+        + realized_count * source_bytes
+    )
+    realized_bytes = source_bytes * (len(instances) + 1)
+    return {
+        "source_collection": source_collection.name_full,
+        "instance_count": len(instances),
+        "realized_count": realized_count,
+        "unrealized_count": unrealized_count,
+        "source_object_count": len(source_objects),
+        "vertices": vertices,
+        "faces": faces,
+        "source_bytes": source_bytes,
+        "instanced_bytes": instanced_bytes,
+        "realized_bytes": realized_bytes,
+        "saved_bytes": realized_bytes - instanced_bytes,
+    }
+
+
+# 为当前文件中所有被引用的 source Collection 生成内存报告，按节省量从大到小排序。
+# 参数:
+#     context: 当前 Blender context，用于获取 evaluated depsgraph。
+def build_mesh_group_memory_report(context):
+    depsgraph = context.evaluated_depsgraph_get()
+    object_stats = {}
+    rows = [
+        build_source_memory_row(source_collection, instances, depsgraph, object_stats)
+        for source_collection, instances in get_indexed_instance_groups().items()
+    ]
+    rows.sort(key=lambda row: row["saved_bytes"], reverse=True)
+    return rows
+
+
+# 把报告行转成 JSON 文本。
+# 参数:
+#     rows: build_mesh_group_memory_report 返回的报告行。
+def memory_report_to_json(rows):
+    totals = {
+        field: sum(row[field] for row in rows)
+        for field in MEMORY_REPORT_FIELDS
+        if field != "source_collection"
+    }
+    return json.dumps({"sources": rows, "totals": totals}, indent=2, ensure_ascii=False)
+
+
+# 把报告行转成 CSV 文本。
+# 参数:
+#     rows: build_mesh_group_memory_report 返回的报告行。
+def memory_report_to_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=MEMORY_REPORT_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+# 把 JSON 报告写入 Text datablock，方便在 Text Editor 中查看。
+# 参数:
+#     json_text: memory_report_to_json 生成的文本。
+def write_memory_report_text(json_text):
+    text = bpy.data.texts.get(MEMORY_REPORT_TEXT)
+    if text is None:
+        text = bpy.data.texts.new(MEMORY_REPORT_TEXT)
+    text.from_string(json_text)
+    return text
+
+
+class CAT_OT_report_mesh_group_memory(bpy.types.Operator):
+    bl_idname = "cat.report_mesh_group_memory"
+    bl_label = "Mesh Group Memory Report"
+    bl_description = (
+        "Estimate Mesh Group memory with and without instancing, "
+        f"and store the result in the {MEMORY_REPORT_TEXT} text"
+    )
+
+    def execute(self, context):
+        rows = build_mesh_group_memory_report(context)
+        if not rows:
+            self.report({"INFO"}, "No Mesh Group instances found")
+            return {"FINISHED"}
+
+        write_memory_report_text(memory_report_to_json(rows))
+        instanced_bytes = sum(row["instanced_bytes"] for row in rows)
+        realized_bytes = sum(row["realized_bytes"] for row in rows)
+        self.report(
+            {"INFO"},
+            f"{len(rows)} source group(s): ~{format_bytes(instanced_bytes)} instanced, "
+            f"~{format_bytes(realized_bytes)} realized, see {MEMORY_REPORT_TEXT}",
+        )
+        return {"FINISHED"}
+
+
+class CAT_OT_export_mesh_group_memory(bpy.types.Operator, ExportHelper):
+    bl_idname = "cat.export_mesh_group_memory"
+    bl_label = "Export Mesh Group Memory Report"
+    bl_description = "Export the Mesh Group memory report as JSON or CSV"
+
+    filename_ext = ".json"
+    check_extension = None
+    filter_glob: bpy.props.StringProperty(default="*.json;*.csv", options={"HIDDEN"})
+    export_format: bpy.props.EnumProperty(
+        name="Format",
+        items=[
+            ("JSON", "JSON", "Export the report and totals as JSON", 1),
+            ("CSV", "CSV", "Export one row per source collection as CSV", 2),
+        ],
+        default="JSON",
+    )
+
+    def execute(self, context):
+        rows = build_mesh_group_memory_report(context)
+        if self.export_format == "CSV":
+            filepath = str(Path(self.filepath).with_suffix(".csv"))
+            content = memory_report_to_csv(rows)
+        else:
+            filepath = str(Path(self.filepath).with_suffix(".json"))
+            content = memory_report_to_json(rows)
+
+        try:
+            with open(filepath, "w", encoding="utf-8", newline="") as report_file:
+                report_file.write(content)
+        except OSError as error:
+            self.report({"ERROR"}, f"Could not write {filepath}: {error}")
+            return {"CANCELLED"}
+
+        self.report({"INFO"}, f"Exported {len(rows)} source group(s) to {filepath}")
+        return {"FINISHED"}
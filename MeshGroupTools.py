@@ -1,5 +1,6 @@
 import bpy
 import bmesh
+import json
 from mathutils import Vector
 
 from .AssetBrowserTools import (
@@ -7,7 +8,18 @@ from .AssetBrowserTools import (
     find_asset_instance_by_source_collection,
     object_is_in_scene,
 )
+from .AssetPreviewQueue import queue_asset_previews
+from .MeshGroupIndex import (
+    get_indexed_source_collections,
+    is_mesh_group_instance,
+    update_instance_index_object,
+)
+from .MeshGroupPivotCache import (
+    get_source_collection_pivot,
+    invalidate_source_pivots,
+)
 from .util import (
+    BOUNDS_MODE_ITEMS,
     CUSTOM_NAME,
     GROUP_MOD,
     GROUP_NODE,
@@ -20,46 +32,128 @@ from .util import (
     PIVOT_NAME,
     PRESET_PATH,
     TEMP_MESH,
+    StageTimer,
     add_mesh_group_modifier,
-    check_is_mesh_group_instance,
-    find_objs_bb_center,
-    find_objs_bb_lowest_center,
+    estimate_mesh_bytes,
     find_selected_element_center,
+    format_bytes,
     import_node_group,
-    realize_mesh_group_modifier,
+    remove_orphaned_datablocks,
 )
 
+CLEANUP_REPORT_TEXT = "CAT_SourceGroupCleanup.json"
+
+
+class CollectionHierarchy:
+    """
+    一次迭代遍历全部 Scene 的 Collection 树，建立 child -> parents 索引。
+    Collection 所属的 Scene 由 parents 向上查找得到，Operator 内修改层级时通过 link/unlink 同步。
+    """
+
+    def __init__(self, scenes=None):
+        self.parents = {}
+        self.master_scenes = {}
+        self._scene_memo = {}
+        for scene in scenes if scenes is not None else bpy.data.scenes:
+            self.master_scenes[scene.collection] = scene
+            visited = {scene.collection}
+            stack = [scene.collection]
+            while stack:
+                parent_collection = stack.pop()
+                for child_collection in parent_collection.children:
+                    self._add_parent(parent_collection, child_collection)
+                    if child_collection not in visited:
+                        visited.add(child_collection)
+                        stack.append(child_collection)
+
+    def _add_parent(self, parent_collection, child_collection):
+        parents = self.parents.setdefault(child_collection, [])
+        if parent_collection not in parents:
+            parents.append(parent_collection)
+
+    def get_scenes(self, collection):
+        """获取包含 collection 的全部 Scene"""
+        scenes = self._scene_memo.get(collection)
+        if scenes is not None:
+            return scenes
+
+        scenes = set()
+        visited = {collection}
+        stack = [collection]
+        while stack:
+            current_collection = stack.pop()
+            scene = self.master_scenes.get(current_collection)
+            if scene is not None:
+                scenes.add(scene)
+            for parent_collection in self.parents.get(current_collection, ()):
+                if parent_collection not in visited:
+                    visited.add(parent_collection)
+                    stack.append(parent_collection)
+        self._scene_memo[collection] = scenes
+        return scenes
+
+    def get_parents(self, collection, scene=None):
+        """获取 collection 的直接父级，传入 scene 时只返回该 Scene 树中的父级"""
+        parents = self.parents.get(collection, [])
+        if scene is None:
+            return list(parents)
+        return [parent for parent in parents if scene in self.get_scenes(parent)]
+
+    def link(self, parent_collection, child_collection):
+        parent_collection.children.link(child_collection)
+        self._add_parent(parent_collection, child_collection)
+        self._scene_memo.clear()
+
+    def unlink(self, parent_collection, child_collection):
+        parent_collection.children.unlink(child_collection)
+        parents = self.parents.get(child_collection, [])
+        if parent_collection in parents:
+            parents.remove(parent_collection)
+        self._scene_memo.clear()
+
 
 # 判断 parent Collection 是否已经直接包含 child Collection。
 # 参数:
 #     parent_collection: Blender Collection，待检查的父 Collection。
 #     child_collection: Blender Collection，待检查的子 Collection。
-def collection_has_child(parent_collection, child_collection):
+#     hierarchy: 可选的 CollectionHierarchy，传入时直接查索引。
+def collection_has_child(parent_collection, child_collection, hierarchy=None):
+    if hierarchy is not None:
+        return parent_collection in hierarchy.parents.get(child_collection, ())
     return any(child == child_collection for child in parent_collection.children)
 
 
-# 查找 target Collection 在 root Collection 树中的直接父 Collection。
+# 查找 target Collection 在指定 Scene Collection 树中的直接父 Collection。
 # 参数:
-#     root_collection: Blender Collection，作为查找入口的根 Collection。
+#     root_collection: Blender Collection，Scene 的主 Collection。
 #     target_collection: Blender Collection，需要查找父级的 Collection。
-def find_collection_parents(root_collection, target_collection):
-    parents = []
-    for child_collection in root_collection.children:
-        if child_collection == target_collection:
-            parents.append(root_collection)
-            continue
-        parents.extend(find_collection_parents(child_collection, target_collection))
-    return parents
+#     hierarchy: 可选的 CollectionHierarchy，同一个 Operator 内复用以避免重复遍历。
+def find_collection_parents(root_collection, target_collection, hierarchy=None):
+    if hierarchy is None:
+        hierarchy = CollectionHierarchy()
+    scene = hierarchy.master_scenes.get(root_collection)
+    if scene is not None:
+        return hierarchy.get_parents(target_collection, scene)
+
+    root_tree = set(get_collection_tree(root_collection))
+    return [
+        parent
+        for parent in hierarchy.get_parents(target_collection)
+        if parent in root_tree
+    ]
 
 
 # 判断 Collection 是否存在于指定 Scene 的 Collection 树中。
 # 参数:
 #     scene: Blender Scene，待检查的 Scene。
 #     target_collection: Blender Collection，需要查找的 Collection。
-def collection_is_in_scene(scene, target_collection):
-    return target_collection == scene.collection or bool(
-        find_collection_parents(scene.collection, target_collection)
-    )
+#     hierarchy: 可选的 CollectionHierarchy，同一个 Operator 内复用以避免重复遍历。
+def collection_is_in_scene(scene, target_collection, hierarchy=None):
+    if target_collection == scene.collection:
+        return True
+    if hierarchy is None:
+        hierarchy = CollectionHierarchy([scene])
+    return scene in hierarchy.get_scenes(target_collection)
 
 
 # 获取或创建 Mesh Group source 专用 Scene。
@@ -74,10 +168,16 @@ def get_or_create_source_scene():
 # 确保 source Collection 已挂到 Mesh Group source 专用 Scene。
 # 参数:
 #     source_collection: Blender Collection，Mesh Group modifier 引用的 source Collection。
-def ensure_source_collection_in_source_scene(source_collection):
+#     hierarchy: 可选的 CollectionHierarchy，link 后同步更新索引。
+def ensure_source_collection_in_source_scene(source_collection, hierarchy=None):
     source_scene = get_or_create_source_scene()
-    if not collection_has_child(source_scene.collection, source_collection):
-        source_scene.collection.children.link(source_collection)
+    if hierarchy is not None and source_scene.collection not in hierarchy.master_scenes:
+        hierarchy.master_scenes[source_scene.collection] = source_scene
+    if not collection_has_child(source_scene.collection, source_collection, hierarchy):
+        if hierarchy is not None:
+            hierarchy.link(source_scene.collection, source_collection)
+        else:
+            source_scene.collection.children.link(source_collection)
     return source_scene
 
 
@@ -85,11 +185,14 @@ def ensure_source_collection_in_source_scene(source_collection):
 # 参数:
 #     source_collection: Blender Collection，Mesh Group modifier 引用的 source Collection。
 #     current_scene: Blender Scene，执行 make mesh group 时所在的原 Scene。
-def move_source_collection_to_scene(source_collection, current_scene):
+#     hierarchy: 可选的 CollectionHierarchy，批量移动时复用同一个索引。
+def move_source_collection_to_scene(source_collection, current_scene, hierarchy=None):
     if source_collection == current_scene.collection:
         return False
 
-    source_scene = ensure_source_collection_in_source_scene(source_collection)
+    if hierarchy is None:
+        hierarchy = CollectionHierarchy()
+    source_scene = ensure_source_collection_in_source_scene(source_collection, hierarchy)
 
     if current_scene == source_scene:
         return True
@@ -97,59 +200,260 @@ def move_source_collection_to_scene(source_collection, current_scene):
     for parent_collection in find_collection_parents(
         current_scene.collection,
         source_collection,
+        hierarchy,
     ):
-        parent_collection.children.unlink(source_collection)
+        hierarchy.unlink(parent_collection, source_collection)
 
     return True
 
 
-# 收集 Collection 及其所有子 Collection。
+# 收集 Collection 及其所有子 Collection，迭代前序遍历，共享子 Collection 只出现一次。
 # 参数:
-#     collection: Blender Collection，递归收集入口。
+#     collection: Blender Collection，收集入口。
 def get_collection_tree(collection):
-    collections = [collection]
-    for child_collection in collection.children:
-        collections.extend(get_collection_tree(child_collection))
+    collections = []
+    visited = set()
+    stack = [collection]
+    while stack:
+        current_collection = stack.pop()
+        if current_collection in visited:
+            continue
+        visited.add(current_collection)
+        collections.append(current_collection)
+        stack.extend(reversed(current_collection.children))
     return collections
 
 
 # 收集当前文件中仍被 Mesh Group instance 引用的 source Collection。
+# 直接读取 handler 增量维护的索引，不再每次遍历全部 Object。
 # 参数: 无。
 def get_referenced_source_collections():
-    source_collections = set()
-    for obj in bpy.data.objects:
-        if not check_is_mesh_group_instance(obj):
-            continue
-        group_modifier = obj.modifiers.get(GROUP_MOD)
-        if group_modifier and group_modifier[MG_SOCKET_GROUP]:
-            source_collections.add(group_modifier[MG_SOCKET_GROUP])
-    return source_collections
+    return get_indexed_source_collections()
 
 
-# 判断 source Collection 树是否仍被任意 Mesh Group instance 引用。
+# 一次迭代后序遍历计算每个 Collection 子树是否包含被引用的 source Collection。
 # 参数:
-#     collection: Blender Collection，需要检查的 source Collection 根节点。
+#     root_collections: 需要分析的根 Collection 列表。
 #     referenced_collections: set，当前文件中仍被引用的 source Collection 集合。
-def source_collection_tree_is_referenced(collection, referenced_collections):
-    collection_tree = set(get_collection_tree(collection))
-    return bool(collection_tree.intersection(referenced_collections))
+def compute_subtree_references(root_collections, referenced_collections):
+    subtree_referenced = {}
+    for root_collection in root_collections:
+        stack = [(root_collection, False)]
+        while stack:
+            collection, children_done = stack.pop()
+            if collection in subtree_referenced:
+                continue
+            if children_done:
+                subtree_referenced[collection] = collection in referenced_collections or any(
+                    subtree_referenced[child] for child in collection.children
+                )
+                continue
+            stack.append((collection, True))
+            stack.extend(
+                (child, False)
+                for child in collection.children
+                if child not in subtree_referenced
+            )
+    return subtree_referenced
 
 
-# 删除 source Collection 树中的 Object 与 Collection datablock。
+# 统计每个 Object 被多少个 Collection 直接包含，包括各 Scene 的主 Collection。
+# 参数: 无。
+def count_object_collection_links():
+    link_counts = {}
+    for collection in bpy.data.collections:
+        for obj in collection.objects:
+            link_counts[obj] = link_counts.get(obj, 0) + 1
+    for scene in bpy.data.scenes:
+        for obj in scene.collection.objects:
+            link_counts[obj] = link_counts.get(obj, 0) + 1
+    return link_counts
+
+
+# 分析 source Scene 中所有 source Collection 树，得到可以安全删除的 datablock 与释放的 mesh 数据量。
+# 只有完全属于未引用树的 Collection、Object 和 mesh 才会进入删除列表。
+# 参数:
+#     source_scene: Blender Scene，Mesh Group source 专用 Scene。
+#     referenced_collections: set，当前文件中仍被引用的 source Collection 集合。
+def analyze_source_group_cleanup(source_scene, referenced_collections):
+    root_collections = list(source_scene.collection.children)
+    subtree_referenced = compute_subtree_references(root_collections, referenced_collections)
+    kept_roots = [root for root in root_collections if subtree_referenced[root]]
+    removed_roots = [root for root in root_collections if not subtree_referenced[root]]
+
+    kept_collections = set()
+    for root_collection in kept_roots:
+        kept_collections.update(get_collection_tree(root_collection))
+
+    removed_collections = []
+    visited_collections = set(kept_collections)
+    for root_collection in removed_roots:
+        for collection in get_collection_tree(root_collection):
+            if collection in visited_collections:
+                continue
+            visited_collections.add(collection)
+            removed_collections.append(collection)
+
+    removed_link_counts = {}
+    for collection in removed_collections:
+        for obj in collection.objects:
+            removed_link_counts[obj] = removed_link_counts.get(obj, 0) + 1
+
+    link_counts = count_object_collection_links() if removed_link_counts else {}
+    removed_objects = [
+        obj
+        for obj, removed_links in removed_link_counts.items()
+        if link_counts.get(obj, 0) == removed_links
+    ]
+
+    data_user_counts = {}
+    for obj in removed_objects:
+        if isinstance(obj.data, bpy.types.Mesh):
+            data_user_counts[obj.data] = data_user_counts.get(obj.data, 0) + 1
+    removed_meshes = [
+        mesh
+        for mesh, object_users in data_user_counts.items()
+        if not mesh.use_fake_user and mesh.users == object_users
+    ]
+
+    report = {
+        "kept_roots": kept_roots,
+        "removed_roots": removed_roots,
+        "collections": removed_collections,
+        "objects": removed_objects,
+        "meshes": removed_meshes,
+        "vertices": 0,
+        "faces": 0,
+        "estimated_bytes": 0,
+    }
+    for mesh in removed_meshes:
+        report["vertices"] += len(mesh.vertices)
+        report["faces"] += len(mesh.polygons)
+        report["estimated_bytes"] += estimate_mesh_bytes(mesh)
+    return report
+
+
+# 把分析结果按要删除的根 Collection 拆分成报告行，共享的 Object 与 mesh 只计入第一个根。
 # 参数:
-#     collection: Blender Collection，需要删除的 source Collection 根节点。
-def remove_source_collection_tree(collection):
-    collection_tree = get_collection_tree(collection)
-    source_objects = set(collection.all_objects)
+#     report: analyze_source_group_cleanup 返回的分析结果。
+def build_cleanup_report_rows(report):
+    removed_collections = set(report["collections"])
+    removed_objects = set(report["objects"])
+    removed_meshes = set(report["meshes"])
+    counted_collections = set()
+    counted_objects = set()
+    counted_meshes = set()
+    rows = []
+    for root_collection in report["removed_roots"]:
+        row = {
+            "source_collection": root_collection.name_full,
+            "collections": 0,
+            "objects": 0,
+            "meshes": 0,
+            "vertices": 0,
+            "faces": 0,
+            "estimated_bytes": 0,
+        }
+        for collection in get_collection_tree(root_collection):
+            if collection not in removed_collections or collection in counted_collections:
+                continue
+            counted_collections.add(collection)
+            row["collections"] += 1
+            for obj in collection.objects:
+                if obj not in removed_objects or obj in counted_objects:
+                    continue
+                counted_objects.add(obj)
+                row["objects"] += 1
+                mesh = obj.data
+                if mesh not in removed_meshes or mesh in counted_meshes:
+                    continue
+                counted_meshes.add(mesh)
+                row["meshes"] += 1
+                row["vertices"] += len(mesh.vertices)
+                row["faces"] += len(mesh.polygons)
+                row["estimated_bytes"] += estimate_mesh_bytes(mesh)
+        rows.append(row)
+    rows.sort(key=lambda row: row["estimated_bytes"], reverse=True)
+    return rows
+
+
+# 把 dry run 报告写入 Text datablock，方便在 Text Editor 中查看。
+# 参数:
+#     rows: build_cleanup_report_rows 返回的报告行。
+def write_cleanup_report_text(rows):
+    text = bpy.data.texts.get(CLEANUP_REPORT_TEXT)
+    if text is None:
+        text = bpy.data.texts.new(CLEANUP_REPORT_TEXT)
+    text.from_string(json.dumps({"removed_roots": rows}, indent=2, ensure_ascii=False))
+    return text
 
-    for obj in source_objects:
-        bpy.data.objects.remove(obj, do_unlink=True)
 
-    for child_collection in reversed(collection_tree):
-        if child_collection.name in bpy.data.collections:
-            bpy.data.collections.remove(child_collection, do_unlink=True)
+# 按分析结果一次性删除找到的 datablock，不再做全局 orphans purge。
+# 参数:
+#     report: analyze_source_group_cleanup 返回的分析结果。
+def remove_source_group_cleanup(report):
+    for collection in report["collections"]:
+        invalidate_source_pivots(collection.session_uid)
+    datablocks = report["objects"] + report["meshes"] + report["collections"]
+    if datablocks:
+        bpy.data.batch_remove(datablocks)
+    return len(datablocks)
+
+
+# 从选中 Object 收集需要转换的 source Collection，保持选择顺序并去重。
+# 参数:
+#     selected_objects: 当前选中的 Object 列表。
+def collect_source_groups(selected_objects):
+    source_groups = []
+    seen_collections = set()
+    for obj in selected_objects:
+        if obj.type == "MESH" and obj.users_collection:
+            source_collection = obj.users_collection[0]
+            if source_collection not in seen_collections:
+                seen_collections.add(source_collection)
+                source_groups.append(source_collection)
+    return source_groups
+
+
+# 一次性为全部 source Collection 创建 temp mesh、instance Object 与 Mesh Group modifier。
+# 参数:
+#     source_groups: 需要转换的 source Collection 列表。
+#     offsets: 与 source_groups 一一对应的 pivot offset。
+#     target_collection: instance Object 要链接到的 Collection。
+#     node_group: 已解析好的 Mesh Group Geometry Nodes node group。
+#     realize: 是否打开 Mesh Group 的 realize socket。
+#     created_ids: 记录本次新建 datablock 的列表，用于结束时定向清理。
+def create_mesh_group_instances(
+    source_groups,
+    offsets,
+    target_collection,
+    node_group,
+    realize,
+    created_ids,
+):
+    instance_objects = []
+    for source_collection, offset in zip(source_groups, offsets):
+        temp_mesh = bpy.data.meshes.new(TEMP_MESH)
+        created_ids.append(temp_mesh)
+        instance_object = bpy.data.objects.new(
+            INST_PREFIX + source_collection.name,
+            temp_mesh,
+        )
+        target_collection.objects.link(instance_object)
+
+        geometry_nodes_modifier = add_mesh_group_modifier(
+            instance_object,
+            target_group=source_collection,
+            offset=offset,
+            node_group=node_group,
+        )
+        geometry_nodes_modifier[MG_SOCKET_REALIZE] = realize
 
-    return len(source_objects)
+        instance_object.location = offset
+        instance_object[CUSTOM_NAME] = INSTANCE_NAME
+        update_instance_index_object(instance_object)
+        instance_objects.append(instance_object)
+    return instance_objects
 
 
 class CAT_OT_make_mesh_group(bpy.types.Operator):
@@ -176,6 +480,11 @@ class CAT_OT_make_mesh_group(bpy.types.Operator):
         ],
         default="CENTER",
     )
+    bounds_mode: bpy.props.EnumProperty(
+        name="Bounds",
+        items=BOUNDS_MODE_ITEMS,
+        default="CORNERS",
+    )
     realize: bpy.props.BoolProperty(
         name="Realize",
         description="Realize Mesh Group instances for use with modifiers",
@@ -190,6 +499,7 @@ class CAT_OT_make_mesh_group(bpy.types.Operator):
     def draw(self, context):
         layout = self.layout
         layout.prop(self, "pivot")
+        layout.prop(self, "bounds_mode")
         layout.prop(self, "realize")
         layout.prop(self, "move_source_to_scene")
 
@@ -198,69 +508,88 @@ class CAT_OT_make_mesh_group(bpy.types.Operator):
         active_object = context.active_object
         current_mode = active_object.mode if active_object else "OBJECT"
         scene_collection = context.scene.collection
-        source_groups = []
-        instance_objects = []
-
-        for obj in selected_objects:
-            if obj.type == "MESH" and obj.users_collection:
-                source_collection = obj.users_collection[0]
-                if source_collection not in source_groups:
-                    source_groups.append(source_collection)
+        timer = StageTimer()
+        created_ids = []
 
+        source_groups = collect_source_groups(selected_objects)
         if not source_groups:
             self.report({"WARNING"}, "Selected objects are not in a source collection")
             return {"CANCELLED"}
 
-        for source_collection in source_groups:
-            collection_objects = source_collection.all_objects
-
-            if self.pivot == "CENTER":
-                offset = find_objs_bb_center(collection_objects)
-            elif self.pivot == "LOWEST":
-                offset = find_objs_bb_lowest_center(collection_objects)
-            elif self.pivot == "SELECTED":
-                offset = find_selected_element_center() or find_objs_bb_center(collection_objects)
-            elif self.pivot == "CURSOR":
-                offset = context.scene.cursor.location.copy()
-            else:
-                offset = Vector((0, 0, 0))
+        offsets = self.calculate_group_offsets(context, source_groups)
+        timer.mark("pivot")
 
-            if current_mode != "OBJECT":
-                bpy.ops.object.mode_set(mode="OBJECT")
+        if current_mode != "OBJECT":
+            bpy.ops.object.mode_set(mode="OBJECT")
 
-            import_node_group(PRESET_PATH, GROUP_NODE)
-            temp_mesh = bpy.data.meshes.new(TEMP_MESH)
-            instance_object = bpy.data.objects.new(
-                INST_PREFIX + source_collection.name,
-                temp_mesh,
-            )
-            scene_collection.objects.link(instance_object)
-
-            geometry_nodes_modifier = add_mesh_group_modifier(
-                instance_object,
-                target_group=source_collection,
-                offset=offset,
-            )
-            geometry_nodes_modifier[MG_SOCKET_REALIZE] = self.realize
-
-            instance_object.location = offset
-            instance_object[CUSTOM_NAME] = INSTANCE_NAME
-            instance_objects.append(instance_object)
+        node_group = import_node_group(PRESET_PATH, GROUP_NODE, appended_ids=created_ids)
+        if node_group is None:
+            self.report({"ERROR"}, f"Node group {GROUP_NODE} not found in {PRESET_PATH}")
+            return {"CANCELLED"}
+        timer.mark("node group")
+
+        instance_objects = create_mesh_group_instances(
+            source_groups,
+            offsets,
+            scene_collection,
+            node_group,
+            self.realize,
+            created_ids,
+        )
+        timer.mark("instances")
 
-        bpy.ops.object.select_all(action="DESELECT")
+        for obj in selected_objects:
+            obj.select_set(False)
         if self.move_source_to_scene:
+            hierarchy = CollectionHierarchy()
             for source_collection in source_groups:
-                move_source_collection_to_scene(source_collection, context.scene)
-
-        bpy.ops.outliner.orphans_purge(do_local_ids=True)
+                move_source_collection_to_scene(source_collection, context.scene, hierarchy)
         for source_collection in source_groups:
             source_collection.hide_viewport = True
             source_collection.hide_render = True
         for obj in instance_objects:
             obj.select_set(True)
+        timer.mark("sources")
 
+        removed_count = remove_orphaned_datablocks(created_ids)
+        timer.mark("cleanup")
+
+        message = f"Created {len(instance_objects)} Mesh Group(s) in {timer.format()}"
+        if removed_count:
+            message += f", removed {removed_count} orphan(s)"
+        self.report({"INFO"}, message)
         return {"FINISHED"}
 
+    # 一次性计算全部 source Collection 的 pivot offset，SELECTED 模式只计算一次选中中心。
+    # 参数:
+    #     context: 当前 Blender operator context。
+    #     source_groups: 需要转换的 source Collection 列表。
+    def calculate_group_offsets(self, context, source_groups):
+        selected_center = None
+        if self.pivot == "SELECTED":
+            selected_center = find_selected_element_center()
+
+        offsets = []
+        for source_collection in source_groups:
+            if self.pivot in {"CENTER", "LOWEST"}:
+                offset = get_source_collection_pivot(
+                    source_collection,
+                    self.pivot,
+                    self.bounds_mode,
+                )
+            elif self.pivot == "SELECTED":
+                offset = selected_center or get_source_collection_pivot(
+                    source_collection,
+                    "CENTER",
+                    self.bounds_mode,
+                )
+            elif self.pivot == "CURSOR":
+                offset = context.scene.cursor.location.copy()
+            else:
+                offset = Vector((0, 0, 0))
+            offsets.append(offset.copy())
+        return offsets
+
     def invoke(self, context, event):
         selected_objects = context.selected_objects
         if not selected_objects:
@@ -286,41 +615,128 @@ class CAT_OT_make_mesh_group(bpy.types.Operator):
         return self.execute(context)
 
 
+# 判断 source Collection 中是否有 Object 带有需要真实几何体的 modifier（Mesh Group modifier 除外）。
+# 参数:
+#     source_collection: Mesh Group source Collection。
+def source_requires_real_geometry(source_collection):
+    for obj in source_collection.all_objects:
+        for modifier in obj.modifiers:
+            if modifier.name != GROUP_MOD and modifier.show_viewport:
+                return True
+    return False
+
+
+# 批量设置 Mesh Group realize socket，只在结束时触发一次 depsgraph 更新。
+# 参数:
+#     context: 当前 Blender operator context，用于进度条和 view layer 更新。
+#     instance_objects: 需要修改的 Mesh Group instance Object 列表。
+#     realize: True 为 realize，False 为还原为 instance。
+#     only_with_modifiers: 只 realize source 中有 Object 带 modifier 的 instance。
+def set_mesh_group_instances_realize(context, instance_objects, realize, only_with_modifiers=False):
+    window_manager = context.window_manager
+    window_manager.progress_begin(0, max(len(instance_objects), 1))
+    changed_count = 0
+    # source Collection uid -> 是否需要真实几何体，同一 source 的 instance 只检查一次
+    source_requirements = {}
+    try:
+        for index, obj in enumerate(instance_objects):
+            window_manager.progress_update(index)
+            group_modifier = obj.modifiers[GROUP_MOD]
+            if realize and only_with_modifiers:
+                source_collection = group_modifier.get(MG_SOCKET_GROUP)
+                if source_collection is None:
+                    continue
+                source_key = source_collection.session_uid
+                if source_key not in source_requirements:
+                    source_requirements[source_key] = source_requires_real_geometry(source_collection)
+                if not source_requirements[source_key]:
+                    continue
+
+            if bool(group_modifier.get(MG_SOCKET_REALIZE)) == realize:
+                continue
+            group_modifier[MG_SOCKET_REALIZE] = realize
+            # 只打 tag，不切换 show_viewport，最后统一刷新一次
+            obj.update_tag(refresh={"DATA"})
+            changed_count += 1
+
+        if changed_count:
+            context.view_layer.update()
+    finally:
+        window_manager.progress_end()
+    return changed_count
+
+
 class CAT_OT_realize_mesh_group(bpy.types.Operator):
     bl_idname = "cat.realize_mesh_group"
     bl_label = "Realize Mesh Group"
     bl_options = {"REGISTER", "UNDO"}
     bl_description = "Allow use with other modifiers; may lower performance on large groups"
 
+    only_with_modifiers: bpy.props.BoolProperty(
+        name="Only With Modifiers",
+        description="Only realize instances whose source objects have modifiers",
+        default=False,
+    )
+
     @classmethod
     def poll(cls, context):
         return context.mode == "OBJECT" and bool(context.selected_objects)
 
     def execute(self, context):
-        count = 0
-        for obj in context.selected_objects:
-            if obj.type == "MESH" and check_is_mesh_group_instance(obj):
-                realize_mesh_group_modifier(obj, realize=True)
-                count += 1
+        instance_objects = [
+            obj for obj in context.selected_objects if is_mesh_group_instance(obj)
+        ]
+        if not instance_objects:
+            self.report({"WARNING"}, "Selected object does not have any instance")
+            return {"CANCELLED"}
 
-        if count == 0:
+        count = set_mesh_group_instances_realize(
+            context,
+            instance_objects,
+            realize=True,
+            only_with_modifiers=self.only_with_modifiers,
+        )
+        self.report({"INFO"}, f"Realized {count} of {len(instance_objects)} Mesh Group(s)")
+        return {"FINISHED"}
+
+
+class CAT_OT_unrealize_mesh_group(bpy.types.Operator):
+    bl_idname = "cat.unrealize_mesh_group"
+    bl_label = "Unrealize Mesh Group"
+    bl_options = {"REGISTER", "UNDO"}
+    bl_description = "Turn realized Mesh Groups back into lightweight instances"
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == "OBJECT" and bool(context.selected_objects)
+
+    def execute(self, context):
+        instance_objects = [
+            obj for obj in context.selected_objects if is_mesh_group_instance(obj)
+        ]
+        if not instance_objects:
             self.report({"WARNING"}, "Selected object does not have any instance")
             return {"CANCELLED"}
 
-        self.report({"INFO"}, f"Realized {count} Mesh Group(s)")
+        count = set_mesh_group_instances_realize(context, instance_objects, realize=False)
+        self.report({"INFO"}, f"Unrealized {count} of {len(instance_objects)} Mesh Group(s)")
         return {"FINISHED"}
 
 
 # 按指定模式计算 Mesh Group instance 的新 pivot offset。
 # 参数:
 #     pivot: pivot 计算模式，支持 CENTER、LOWEST、CURSOR。
-#     source_objects: source Collection 中参与 Bounding Box 计算的 Object 集合。
+#     source_collection: 参与 Bounding Box 计算的 source Collection，结果走 pivot 缓存。
 #     cursor_location: 当前 3D Cursor 在 instance local offset 语境下的位置。
-def calculate_mesh_group_pivot_offset(pivot, source_objects, cursor_location):
-    if pivot == "CENTER":
-        return find_objs_bb_center(source_objects)
-    if pivot == "LOWEST":
-        return find_objs_bb_lowest_center(source_objects)
+#     bounds_mode: Bounding Box 计算方式，CORNERS 或 AABB。
+def calculate_mesh_group_pivot_offset(
+    pivot,
+    source_collection,
+    cursor_location,
+    bounds_mode="CORNERS",
+):
+    if pivot in {"CENTER", "LOWEST"}:
+        return get_source_collection_pivot(source_collection, pivot, bounds_mode)
     if pivot == "CURSOR":
         return cursor_location.copy()
     return Vector((0, 0, 0))
@@ -330,29 +746,53 @@ def calculate_mesh_group_pivot_offset(pivot, source_objects, cursor_location):
 # 参数:
 #     instance_object: 需要修改 pivot 的 Mesh Group instance Object。
 #     pivot: pivot 计算模式，支持 CENTER、LOWEST、CURSOR。
-#     cursor: 当前 Scene 的 3D Cursor。
-def reset_mesh_group_instance_pivot(instance_object, pivot, cursor):
-    object_location_before = instance_object.location.copy()
-    source_collection = instance_object.modifiers[GROUP_MOD][MG_SOCKET_GROUP]
-    source_objects = source_collection.all_objects
-    offset_before = Vector(instance_object.modifiers[GROUP_MOD][MG_SOCKET_OFFSET]).copy()
-    cursor_location_before = cursor.location.copy()
-    cursor.location = cursor_location_before - object_location_before - offset_before
-
-    try:
+#     cursor_location: 当前 3D Cursor 的 world 位置，只读，不会被临时移动。
+#     bounds_mode: Bounding Box 计算方式，CORNERS 或 AABB。
+#     source_pivot: 同一 source Collection 预先算好的 pivot，批量处理时传入以避免重复计算。
+def reset_mesh_group_instance_pivot(
+    instance_object,
+    pivot,
+    cursor_location,
+    bounds_mode="CORNERS",
+    source_pivot=None,
+):
+    group_modifier = instance_object.modifiers[GROUP_MOD]
+    source_collection = group_modifier[MG_SOCKET_GROUP]
+    offset_before = Vector(group_modifier[MG_SOCKET_OFFSET])
+
+    if source_pivot is not None and pivot != "CURSOR":
+        offset_after = source_pivot.copy()
+    else:
+        local_cursor_location = cursor_location - instance_object.location - offset_before
         offset_after = calculate_mesh_group_pivot_offset(
             pivot,
-            source_objects,
-            cursor.location,
+            source_collection,
+            local_cursor_location,
+            bounds_mode,
         )
-        add_mesh_group_modifier(
-            instance_object,
-            target_group=source_collection,
-            offset=offset_after,
-        )
-        instance_object.location = instance_object.location + offset_before + offset_after
-    finally:
-        cursor.location = cursor_location_before
+
+    add_mesh_group_modifier(
+        instance_object,
+        target_group=source_collection,
+        offset=offset_after,
+        node_group=group_modifier.node_group,
+    )
+    instance_object.location = instance_object.location + offset_before + offset_after
+
+
+# 把 Mesh Group instance 按 source Collection 分组，保持选择顺序。
+# 参数:
+#     objects: 待分组的 Object 列表，非 Mesh Group instance 会被忽略。
+def group_instances_by_source_collection(objects):
+    instance_groups = {}
+    for obj in objects:
+        if not is_mesh_group_instance(obj):
+            continue
+        source_collection = obj.modifiers[GROUP_MOD][MG_SOCKET_GROUP]
+        if source_collection is None:
+            continue
+        instance_groups.setdefault(source_collection, []).append(obj)
+    return instance_groups
 
 
 # 查找选中 instance 对应的 storage asset instance。
@@ -372,7 +812,7 @@ def find_storage_asset_instance_for_instance(instance_object):
 class CAT_OT_reset_pivot(bpy.types.Operator):
     bl_idname = "cat.reset_pivot"
     bl_label = "Set Pivot Location"
-    bl_description = "Change pivot location of selected Mesh Group instance"
+    bl_description = "Change pivot location of all selected Mesh Group instances"
     bl_options = {"REGISTER", "UNDO"}
 
     pivot: bpy.props.EnumProperty(
@@ -384,6 +824,11 @@ class CAT_OT_reset_pivot(bpy.types.Operator):
         ],
         default="CENTER",
     )
+    bounds_mode: bpy.props.EnumProperty(
+        name="Bounds",
+        items=BOUNDS_MODE_ITEMS,
+        default="CORNERS",
+    )
     apply_to_asset_source: bpy.props.BoolProperty(
         name="Apply to Asset Source",
         description="Change both the selected instance and its matching CAT asset source",
@@ -397,28 +842,67 @@ class CAT_OT_reset_pivot(bpy.types.Operator):
     def draw(self, context):
         layout = self.layout
         layout.prop(self, "pivot")
+        layout.prop(self, "bounds_mode")
         layout.prop(self, "apply_to_asset_source")
 
     def execute(self, context):
-        obj = context.selected_objects[0]
-        asset_object = None
+        instance_groups = group_instances_by_source_collection(context.selected_objects)
+        if not instance_groups:
+            self.report({"WARNING"}, "Selected objects do not have any instance")
+            return {"CANCELLED"}
+
+        asset_objects = {}
         if self.apply_to_asset_source:
-            asset_object = find_storage_asset_instance_for_instance(obj)
-            if asset_object is None:
+            for source_collection, instances in instance_groups.items():
+                asset_object = find_storage_asset_instance_for_instance(instances[0])
+                if asset_object is not None:
+                    asset_objects[source_collection] = asset_object
+            if not asset_objects:
                 self.report({"WARNING"}, "No matching CAT asset source found")
                 return {"CANCELLED"}
 
-        cursor = context.scene.cursor
-        reset_mesh_group_instance_pivot(obj, self.pivot, cursor)
-        if asset_object is not None:
-            if asset_object != obj:
-                reset_mesh_group_instance_pivot(asset_object, self.pivot, cursor)
-            asset_object.asset_generate_preview()
-
+        cursor_location = context.scene.cursor.location.copy()
+        instance_count = 0
+        for source_collection, instances in instance_groups.items():
+            source_pivot = None
+            if self.pivot != "CURSOR":
+                source_pivot = get_source_collection_pivot(
+                    source_collection,
+                    self.pivot,
+                    self.bounds_mode,
+                )
+
+            targets = list(instances)
+            asset_object = asset_objects.get(source_collection)
+            if asset_object is not None and asset_object not in targets:
+                targets.append(asset_object)
+
+            for instance_object in targets:
+                reset_mesh_group_instance_pivot(
+                    instance_object,
+                    self.pivot,
+                    cursor_location,
+                    self.bounds_mode,
+                    source_pivot,
+                )
+            instance_count += len(instances)
+
+        queue_asset_previews(asset_objects.values())
+
+        message = (
+            f"Set pivot on {instance_count} instance(s) "
+            f"in {len(instance_groups)} source group(s)"
+        )
+        if self.apply_to_asset_source:
+            missing_count = len(instance_groups) - len(asset_objects)
+            message += f", updated {len(asset_objects)} asset source(s)"
+            if missing_count:
+                message += f", {missing_count} group(s) without asset source"
+        self.report({"INFO"}, message)
         return {"FINISHED"}
 
     def invoke(self, context, event):
-        if not any(check_is_mesh_group_instance(obj) for obj in context.selected_objects):
+        if not any(is_mesh_group_instance(obj) for obj in context.selected_objects):
             self.report({"WARNING"}, "Selected objects do not have any instance")
             return {"CANCELLED"}
 
@@ -436,7 +920,7 @@ class CAT_OT_find_source_group(bpy.types.Operator):
 
     def execute(self, context):
         obj = context.selected_objects[0]
-        if not check_is_mesh_group_instance(obj):
+        if not is_mesh_group_instance(obj):
             self.report({"WARNING"}, "Selected object is not an instance")
             return {"CANCELLED"}
 
@@ -461,35 +945,42 @@ class CAT_OT_cleanup_source_groups(bpy.types.Operator):
     bl_description = "Delete Mesh Group source collections that are not referenced by any instance"
     bl_options = {"REGISTER", "UNDO"}
 
+    dry_run: bpy.props.BoolProperty(
+        name="Dry Run",
+        description="Only report what would be removed, without deleting anything",
+        default=False,
+    )
+
     def execute(self, context):
         source_scene = bpy.data.scenes.get(GROUP_ROOT_COLL)
         if source_scene is None:
             self.report({"INFO"}, "No source scene found")
             return {"FINISHED"}
 
-        referenced_collections = get_referenced_source_collections()
-        removed_collections = 0
-        removed_objects = 0
-        for source_collection in list(source_scene.collection.children):
-            if source_collection_tree_is_referenced(
-                source_collection,
-                referenced_collections,
-            ):
-                continue
+        report = analyze_source_group_cleanup(
+            source_scene,
+            get_referenced_source_collections(),
+        )
+        summary = (
+            f"{len(report['removed_roots'])} source group(s), "
+            f"{len(report['objects'])} object(s), {len(report['meshes'])} mesh(es), "
+            f"{report['vertices']} vertices, {report['faces']} faces, "
+            f"~{format_bytes(report['estimated_bytes'])}"
+        )
 
-            removed_objects += remove_source_collection_tree(source_collection)
-            removed_collections += 1
+        if self.dry_run:
+            write_cleanup_report_text(build_cleanup_report_rows(report))
+            self.report({"INFO"}, f"Would remove {summary}, see {CLEANUP_REPORT_TEXT}")
+            return {"FINISHED"}
 
-        bpy.ops.outliner.orphans_purge(do_local_ids=True)
-        self.report(
-            {"INFO"},
-            f"Removed {removed_collections} source group(s), {removed_objects} object(s)",
-        )
+        remove_source_group_cleanup(report)
+        self.report({"INFO"}, f"Removed {summary}")
         return {"FINISHED"}
 
     def invoke(self, context, event):
         return self.execute(context)
 
+
 class CAT_OT_add_custom_axis(bpy.types.Operator):
     bl_idname = "cat.add_custom_axis"
     bl_label = "Add Custom Axis Object"
@@ -502,7 +993,7 @@ class CAT_OT_add_custom_axis(bpy.types.Operator):
 
     def execute(self, context):
         obj = context.selected_objects[0]
-        if not check_is_mesh_group_instance(obj):
+        if not is_mesh_group_instance(obj):
             self.report({"WARNING"}, "Selected object is not an instance")
             return {"CANCELLED"}
 
@@ -0,0 +1,248 @@
+import bpy
+import json
+from pathlib import Path
+
+from bpy.props import CollectionProperty, EnumProperty, StringProperty
+from bpy.types import PropertyGroup
+from bpy_extras.io_utils import ExportHelper
+
+MISSING_ASSET_REPORT_TEXT = "CAT_MissingAssets.json"
+MISSING_ASSET_REPORT_VERSION = 2
+MISSING_ASSET_TYPE_ITEMS = [
+    ("IMAGE", "Image", "Image file not found", "IMAGE_DATA", 1),
+    ("LIBRARY", "Library", "Linked library .blend not found", "LIBRARY_DATA_BROKEN", 2),
+    ("LINKED_DATA", "Linked Data", "Linked data-block whose library or definition is missing", "LINKED", 3),
+    ("MOVIECLIP", "Movie Clip", "Movie clip file not found", "FILE_MOVIE", 4),
+    ("SOUND", "Sound", "Sound file not found", "FILE_SOUND", 5),
+    ("FONT", "Font", "Font file not found", "FILE_FONT", 6),
+]
+MISSING_ASSET_STATUS_ITEMS = [
+    ("MISSING", "Missing", "The file does not exist", "CANCEL", 1),
+    ("UNKNOWN", "Unknown", "The path check timed out or failed", "QUESTION", 2),
+    ("BROKEN_LINK", "Broken Link", "The linked data-block cannot be resolved", "UNLINKED", 3),
+]
+MISSING_ASSET_TYPE_ICONS = {item[0]: item[3] for item in MISSING_ASSET_TYPE_ITEMS}
+USER_RECORD_FIELDS = ("id_type", "name", "library", "path")
+
+# 报告中只保存 problem 代码，中文说明只在 UI 中显示
+PROBLEM_LABELS = {
+    "PATH_CHECK_TIMEOUT": "路径检查超时，无法确认",
+    "LIBRARY_MISSING": "来自确认丢失的库",
+    "OBJECT_DATA_MISSING": "链接对象但无数据 (可能从库中丢失定义)",
+}
+# ID 类型的中文显示名
+ID_TYPE_LABELS = {
+    "OBJECT": "物体",
+    "MATERIAL": "材质",
+    "NODETREE": "节点组",
+    "SCENE": "场景",
+    "COLLECTION": "集合",
+    "TEXTURE": "旧版纹理",
+    "WORLD": "世界",
+    "LIGHT": "灯光",
+    "MESH": "网格",
+    "CURVE": "曲线",
+    "SPEAKER": "扬声器",
+}
+
+
+# 把一条引用者记录格式化成 UI 中显示的中文文本。
+# 参数:
+#     user: CAT_PG_missing_asset_user 中的一个引用者。
+def format_user_record(user):
+    label = ID_TYPE_LABELS.get(user.id_type, user.id_type)
+    text = f"{label} '{user.name}'"
+    if user.path:
+        text += f" ({user.path})"
+    if user.library:
+        text += f" [{user.library}]"
+    return text
+
+
+# 把扫描结果转成 JSON 文本，按类型与名称排序，方便不同版本的文件之间对比。
+# 参数:
+#     entries: find_all_missing_assets_and_users 返回的结果列表。
+def missing_asset_report_to_json(entries):
+    entries = sorted(entries, key=lambda entry: (entry["asset_type"], entry["name"]))
+    counts = {}
+    for entry in entries:
+        counts[entry["asset_type"]] = counts.get(entry["asset_type"], 0) + 1
+    # 不写入当前 .blend 的路径，同一文件放在不同位置时报告保持一致
+    report = {
+        "version": MISSING_ASSET_REPORT_VERSION,
+        "counts": counts,
+        "assets": entries,
+    }
+    return json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+
+
+# 把 JSON 报告写入 Text datablock，方便在 Text Editor 中查看。
+# 参数:
+#     json_text: missing_asset_report_to_json 生成的文本。
+def write_missing_asset_report_text(json_text):
+    text = bpy.data.texts.get(MISSING_ASSET_REPORT_TEXT)
+    if text is None:
+        text = bpy.data.texts.new(MISSING_ASSET_REPORT_TEXT)
+    text.from_string(json_text)
+    return text
+
+
+# 用扫描结果重新填充 UI 列表。
+# 参数:
+#     params: 场景的 cat_params。
+#     entries: find_all_missing_assets_and_users 返回的结果列表。
+def fill_missing_asset_items(params, entries):
+    params.missing_assets.clear()
+    for entry in sorted(entries, key=lambda entry: (entry["asset_type"], entry["name"])):
+        item = params.missing_assets.add()
+        item.name = entry["name"]
+        item.asset_type = entry["asset_type"]
+        item.status = entry["status"]
+        item.id_type = entry["id_type"]
+        item.filepath = entry["filepath"]
+        item.abs_path = entry["abs_path"]
+        item.library = entry["library"]
+        item.problem = entry["problem"]
+        for record in entry["users"]:
+            user = item.users.add()
+            for field in USER_RECORD_FIELDS:
+                setattr(user, field, record[field])
+    params.missing_assets_index = 0
+
+
+class CAT_PG_missing_asset_user(PropertyGroup):
+    """丢失资产的一个引用者"""
+
+    id_type: StringProperty(name="ID Type")
+    library: StringProperty(name="Library")
+    path: StringProperty(name="Path")
+
+
+class CAT_PG_missing_asset(PropertyGroup):
+    """丢失资产报告中的一行"""
+
+    asset_type: EnumProperty(name="Type", items=MISSING_ASSET_TYPE_ITEMS)
+    status: EnumProperty(name="Status", items=MISSING_ASSET_STATUS_ITEMS)
+    id_type: StringProperty(name="ID Type")
+    filepath: StringProperty(name="Expected Path")
+    abs_path: StringProperty(name="Absolute Path")
+    library: StringProperty(name="Library")
+    problem: StringProperty(name="Problem")
+    users: CollectionProperty(type=CAT_PG_missing_asset_user)
+
+
+class CAT_UL_missing_assets(bpy.types.UIList):
+    filter_asset_type: EnumProperty(
+        name="Type",
+        items=[("ALL", "All Types", "Show every asset type", "NONE", 0)] + MISSING_ASSET_TYPE_ITEMS,
+        default="ALL",
+    )
+    filter_status: EnumProperty(
+        name="Status",
+        items=[("ALL", "All", "Show every status", "NONE", 0)] + MISSING_ASSET_STATUS_ITEMS,
+        default="ALL",
+    )
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.label(text=item.name, icon=MISSING_ASSET_TYPE_ICONS[item.asset_type])
+        if item.status == "UNKNOWN":
+            row.label(text="", icon="QUESTION")
+        row.label(text=str(len(item.users)), icon="USER")
+
+    def draw_filter(self, context, layout):
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="")
+        row.prop(self, "use_filter_invert", text="", icon="ARROW_LEFTRIGHT")
+        row = layout.row(align=True)
+        row.prop(self, "filter_asset_type", text="")
+        row.prop(self, "filter_status", text="")
+        row.prop(self, "use_filter_sort_alpha", text="", icon="SORTALPHA")
+
+    def filter_items(self, context, data, propname):
+        items = getattr(data, propname)
+        helper = bpy.types.UI_UL_list
+        flags = [self.bitflag_filter_item] * len(items)
+        if self.filter_name:
+            flags = helper.filter_items_by_name(
+                self.filter_name, self.bitflag_filter_item, items, "name"
+            )
+        for index, item in enumerate(items):
+            if self.filter_asset_type != "ALL" and item.asset_type != self.filter_asset_type:
+                flags[index] &= ~self.bitflag_filter_item
+            elif self.filter_status != "ALL" and item.status != self.filter_status:
+                flags[index] &= ~self.bitflag_filter_item
+        order = helper.sort_items_by_name(items, "name") if self.use_filter_sort_alpha else []
+        return flags, order
+
+
+class CAT_OT_export_missing_assets(bpy.types.Operator, ExportHelper):
+    bl_idname = "cat.export_missing_assets"
+    bl_label = "Export Missing Asset Report"
+    bl_description = f"Export the last missing asset scan stored in {MISSING_ASSET_REPORT_TEXT} as JSON"
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json", options={"HIDDEN"})
+
+    def execute(self, context):
+        text = bpy.data.texts.get(MISSING_ASSET_REPORT_TEXT)
+        if text is None:
+            self.report({"WARNING"}, "No missing asset report, run Show Missing Assets first")
+            return {"CANCELLED"}
+
+        filepath = str(Path(self.filepath).with_suffix(".json"))
+        try:
+            with open(filepath, "w", encoding="utf-8", newline="") as report_file:
+                report_file.write(text.as_string())
+        except OSError as error:
+            self.report({"ERROR"}, f"Could not write {filepath}: {error}")
+            return {"CANCELLED"}
+
+        self.report({"INFO"}, f"Exported missing asset report to {filepath}")
+        return {"FINISHED"}
+
+
+class CAT_PT_missing_assets(bpy.types.Panel):
+    bl_idname = "CAT_PT_missing_assets"
+    bl_label = "Missing Assets"
+    bl_category = "CAT"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_parent_id = "CAT_PT_tool_panel"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        parameters = context.scene.cat_params
+        layout = self.layout
+        row = layout.row(align=True)
+        row.operator("cat.show_missing_assets", text="Scan", icon="VIEWZOOM")
+        row.operator("cat.export_missing_assets", text="Export", icon="EXPORT")
+
+        layout.template_list(
+            "CAT_UL_missing_assets",
+            "",
+            parameters,
+            "missing_assets",
+            parameters,
+            "missing_assets_index",
+            rows=6,
+        )
+        if not 0 <= parameters.missing_assets_index < len(parameters.missing_assets):
+            return
+
+        item = parameters.missing_assets[parameters.missing_assets_index]
+        box = layout.box()
+        column = box.column(align=True)
+        column.label(text=f"{item.id_type}: {item.name}")
+        if item.filepath:
+            column.label(text=item.filepath, icon="FILE_FOLDER")
+        if item.library:
+            column.label(text=item.library, icon="LIBRARY_DATA_DIRECT")
+        if item.problem:
+            column.label(text=PROBLEM_LABELS.get(item.problem, item.problem), icon="ERROR")
+        if item.asset_type == "LIBRARY":
+            column.label(text="所有从此库链接的数据块都将受影响。", icon="INFO")
+        elif not item.users:
+            column.label(text="通过此脚本的检查未找到特定用户。", icon="INFO")
+        for user in item.users:
+            column.label(text=format_user_record(user), icon="DOT")
@@ -0,0 +1,140 @@
+import os
+import queue
+import threading
+import time
+
+# 纯 Python 的批量路径存在性检查，不依赖 bpy，可以脱离 Blender 测试。
+
+DEFAULT_PATH_CHECK_WORKERS = 8
+DEFAULT_PATH_CHECK_TIMEOUT = 5.0
+# 同一目录下的路径达到这个数量时改为一次 os.scandir，少于时逐个 stat 更快。
+SCANDIR_MIN_PATHS = 4
+PATH_CHECK_POLL_SECONDS = 0.05
+
+
+# 规范化路径，用作去重与结果查询的 key。
+# 参数:
+#     path: 绝对路径。
+def normalize_check_path(path):
+    return os.path.normcase(os.path.normpath(path))
+
+
+# 读取目录中全部条目名称，目录不存在时返回空集合。
+# 参数:
+#     directory: 规范化后的目录路径。
+def list_directory_names(directory):
+    try:
+        with os.scandir(directory) as entries:
+            return {os.path.normcase(entry.name) for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
+# 检查同一目录下的一组路径，返回 路径 -> 是否存在。
+# 路径较多时用一次目录列表代替逐个 stat，列目录失败时退回逐个 stat。
+# 列表中找不到的名称再 stat 一次：macOS 等大小写不敏感的文件系统上 normcase 不折叠大小写。
+# 参数:
+#     directory: 规范化后的目录路径。
+#     paths: 该目录下规范化后的路径列表。
+def check_directory_paths(directory, paths):
+    if len(paths) >= SCANDIR_MIN_PATHS:
+        try:
+            names = list_directory_names(directory)
+        except OSError:
+            pass
+        else:
+            if not names:
+                # 目录不存在或为空，其中的路径都不可能存在
+                return dict.fromkeys(paths, False)
+            return {
+                path: os.path.basename(path) in names or os.path.exists(path) for path in paths
+            }
+    return {path: os.path.exists(path) for path in paths}
+
+
+# 在 daemon worker 线程中循环执行目录检查任务。
+# 卡在 NAS stat 上的线程无法中断，daemon 线程不会阻止 Blender 退出。
+# 参数:
+#     jobs: 待处理的 (目录, 路径列表) 队列。
+#     results: 输出 (目录, 结果或异常) 的队列。
+#     started_at: 目录 -> 开始时间，用于主线程判断超时。
+#     stop: 主线程放弃剩余任务时设置的 Event。
+def run_path_check_worker(jobs, results, started_at, stop):
+    while not stop.is_set():
+        try:
+            directory, directory_paths = jobs.get_nowait()
+        except queue.Empty:
+            return
+        started_at[directory] = time.monotonic()
+        try:
+            results.put((directory, check_directory_paths(directory, directory_paths)))
+        except OSError as error:
+            results.put((directory, error))
+
+
+# 批量检查路径是否存在，返回 规范化路径 -> True / False / None。
+# None 表示检查超时或出错，无法确认。路径先去重再按目录分组，每个目录一个任务。
+# 超时按目录任务计算：任务开始运行超过 timeout 秒即放弃，该目录下全部路径记为 None；
+# 全部 worker 都卡在超时任务上时，剩余目录同样记为 None。
+# 参数:
+#     paths: 要检查的绝对路径。
+#     workers: worker 线程数量。
+#     timeout: 单个目录任务的超时秒数。
+def check_paths(paths, workers=DEFAULT_PATH_CHECK_WORKERS, timeout=DEFAULT_PATH_CHECK_TIMEOUT):
+    paths_by_directory = {}
+    for path in {normalize_check_path(path) for path in paths if path}:
+        paths_by_directory.setdefault(os.path.dirname(path), []).append(path)
+    results = {}
+    if not paths_by_directory:
+        return results
+
+    jobs = queue.Queue()
+    for directory, directory_paths in paths_by_directory.items():
+        jobs.put((directory, directory_paths))
+    finished = queue.Queue()
+    started_at = {}
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=run_path_check_worker,
+            args=(jobs, finished, started_at, stop),
+            name=f"CAT_PathCheck_{index}",
+            daemon=True,
+        )
+        for index in range(min(max(1, workers), len(paths_by_directory)))
+    ]
+    for thread in threads:
+        thread.start()
+
+    pending = set(paths_by_directory)
+    abandoned = set()
+    try:
+        while pending:
+            try:
+                directory, result = finished.get(timeout=PATH_CHECK_POLL_SECONDS)
+            except queue.Empty:
+                pass
+            else:
+                if directory in pending:
+                    pending.discard(directory)
+                    if isinstance(result, OSError):
+                        results.update(dict.fromkeys(paths_by_directory[directory]))
+                    else:
+                        results.update(result)
+                abandoned.discard(directory)
+
+            now = time.monotonic()
+            for directory in list(pending):
+                start = started_at.get(directory)
+                if start is not None and now - start > timeout:
+                    # 卡住的 stat 无法中断，只能放弃结果，线程会一直占用到 stat 返回
+                    pending.discard(directory)
+                    abandoned.add(directory)
+                    results.update(dict.fromkeys(paths_by_directory[directory]))
+            if pending and len(abandoned) >= len(threads):
+                for directory in pending:
+                    results.update(dict.fromkeys(paths_by_directory[directory]))
+                break
+    finally:
+        stop.set()
+    return results
@@ -0,0 +1,480 @@
+import bpy
+from bpy.app.handlers import persistent
+
+# 这些 pointer 不是数据引用（RNA 元信息、自身或所属 Library），构建时跳过。
+SKIPPED_POINTER_PROPERTIES = {"rna_type", "id_data", "original", "library"}
+# 这些类型的 ID 更新时总是可能改变引用（node、材质、Collection 成员等），直接失效。
+REFERENCE_UPDATE_ID_TYPES = {
+    "CAMERA",
+    "COLLECTION",
+    "LIBRARY",
+    "LIGHT",
+    "MATERIAL",
+    "NODETREE",
+    "SPEAKER",
+    "TEXTURE",
+    "WORLD",
+}
+# 用数量变化检测 ID 的新增与删除。
+REFERENCE_ID_COLLECTIONS = (
+    "cameras",
+    "collections",
+    "curves",
+    "fonts",
+    "images",
+    "libraries",
+    "lights",
+    "materials",
+    "meshes",
+    "metaballs",
+    "movieclips",
+    "node_groups",
+    "objects",
+    "scenes",
+    "sounds",
+    "speakers",
+    "textures",
+    "worlds",
+)
+# 缓存的反向引用图：被引用 ID -> [(user ID, 引用路径), ...]，以及完整 user_map。
+# id_counts 与 signatures 记录构建缓存时的状态，depsgraph 更新只在它们变化时让缓存失效。
+_graph_state = {
+    "references": None,
+    "user_map": None,
+    "node_group_materials": None,
+    "id_counts": None,
+    "signatures": None,
+}
+# bl_rna identifier -> 可能保存 ID 的 pointer 属性名，每种 RNA 类型只解析一次。
+_pointer_properties_cache = {}
+
+
+# 使反向引用图失效，下次查询时重新构建。
+# 参数: 无。
+def invalidate_reference_graph():
+    _graph_state["references"] = None
+    _graph_state["user_map"] = None
+    _graph_state["node_group_materials"] = None
+    _graph_state["id_counts"] = None
+    _graph_state["signatures"] = None
+
+
+# 获取 struct 上除元信息外的 pointer 属性名，按 bl_rna identifier 缓存。
+# 参数:
+#     struct: 要检查的 RNA struct。
+def get_pointer_properties(struct):
+    identifier = struct.bl_rna.identifier
+    properties = _pointer_properties_cache.get(identifier)
+    if properties is None:
+        properties = _pointer_properties_cache[identifier] = tuple(
+            prop.identifier
+            for prop in struct.bl_rna.properties
+            if prop.type == "POINTER" and prop.identifier not in SKIPPED_POINTER_PROPERTIES
+        )
+    return properties
+
+
+# 获取 ID 的 session_uid，None 返回 0，用于签名中避免持有 ID 指针。
+# 参数:
+#     id_data: ID 或 None。
+def get_id_uid(id_data):
+    return id_data.session_uid if id_data is not None else 0
+
+
+# 获取 struct 上 ID pointer 的 session_uid。
+# 参数:
+#     struct: 要检查的 RNA struct。
+def get_struct_reference_uids(struct):
+    uids = []
+    for identifier in get_pointer_properties(struct):
+        value = getattr(struct, identifier, None)
+        if isinstance(value, bpy.types.ID):
+            uids.append(value.session_uid)
+    return tuple(uids)
+
+
+# 获取 modifier 的 ID pointer 与 ID 类型 IDProperty（Geometry Nodes 输入）的 session_uid。
+# 参数:
+#     modifier: 要检查的 modifier。
+def get_modifier_reference_uids(modifier):
+    uids = list(get_struct_reference_uids(modifier))
+    for key in modifier.keys():
+        value = modifier.get(key)
+        if isinstance(value, bpy.types.ID):
+            uids.append(value.session_uid)
+    return tuple(uids)
+
+
+# 获取会被 transform、几何编辑等频繁更新的 ID 的引用签名，签名不变说明引用没有变化。
+# 其它类型返回 None。
+# 参数:
+#     id_data: depsgraph 更新中的原始 ID。
+def get_reference_signature(id_data):
+    id_type = id_data.id_type
+    if id_type == "OBJECT":
+        return (
+            get_id_uid(id_data.data),
+            get_id_uid(id_data.parent),
+            get_id_uid(id_data.instance_collection),
+            tuple(get_id_uid(slot.material) for slot in id_data.material_slots if slot.link == "OBJECT"),
+            tuple(get_modifier_reference_uids(modifier) for modifier in id_data.modifiers),
+            tuple(get_struct_reference_uids(constraint) for constraint in id_data.constraints),
+        )
+    if id_type in {"MESH", "CURVE", "METABALL"}:
+        return (
+            tuple(get_id_uid(material) for material in id_data.materials),
+            get_struct_reference_uids(id_data),
+        )
+    if id_type == "SCENE":
+        return (
+            get_id_uid(id_data.world),
+            get_id_uid(id_data.camera),
+            get_id_uid(id_data.active_clip),
+        )
+    return None
+
+
+# 获取各类 ID 的数量，数量变化说明有 ID 被新增或删除。
+# 参数: 无。
+def get_id_counts():
+    return tuple(len(getattr(bpy.data, name)) for name in REFERENCE_ID_COLLECTIONS)
+
+
+# 构建缓存时记录 ID 数量与引用签名，供 depsgraph 更新时比较。
+# 参数: 无。
+def record_reference_state():
+    if _graph_state["signatures"] is not None:
+        return
+    signatures = {}
+    for id_collection in (
+        bpy.data.objects,
+        bpy.data.meshes,
+        bpy.data.curves,
+        bpy.data.metaballs,
+        bpy.data.scenes,
+    ):
+        for id_data in id_collection:
+            signatures[id_data.session_uid] = get_reference_signature(id_data)
+    _graph_state["signatures"] = signatures
+    _graph_state["id_counts"] = get_id_counts()
+
+
+# 判断 depsgraph 更新是否可能改变引用；选择、transform 与几何编辑不改变引用时返回 False。
+# 参数:
+#     depsgraph: depsgraph_update_post 收到的 depsgraph。
+def depsgraph_changes_references(depsgraph):
+    if get_id_counts() != _graph_state["id_counts"]:
+        return True
+    signatures = _graph_state["signatures"]
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if id_data.id_type in REFERENCE_UPDATE_ID_TYPES:
+            return True
+        signature = get_reference_signature(id_data)
+        if signature is not None and signatures.get(id_data.session_uid) != signature:
+            return True
+    return False
+
+
+# 记录一条引用。
+# 参数:
+#     references: 反向引用字典。
+#     target: 被引用的 ID。
+#     user: 引用 target 的 ID。
+#     path: 从 user 出发的引用路径。
+def add_reference(references, target, user, path):
+    if target is None or target == user:
+        return
+    references.setdefault(target, []).append((user, path))
+
+
+# 记录 struct 上全部 ID pointer 属性，用于 modifier、constraint、node、strip 等小结构。
+# 参数:
+#     references: 反向引用字典。
+#     user: 拥有该 struct 的 ID。
+#     struct: 要检查的 RNA struct。
+#     path: struct 相对 user 的路径。
+def add_struct_references(references, user, struct, path):
+    for prop in struct.bl_rna.properties:
+        if prop.type != "POINTER" or prop.identifier in SKIPPED_POINTER_PROPERTIES:
+            continue
+        try:
+            value = getattr(struct, prop.identifier)
+        except (AttributeError, RuntimeError):
+            continue
+        if isinstance(value, bpy.types.ID):
+            add_reference(references, value, user, f"{path}.{prop.identifier}")
+
+
+# 记录 struct 上保存 ID 的 IDProperty，例如 Geometry Nodes modifier 的输入。
+# 参数:
+#     references: 反向引用字典。
+#     user: 拥有该 struct 的 ID。
+#     struct: 要检查的 RNA struct。
+#     path: struct 相对 user 的路径。
+def add_id_property_references(references, user, struct, path):
+    for key in struct.keys():
+        value = struct.get(key)
+        if isinstance(value, bpy.types.ID):
+            add_reference(references, value, user, f'{path}["{key}"]')
+
+
+# 记录 node tree 中 node 与 socket 引用的 ID，Group node 只记录直接引用，不递归展开。
+# 参数:
+#     references: 反向引用字典。
+#     user: 拥有该 node tree 的 ID（node group 本身或 embedded tree 的所有者）。
+#     node_tree: 要检查的 node tree。
+#     path: node tree 相对 user 的路径，node group 自身为空字符串。
+def add_node_tree_references(references, user, node_tree, path):
+    prefix = f"{path}.nodes" if path else "nodes"
+    for node in node_tree.nodes:
+        node_path = f'{prefix}["{node.name}"]'
+        add_struct_references(references, user, node, node_path)
+        for socket in node.inputs:
+            value = getattr(socket, "default_value", None)
+            if isinstance(value, bpy.types.ID):
+                add_reference(
+                    references,
+                    value,
+                    user,
+                    f'{node_path}.inputs["{socket.identifier}"].default_value',
+                )
+
+
+# 记录 Object 的 data、parent、材质槽、modifier、constraint 与集合实例引用。
+# 参数:
+#     references: 反向引用字典。
+#     obj: 要检查的 Object。
+def add_object_references(references, obj):
+    add_reference(references, obj.data, obj, "data")
+    add_reference(references, obj.parent, obj, "parent")
+    add_reference(references, obj.instance_collection, obj, "instance_collection")
+    for index, slot in enumerate(obj.material_slots):
+        if slot.link == "OBJECT":
+            add_reference(references, slot.material, obj, f"material_slots[{index}].material")
+    for modifier in obj.modifiers:
+        modifier_path = f'modifiers["{modifier.name}"]'
+        add_struct_references(references, obj, modifier, modifier_path)
+        add_id_property_references(references, obj, modifier, modifier_path)
+    for constraint in obj.constraints:
+        constraint_path = f'constraints["{constraint.name}"]'
+        add_struct_references(references, obj, constraint, constraint_path)
+        for index, target in enumerate(getattr(constraint, "targets", ())):
+            target_path = f"{constraint_path}.targets[{index}]"
+            add_struct_references(references, obj, target, target_path)
+
+
+# 记录 Collection 的成员 Object 与子 Collection。
+# 参数:
+#     references: 反向引用字典。
+#     user: 拥有该 Collection 的 ID（Collection 本身或场景主 Collection 的 Scene）。
+#     collection: 要检查的 Collection。
+#     path: Collection 相对 user 的路径，Collection 自身为空字符串。
+def add_collection_references(references, user, collection, path):
+    prefix = f"{path}." if path else ""
+    for obj in collection.objects:
+        add_reference(references, obj, user, f'{prefix}objects["{obj.name}"]')
+    for child in collection.children:
+        add_reference(references, child, user, f'{prefix}children["{child.name}"]')
+
+
+# 记录 Scene 的 world、camera、主 Collection、合成器节点与序列编辑器 strip 引用。
+# 参数:
+#     references: 反向引用字典。
+#     scene: 要检查的 Scene。
+def add_scene_references(references, scene):
+    add_reference(references, scene.world, scene, "world")
+    add_reference(references, scene.camera, scene, "camera")
+    add_reference(references, scene.active_clip, scene, "active_clip")
+    add_collection_references(references, scene, scene.collection, "collection")
+    compositor_tree = getattr(scene, "node_tree", None)
+    if compositor_tree:
+        add_node_tree_references(references, scene, compositor_tree, "node_tree")
+
+    sequence_editor = scene.sequence_editor
+    if sequence_editor is None:
+        return
+    strips = getattr(sequence_editor, "strips_all", None)
+    if strips is None:
+        strips = sequence_editor.sequences_all
+    for strip in strips:
+        strip_path = f'sequence_editor.strips["{strip.name}"]'
+        add_struct_references(references, scene, strip, strip_path)
+
+
+# 遍历整个文件一次，构建反向引用图。
+# 参数: 无。
+def build_reference_graph():
+    references = {}
+    for node_group in bpy.data.node_groups:
+        add_node_tree_references(references, node_group, node_group, "")
+    # 这些 ID 自带 embedded node tree
+    embedded_tree_owners = (
+        bpy.data.materials,
+        bpy.data.worlds,
+        bpy.data.lights,
+        bpy.data.textures,
+    )
+    for id_collection in embedded_tree_owners:
+        for id_data in id_collection:
+            if getattr(id_data, "node_tree", None) is not None:
+                add_node_tree_references(references, id_data, id_data.node_tree, "node_tree")
+    for texture in bpy.data.textures:
+        add_struct_references(references, texture, texture, "")
+    for obj in bpy.data.objects:
+        add_object_references(references, obj)
+    # Object data 上的材质、字体、曲线 taper/bevel 等引用
+    for id_collection in (bpy.data.meshes, bpy.data.curves, bpy.data.metaballs):
+        for id_data in id_collection:
+            for index, material in enumerate(id_data.materials):
+                add_reference(references, material, id_data, f"materials[{index}]")
+            if isinstance(id_data, bpy.types.Curve):
+                add_struct_references(references, id_data, id_data, "")
+    for speaker in bpy.data.speakers:
+        add_reference(references, speaker.sound, speaker, "sound")
+    for collection in bpy.data.collections:
+        add_collection_references(references, collection, collection, "")
+    for scene in bpy.data.scenes:
+        add_scene_references(references, scene)
+
+    # 路径以 . 开头时说明是 ID 自身的属性，去掉开头的 .
+    for entries in references.values():
+        entries[:] = [(user, path.lstrip(".")) for user, path in entries]
+    return references
+
+
+# 获取缓存的反向引用图，失效后重新构建。
+# 参数: 无。
+def get_reference_graph():
+    if _graph_state["references"] is None:
+        record_reference_state()
+        _graph_state["references"] = build_reference_graph()
+    return _graph_state["references"]
+
+
+# 获取缓存的完整 user_map，覆盖反向引用图没有专门处理的引用类型。
+# 参数: 无。
+def get_user_map():
+    if _graph_state["user_map"] is None:
+        record_reference_state()
+        _graph_state["user_map"] = bpy.data.user_map()
+    return _graph_state["user_map"]
+
+
+# 查询引用指定 ID 的 (user ID, 引用路径) 列表。
+# 参数:
+#     datablock: 被引用的 ID。
+def get_references(datablock):
+    return get_reference_graph().get(datablock, [])
+
+
+# 获取 node tree 中 Group node 直接引用的 node group。
+# 参数:
+#     node_tree: 要检查的 node tree。
+def get_direct_node_groups(node_tree):
+    return {
+        node.node_tree
+        for node in node_tree.nodes
+        if node.type == "GROUP" and node.node_tree is not None
+    }
+
+
+# 按拓扑顺序（子级先于父级）计算每个 node group 传递包含的全部 node group。
+# 每个 node group 只展开一次，共用的嵌套 group 不会被重复遍历。
+# 参数:
+#     node_groups: 要计算的 node group，默认为 bpy.data.node_groups。
+def build_node_group_closure(node_groups=None):
+    if node_groups is None:
+        node_groups = bpy.data.node_groups
+    closure = {}
+    direct_groups = {}
+    for root in node_groups:
+        if root in closure:
+            continue
+        # 迭代式后序遍历。on_path 只包含已展开但尚未完成的 node group，
+        # 也就是当前遍历路径上的祖先，用来跳过异常数据中的循环引用。
+        on_path = set()
+        stack = [(root, False)]
+        while stack:
+            node_group, children_done = stack.pop()
+            if children_done:
+                reachable = set()
+                for child in direct_groups[node_group]:
+                    reachable.add(child)
+                    reachable |= closure.get(child, frozenset())
+                closure[node_group] = frozenset(reachable)
+                on_path.discard(node_group)
+                continue
+            # 同一个 node group 可能被多个父级压栈，只展开第一次
+            if node_group in closure or node_group in on_path:
+                continue
+            on_path.add(node_group)
+            if node_group not in direct_groups:
+                direct_groups[node_group] = get_direct_node_groups(node_group)
+            stack.append((node_group, True))
+            for child in direct_groups[node_group]:
+                if child not in closure and child not in on_path:
+                    stack.append((child, False))
+    return closure
+
+
+# 构建 node group -> 直接或间接使用它的材质列表。
+# 参数: 无。
+def build_node_group_material_map():
+    closure = build_node_group_closure()
+    node_group_materials = {}
+    for material in bpy.data.materials:
+        if not material.use_nodes or material.node_tree is None:
+            continue
+        reachable = set()
+        for node_group in get_direct_node_groups(material.node_tree):
+            reachable.add(node_group)
+            reachable |= closure.get(node_group, frozenset())
+        for node_group in reachable:
+            node_group_materials.setdefault(node_group, []).append(material)
+    return node_group_materials
+
+
+# 查询直接或通过嵌套 node group 间接使用指定 node group 的材质。
+# 参数:
+#     node_group: 要查询的 node group。
+def get_materials_using_node_group(node_group):
+    if _graph_state["node_group_materials"] is None:
+        record_reference_state()
+        _graph_state["node_group_materials"] = build_node_group_material_map()
+    return _graph_state["node_group_materials"].get(node_group, [])
+
+
+@persistent
+def on_depsgraph_update_post(scene, depsgraph):
+    if _graph_state["signatures"] is None:
+        return
+    if depsgraph_changes_references(depsgraph):
+        invalidate_reference_graph()
+
+
+@persistent
+def on_reference_change(*_args):
+    invalidate_reference_graph()
+
+
+REFERENCE_GRAPH_HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update_post),
+    (bpy.app.handlers.load_post, on_reference_change),
+    (bpy.app.handlers.undo_post, on_reference_change),
+    (bpy.app.handlers.redo_post, on_reference_change),
+)
+
+
+def register():
+    for handler_list, handler in REFERENCE_GRAPH_HANDLERS:
+        if handler not in handler_list:
+            handler_list.append(handler)
+    invalidate_reference_graph()
+
+
+def unregister():
+    for handler_list, handler in REFERENCE_GRAPH_HANDLERS:
+        if handler in handler_list:
+            handler_list.remove(handler)
+    invalidate_reference_graph()
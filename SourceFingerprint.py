@@ -0,0 +1,294 @@
+import bpy
+import hashlib
+
+import numpy as np
+from bpy.app.handlers import persistent
+
+from .util import MESH_ATTRIBUTE_FORMATS
+
+# 修改 fingerprint 的计算内容时递增，旧记录会自然失效。
+FINGERPRINT_VERSION = 3
+SOURCE_FINGERPRINT_PROP = "CAT_source_fingerprint"
+# 这些 Modifier 属性只影响界面显示或由 Blender 运行时写入，不参与 fingerprint。
+FINGERPRINT_SKIPPED_MODIFIER_PROPERTIES = {
+    "execution_time",
+    "is_active",
+    "is_override_data",
+    "persistent_uid",
+    "rna_type",
+    "show_expanded",
+}
+# 只递归这些 Modifier 自身拥有的嵌套 struct，其它 pointer 可能指回 node 等外部数据。
+FINGERPRINT_NESTED_STRUCT_TYPES = {"CurveMapping", "CurveProfile"}
+# 嵌套 struct 的最大递归深度。
+MAX_FINGERPRINT_STRUCT_DEPTH = 4
+# 已经作为拓扑单独写入 hash 的 attribute。
+FINGERPRINT_BUILTIN_ATTRIBUTES = {"position", "material_index"}
+
+# Object session_uid -> (名称签名, digest)，只在 depsgraph 报告变化或名称签名改变后重新计算。
+_object_digests = {}
+# Mesh / Material session_uid -> 使用它的 Object session_uid 集合，这些 ID 单独更新时用来定位 Object。
+_mesh_objects = {}
+_material_objects = {}
+# bl_rna identifier -> ((属性名, 类型), ...)，每种 RNA 类型只解析一次。
+_struct_fields_cache = {}
+
+
+# 清空全部 Object digest 缓存。
+# 参数: 无。
+def clear_fingerprint_cache():
+    _object_digests.clear()
+    _mesh_objects.clear()
+    _material_objects.clear()
+
+
+# 使单个 Object 的 digest 失效。
+# 参数:
+#     object_key: Object 的 session_uid。
+def invalidate_object_fingerprint(object_key):
+    _object_digests.pop(object_key, None)
+
+
+# 通过 buffer 协议把 numpy 数组写入 hash，避免大 mesh 再生成一份 bytes 副本。
+# 参数:
+#     hasher: hashlib 对象。
+#     buffer: numpy 数组。
+def update_hash_with_buffer(hasher, buffer):
+    hasher.update(np.int64(buffer.size).tobytes())
+    hasher.update(np.ascontiguousarray(buffer))
+
+
+# 把单个 RNA 或 IDProperty 值转换成稳定的文本，ID 使用 name_full。
+# 参数:
+#     value: 属性值。
+def format_fingerprint_value(value):
+    if isinstance(value, bpy.types.ID):
+        return value.name_full
+    if isinstance(value, set):
+        return repr(sorted(value))
+    if hasattr(value, "to_dict"):
+        return repr(value.to_dict())
+    if hasattr(value, "to_list"):
+        return repr(value.to_list())
+    if hasattr(value, "__len__") and not isinstance(value, str):
+        return repr(tuple(value))
+    return repr(value)
+
+
+# 获取 RNA struct 参与 fingerprint 的属性，按 bl_rna identifier 缓存。
+# 参数:
+#     struct: Modifier，或 Modifier 下的嵌套 struct、collection 元素。
+def get_struct_fingerprint_fields(struct):
+    bl_rna = struct.bl_rna
+    fields = _struct_fields_cache.get(bl_rna.identifier)
+    if fields is not None:
+        return fields
+
+    fields = []
+    for prop in bl_rna.properties:
+        if prop.identifier in FINGERPRINT_SKIPPED_MODIFIER_PROPERTIES:
+            continue
+        if prop.type in {"POINTER", "COLLECTION"}:
+            fields.append((prop.identifier, prop.type))
+        elif not prop.is_readonly:
+            fields.append((prop.identifier, "VALUE"))
+    fields = _struct_fields_cache[bl_rna.identifier] = tuple(fields)
+    return fields
+
+
+# 把 RNA struct 的设置写入 hash。
+# 嵌套 struct 与 collection 只在 FINGERPRINT_NESTED_STRUCT_TYPES 内递归。
+# 参数:
+#     hasher: hashlib 对象。
+#     struct: Modifier，或 Modifier 下的嵌套 struct、collection 元素。
+#     nested: 是否位于 FINGERPRINT_NESTED_STRUCT_TYPES 的 struct 内。
+#     depth: 当前递归深度。
+def update_hash_with_struct(hasher, struct, nested=False, depth=0):
+    for identifier, field_type in get_struct_fingerprint_fields(struct):
+        value = getattr(struct, identifier, None)
+        if field_type == "VALUE" or isinstance(value, bpy.types.ID):
+            hasher.update(f"{identifier}\0{format_fingerprint_value(value)}\0".encode("utf-8"))
+            continue
+        if value is None or depth >= MAX_FINGERPRINT_STRUCT_DEPTH:
+            continue
+        if field_type == "COLLECTION":
+            if not nested:
+                continue
+            hasher.update(f"{identifier}\0{len(value)}\0".encode("utf-8"))
+            for item in value:
+                update_hash_with_struct(hasher, item, nested, depth + 1)
+        elif nested or value.bl_rna.identifier in FINGERPRINT_NESTED_STRUCT_TYPES:
+            hasher.update(f"{identifier}\0".encode("utf-8"))
+            update_hash_with_struct(hasher, value, True, depth + 1)
+
+
+# 把 Modifier stack 的类型、设置与 Geometry Nodes 输入写入 hash。
+# 参数:
+#     hasher: hashlib 对象。
+#     obj: source Collection 中的 Object。
+def update_hash_with_modifiers(hasher, obj):
+    for modifier in obj.modifiers:
+        hasher.update(f"{modifier.type}\0{modifier.name}\0".encode("utf-8"))
+        update_hash_with_struct(hasher, modifier)
+        for key in sorted(modifier.keys()):
+            hasher.update(f"{key}\0{format_fingerprint_value(modifier[key])}\0".encode("utf-8"))
+
+
+# 把 mesh 的 attribute (UV、颜色、sharp 标记等) 与自定义法线写入 hash。
+# 参数:
+#     hasher: hashlib 对象。
+#     mesh: Object 的 Mesh data。
+def update_hash_with_mesh_attributes(hasher, mesh):
+    for attribute in sorted(mesh.attributes, key=lambda item: item.name):
+        if attribute.is_internal or attribute.name in FINGERPRINT_BUILTIN_ATTRIBUTES:
+            continue
+        hasher.update(
+            f"{attribute.name}\0{attribute.domain}\0{attribute.data_type}\0".encode("utf-8")
+        )
+        attribute_format = MESH_ATTRIBUTE_FORMATS.get(attribute.data_type)
+        if attribute_format is None:
+            continue
+        key, width, dtype = attribute_format
+        values = np.empty(len(attribute.data) * width, dtype=dtype)
+        attribute.data.foreach_get(key, values)
+        update_hash_with_buffer(hasher, values)
+    if mesh.has_custom_normals:
+        normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+        mesh.corner_normals.foreach_get("vector", normals)
+        update_hash_with_buffer(hasher, normals)
+
+
+# 计算单个 Object 的 transform、Modifier、mesh 与材质 digest。
+# 参数:
+#     obj: source Collection 中的 Object。
+def compute_object_digest(obj):
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{obj.name_full}\0{obj.type}\0".encode("utf-8"))
+    update_hash_with_buffer(hasher, np.array(obj.matrix_world, dtype=np.float32))
+    for slot in obj.material_slots:
+        material_name = slot.material.name_full if slot.material else ""
+        hasher.update(f"{slot.link}\0{material_name}\0".encode("utf-8"))
+    for vertex_group in obj.vertex_groups:
+        hasher.update(f"{vertex_group.name}\0".encode("utf-8"))
+    update_hash_with_modifiers(hasher, obj)
+    if obj.type != "MESH" or obj.data is None:
+        return hasher.digest()
+
+    mesh = obj.data
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_indices)
+    for buffer in (co, loop_vertices, loop_starts, material_indices):
+        update_hash_with_buffer(hasher, buffer)
+    update_hash_with_mesh_attributes(hasher, mesh)
+    return hasher.digest()
+
+
+# 获取 Object 与其材质的名称签名，改名不一定产生 depsgraph 更新，查询时直接比较。
+# 参数:
+#     obj: source Collection 中的 Object。
+def get_object_name_signature(obj):
+    return obj.name_full, tuple(
+        slot.material.name_full if slot.material else "" for slot in obj.material_slots
+    )
+
+
+# 获取 Object digest，缓存未失效且名称签名一致时直接复用。
+# 参数:
+#     obj: source Collection 中的 Object。
+def get_object_digest(obj):
+    object_key = obj.session_uid
+    signature = get_object_name_signature(obj)
+    cached = _object_digests.get(object_key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    digest = compute_object_digest(obj)
+    _object_digests[object_key] = (signature, digest)
+    if obj.type == "MESH" and obj.data is not None:
+        _mesh_objects.setdefault(obj.data.session_uid, set()).add(object_key)
+    for slot in obj.material_slots:
+        if slot.material is not None:
+            _material_objects.setdefault(slot.material.session_uid, set()).add(object_key)
+    return digest
+
+
+# 计算 source Collection 的 fingerprint，只重新计算被标记为 dirty 的 Object。
+# 参数:
+#     source_collection: Mesh Group instance 引用的 source Collection。
+def compute_source_fingerprint(source_collection):
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"v{FINGERPRINT_VERSION}".encode("ascii"))
+    for obj in sorted(source_collection.all_objects, key=lambda item: item.name_full):
+        hasher.update(get_object_digest(obj))
+    return hasher.hexdigest()
+
+
+# 计算 source Collection 的 fingerprint，并在变化时写入 Collection 自定义属性，随文件保存。
+# 参数:
+#     source_collection: Mesh Group instance 引用的 source Collection。
+def update_source_fingerprint(source_collection):
+    fingerprint = compute_source_fingerprint(source_collection)
+    if source_collection.library is None and (
+        source_collection.get(SOURCE_FINGERPRINT_PROP) != fingerprint
+    ):
+        source_collection[SOURCE_FINGERPRINT_PROP] = fingerprint
+    return fingerprint
+
+
+# 判断 source Collection 自上次记录 fingerprint 后是否有变化。
+# 参数:
+#     source_collection: Mesh Group instance 引用的 source Collection。
+#     fingerprint: 之前记录的 fingerprint，为空时使用 Collection 自定义属性。
+def source_collection_changed(source_collection, fingerprint=None):
+    if fingerprint is None:
+        fingerprint = source_collection.get(SOURCE_FINGERPRINT_PROP)
+    return compute_source_fingerprint(source_collection) != fingerprint
+
+
+@persistent
+def on_depsgraph_update_post(scene, depsgraph):
+    if not _object_digests:
+        return
+    for update in depsgraph.updates:
+        id_data = update.id
+        if isinstance(id_data, bpy.types.Object):
+            invalidate_object_fingerprint(id_data.original.session_uid)
+        elif isinstance(id_data, bpy.types.Mesh):
+            for object_key in _mesh_objects.pop(id_data.original.session_uid, ()):
+                invalidate_object_fingerprint(object_key)
+        elif isinstance(id_data, bpy.types.Material):
+            for object_key in _material_objects.pop(id_data.original.session_uid, ()):
+                invalidate_object_fingerprint(object_key)
+
+
+@persistent
+def on_file_or_undo_change(*_args):
+    clear_fingerprint_cache()
+
+
+FINGERPRINT_HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update_post),
+    (bpy.app.handlers.load_post, on_file_or_undo_change),
+    (bpy.app.handlers.undo_post, on_file_or_undo_change),
+    (bpy.app.handlers.redo_post, on_file_or_undo_change),
+)
+
+
+def register():
+    for handler_list, handler in FINGERPRINT_HANDLERS:
+        if handler not in handler_list:
+            handler_list.append(handler)
+    clear_fingerprint_cache()
+
+
+def unregister():
+    for handler_list, handler in FINGERPRINT_HANDLERS:
+        if handler in handler_list:
+            handler_list.remove(handler)
+    clear_fingerprint_cache()
@@ -1,6 +1,7 @@
 import bpy
 from bpy.props import (
     BoolProperty,
+    CollectionProperty,
     EnumProperty,
     FloatProperty,
     FloatVectorProperty,
@@ -8,6 +9,8 @@ from bpy.props import (
     StringProperty,
 )
 from bpy.types import PropertyGroup
+from .AssetPreviewQueue import PREVIEW_BATCH_SIZE
+from .MissingAssetReport import CAT_PG_missing_asset
 from .util import DEFAULT_IO_TEMP_DIR
 
 def run_set_work_mode_op(self, context):
@@ -47,6 +50,17 @@ class CAT_PG_ui_params(PropertyGroup):
         
 )
 
+    preview_batch_size: IntProperty(
+        name="Previews per Tick",
+        description="Number of asset previews generated per background timer tick",
+        default=PREVIEW_BATCH_SIZE,
+        min=1,
+        max=64,
+    )
+
+    missing_assets: CollectionProperty(type=CAT_PG_missing_asset)
+    missing_assets_index: IntProperty(name="Active Missing Asset", default=0)
+
 class CAT_PT_tool_panel(bpy.types.Panel):
     bl_idname = "CAT_PT_tool_panel"
     bl_label = "ConceptArtTools"
@@ -66,13 +80,24 @@ class CAT_PT_tool_panel(bpy.types.Panel):
 
         box_column.operator("cat.find_source_group", icon="VIEWZOOM")
         box_column.operator("cat.add_selected_instances_to_asset_browser", icon="ASSET_MANAGER")
+        box_column.prop(parameters, "preview_batch_size")
+        box_column.operator("cat.publish_mesh_group_assets", icon="EXPORT")
 
         box_column.operator("cat.reset_pivot", icon="EMPTY_ARROWS")
         box_column.operator("cat.realize_mesh_group", icon="OBJECT_DATA")
+        box_column.operator("cat.unrealize_mesh_group", icon="OUTLINER_OB_GROUP_INSTANCE")
         box_column.operator("cat.add_custom_axis", icon="ADD")
         box_column.operator("cat.apply_mesh_group", icon="MESH_DATA")
+        box_column.operator(
+            "cat.apply_mesh_group", text="Apply All Mesh Groups in Scene", icon="SCENE_DATA"
+        ).scope = "SCENE"
         box_column.operator("cat.isolate_group", icon="VIEWZOOM")
+        box_column.operator(
+            "cat.isolate_group", text="Isolate Group (Frame View)", icon="HIDE_OFF"
+        ).isolate_mode = "VIEW"
         box_column.operator("cat.cleanup_source_groups", icon="TRASH")
+        box_column.operator("cat.report_mesh_group_memory", icon="MEMORY")
+        box_column.operator("cat.export_mesh_group_memory", icon="EXPORT")
 
         # box_column.operator(
         #     "object.refacet_and_wait", icon="ADD")
@@ -0,0 +1,157 @@
+"""Benchmark modifier setting copies used by Apply Mesh Group.
+
+Compares the previous ``dir()`` based copy with the cached RNA schema copy,
+then checks that nested structs (Bevel custom profile, Warp falloff curve)
+were copied with the same number of points as the source.
+
+Run inside Blender, for example:
+
+    blender --background --factory-startup --python scripts/benchmark_copy_modifier_settings.py -- --copies 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+
+ROOT = Path(__file__).resolve().parents[1]
+LEGACY_READONLY_ATTRIBUTES = {
+    "bl_rna",
+    "error_location",
+    "error_rotation",
+    "execution_time",
+    "is_active",
+    "name",
+    "rna_type",
+    "type",
+}
+MODIFIER_TYPES = ("BEVEL", "ARRAY", "SOLIDIFY", "WEIGHTED_NORMAL", "WARP", "NODES")
+# Extra point added to the Bevel custom profile, so the copy has to grow the target collection.
+EXTRA_PROFILE_POINT = (0.5, 0.25)
+
+
+def import_addon():
+    sys.path.insert(0, str(ROOT.parent))
+    return importlib.import_module(ROOT.name)
+
+
+def parse_args() -> argparse.Namespace:
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args(argv)
+
+
+def legacy_copy_modifier_settings(source_modifier, target_modifier) -> None:
+    for attribute_name in dir(source_modifier):
+        if attribute_name.startswith("_") or attribute_name in LEGACY_READONLY_ATTRIBUTES:
+            continue
+        try:
+            setattr(target_modifier, attribute_name, getattr(source_modifier, attribute_name))
+        except (AttributeError, TypeError):
+            continue
+
+
+def build_source_object():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    mesh = bpy.data.meshes.new("bench_mesh")
+    node_group = bpy.data.node_groups.new("BenchNodes", "GeometryNodeTree")
+    source_object = bpy.data.objects.new("bench_source", mesh)
+    for modifier_type in MODIFIER_TYPES:
+        modifier = source_object.modifiers.new(modifier_type.title(), modifier_type)
+        if modifier_type == "NODES":
+            modifier.node_group = node_group
+        elif modifier_type == "BEVEL":
+            modifier.width = 0.05
+            modifier.segments = 3
+            modifier.profile_type = "CUSTOM"
+            modifier.custom_profile.points.add(*EXTRA_PROFILE_POINT)
+            modifier.custom_profile.update()
+        elif modifier_type == "WARP":
+            modifier.falloff_type = "CURVE"
+            modifier.falloff_curve.curves[0].points.new(0.5, 0.75)
+            modifier.falloff_curve.update()
+        elif modifier_type == "ARRAY":
+            modifier.count = 4
+    return source_object
+
+
+def build_targets(source_object, copies: int) -> list:
+    targets = []
+    for index in range(copies):
+        target = bpy.data.objects.new(f"bench_target_{index:06d}", source_object.data)
+        for source_modifier in source_object.modifiers:
+            target.modifiers.new(source_modifier.name, source_modifier.type)
+        targets.append(target)
+    return targets
+
+
+def time_pass(label: str, source_object, targets: list, copy, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for target in targets:
+            for source_modifier, target_modifier in zip(source_object.modifiers, target.modifiers):
+                copy(source_modifier, target_modifier)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<24} {best * 1000:9.2f} ms  ({len(targets)} objects)")
+    return best
+
+
+def main() -> int:
+    args = parse_args()
+    addon = import_addon()
+    mesh_group_apply = importlib.import_module(f"{addon.__name__}.MeshGroupApply")
+
+    source_object = build_source_object()
+    targets = build_targets(source_object, args.copies)
+
+    legacy = time_pass(
+        "dir() copy",
+        source_object,
+        targets,
+        legacy_copy_modifier_settings,
+        args.repeat,
+    )
+    cached = time_pass(
+        "cached RNA schema copy",
+        source_object,
+        targets,
+        mesh_group_apply.copy_modifier_settings,
+        args.repeat,
+    )
+    print(f"speedup {legacy / cached:.1f}x")
+
+    source_bevel = source_object.modifiers[MODIFIER_TYPES.index("BEVEL")]
+    source_warp = source_object.modifiers[MODIFIER_TYPES.index("WARP")]
+    bevel = targets[-1].modifiers[MODIFIER_TYPES.index("BEVEL")]
+    warp = targets[-1].modifiers[MODIFIER_TYPES.index("WARP")]
+    mismatches = []
+    if bevel.segments != 3 or bevel.profile_type != "CUSTOM":
+        mismatches.append("bevel settings")
+    if [tuple(point.location) for point in bevel.custom_profile.points] != [
+        tuple(point.location) for point in source_bevel.custom_profile.points
+    ]:
+        mismatches.append("bevel custom_profile points")
+    if [tuple(point.location) for point in warp.falloff_curve.curves[0].points] != [
+        tuple(point.location) for point in source_warp.falloff_curve.curves[0].points
+    ]:
+        mismatches.append("warp falloff_curve points")
+    if targets[-1].modifiers["Nodes"].node_group is None:
+        mismatches.append("nodes node_group")
+    if mismatches:
+        print(f"Copied settings mismatch: {', '.join(mismatches)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
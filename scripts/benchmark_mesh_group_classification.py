@@ -0,0 +1,127 @@
+"""Benchmark Mesh Group instance classification on a synthetic file.
+
+Run inside Blender, for example:
+
+    blender --background --factory-startup --python scripts/benchmark_mesh_group_classification.py -- --objects 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def import_addon():
+    sys.path.insert(0, str(ROOT.parent))
+    return importlib.import_module(ROOT.name)
+
+
+def parse_args() -> argparse.Namespace:
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=50000)
+    parser.add_argument("--instance-every", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args(argv)
+
+
+def legacy_check_is_mesh_group_instance(obj, util) -> bool:
+    if obj.type != "MESH" or obj.get(util.CUSTOM_NAME) != util.INSTANCE_NAME:
+        return False
+
+    for modifier in obj.modifiers:
+        if modifier.type == "NODES" and modifier.node_group:
+            if modifier.node_group.name == util.GROUP_NODE:
+                return True
+    return False
+
+
+def build_synthetic_file(util, object_count: int, instance_every: int) -> list:
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    mesh = bpy.data.meshes.new("bench_mesh")
+    group_node = bpy.data.node_groups.new(util.GROUP_NODE, "GeometryNodeTree")
+    other_node = bpy.data.node_groups.new("BenchOther", "GeometryNodeTree")
+
+    objects = []
+    for index in range(object_count):
+        obj = bpy.data.objects.new(f"bench_{index:06d}", mesh)
+        if index % instance_every == 0:
+            obj[util.CUSTOM_NAME] = util.INSTANCE_NAME
+            modifier = obj.modifiers.new(util.GROUP_MOD, "NODES")
+            modifier.node_group = group_node
+        elif index % 7 == 0:
+            obj.modifiers.new("Bevel", "BEVEL")
+            modifier = obj.modifiers.new("Other", "NODES")
+            modifier.node_group = other_node
+        objects.append(obj)
+    return objects
+
+
+def time_pass(label: str, objects: list, check, repeat: int) -> int:
+    best = None
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for obj in objects if check(obj))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<32} {best * 1000:9.2f} ms  ({count} instances)")
+    return count
+
+
+def main() -> int:
+    args = parse_args()
+    addon = import_addon()
+    util = importlib.import_module(f"{addon.__name__}.util")
+    mesh_group_index = importlib.import_module(f"{addon.__name__}.MeshGroupIndex")
+
+    start = time.perf_counter()
+    objects = build_synthetic_file(util, args.objects, args.instance_every)
+    print(f"Built {len(objects)} objects in {time.perf_counter() - start:.2f} s")
+
+    group_node = bpy.data.node_groups[util.GROUP_NODE]
+    expected = time_pass(
+        "legacy modifier scan",
+        objects,
+        lambda obj: legacy_check_is_mesh_group_instance(obj, util),
+        args.repeat,
+    )
+    results = [
+        time_pass("GROUP_MOD lookup (name)", objects, util.check_is_mesh_group_instance, args.repeat),
+        time_pass(
+            "GROUP_MOD lookup (identity)",
+            objects,
+            lambda obj: util.check_is_mesh_group_instance(obj, group_node),
+            args.repeat,
+        ),
+    ]
+
+    mesh_group_index.bump_classification_generation()
+    results.append(
+        time_pass("memo, cold generation", objects, mesh_group_index.is_mesh_group_instance, 1)
+    )
+    results.append(
+        time_pass(
+            "memo, same generation",
+            objects,
+            mesh_group_index.is_mesh_group_instance,
+            args.repeat,
+        )
+    )
+
+    if any(result != expected for result in results):
+        print("Classification mismatch")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
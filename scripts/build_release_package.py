@@ -15,15 +15,25 @@ ROOT_FILES = (
     "auto_load.py",
     "blender_manifest.toml",
     "AssetBrowserTools.py",
+    "AssetCatalog.py",
+    "AssetPreviewQueue.py",
+    "AssetPublish.py",
     "AssetCreation.py",
     "ConceptTools.py",
     "FindUsers.py",
     "IsolateMeshGroup.py",
     "LibraryTools.py",
     "MeshGroupApply.py",
+    "MeshGroupIndex.py",
+    "MeshGroupPivotCache.py",
+    "MeshGroupReport.py",
     "MeshGroupTools.py",
+    "MissingAssetReport.py",
     "OrganizeAssets.py",
+    "PathCheck.py",
     "README.md",
+    "ReferenceGraph.py",
+    "SourceFingerprint.py",
     "UI.py",
     "util.py",
 )
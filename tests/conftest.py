@@ -0,0 +1,20 @@
+# 仓库根目录本身是 Blender add-on 包，pytest 默认会把它当作 Package 并导入根目录的 __init__.py，
+# 而 __init__.py 需要真正的 bpy。这里把根目录改为按普通目录收集。
+
+from pathlib import Path
+
+import pytest
+
+ADDON_ROOT = Path(__file__).resolve().parents[1]
+
+
+class AddonRootCollector:
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collect_directory(self, path, parent):
+        if path == ADDON_ROOT:
+            return pytest.Dir.from_parent(parent, path=path)
+        return None
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(AddonRootCollector(), "cat-addon-root")
@@ -0,0 +1,202 @@
+# 不依赖 Blender 运行: python -m pytest 或 python -m unittest discover -s tests
+
+import importlib.util
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_asset_catalog():
+    """AssetCatalog 不依赖 bpy，直接按文件路径载入，不经过 add-on 包的 __init__.py"""
+    spec = importlib.util.spec_from_file_location("AssetCatalog", ROOT / "AssetCatalog.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+asset_catalog = load_asset_catalog()
+
+
+class CatalogTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.temp_dir.name)
+        self.catalog_file = self.directory / asset_catalog.CATALOG_FILE_NAME
+        asset_catalog.clear_catalog_cache()
+
+    def tearDown(self):
+        asset_catalog.clear_catalog_cache()
+        self.temp_dir.cleanup()
+
+    def read_catalog_lines(self):
+        lines = self.catalog_file.read_text(encoding="utf-8").splitlines()
+        return [line for line in lines if asset_catalog.parse_catalog_line(line)]
+
+
+class CatalogIdTest(CatalogTestCase):
+    def test_uuid_is_stable_per_path(self):
+        first_id = asset_catalog.catalog_path_to_uuid("Mesh Groups/Chair")
+        self.assertEqual(first_id, asset_catalog.catalog_path_to_uuid("Mesh Groups/Chair"))
+        self.assertNotEqual(first_id, asset_catalog.catalog_path_to_uuid("Mesh Groups/Table"))
+
+    def test_separate_files_get_the_same_id(self):
+        other_file = self.directory / "other" / asset_catalog.CATALOG_FILE_NAME
+        other_file.parent.mkdir()
+        self.assertEqual(
+            asset_catalog.ensure_catalog_path(self.catalog_file, "Mesh Groups/Chair"),
+            asset_catalog.ensure_catalog_path(other_file, "Mesh Groups/Chair"),
+        )
+
+    def test_sanitize_catalog_component(self):
+        self.assertEqual(asset_catalog.sanitize_catalog_component("A:B/C\\D"), "A-B-C-D")
+        self.assertEqual(asset_catalog.sanitize_catalog_component("  "), "Unnamed")
+
+    def test_path_with_colon_is_rejected(self):
+        with self.assertRaises(ValueError):
+            asset_catalog.ensure_catalog_path(self.catalog_file, "Bad:Path")
+
+
+class EnsureCatalogPathsTest(CatalogTestCase):
+    def test_new_file_gets_header_and_nested_parents(self):
+        catalog_ids = asset_catalog.ensure_catalog_paths(
+            self.catalog_file,
+            ["Mesh Groups/Chair", "Mesh Groups/Table"],
+        )
+
+        self.assertTrue(
+            self.catalog_file.read_text(encoding="utf-8").startswith(asset_catalog.CATALOG_HEADER)
+        )
+        paths = [line.split(":")[1] for line in self.read_catalog_lines()]
+        self.assertEqual(paths, ["Mesh Groups", "Mesh Groups/Chair", "Mesh Groups/Table"])
+        self.assertEqual(
+            catalog_ids["Mesh Groups/Chair"],
+            asset_catalog.catalog_path_to_uuid("Mesh Groups/Chair"),
+        )
+
+    def test_existing_paths_do_not_rewrite_the_file(self):
+        asset_catalog.ensure_catalog_paths(self.catalog_file, ["Mesh Groups/Chair"])
+        stat_before = os.stat(self.catalog_file)
+
+        asset_catalog.ensure_catalog_paths(self.catalog_file, ["Mesh Groups", "Mesh Groups/Chair"])
+
+        stat_after = os.stat(self.catalog_file)
+        self.assertEqual(
+            (stat_before.st_ino, stat_before.st_mtime_ns),
+            (stat_after.st_ino, stat_after.st_mtime_ns),
+        )
+        self.assertFalse(Path(str(self.catalog_file) + asset_catalog.CATALOG_LOCK_SUFFIX).exists())
+
+    def test_preferred_id_follows_a_renamed_catalog(self):
+        base_id = asset_catalog.ensure_catalog_path(self.catalog_file, "Mesh Groups", "base-id")
+        self.assertEqual(base_id, "base-id")
+        text = self.catalog_file.read_text(encoding="utf-8")
+        self.catalog_file.write_text(
+            text.replace("base-id:Mesh Groups:", "base-id:Renamed:"),
+            encoding="utf-8",
+        )
+
+        self.assertEqual(
+            asset_catalog.ensure_catalog_path(self.catalog_file, "Mesh Groups", "base-id"),
+            "base-id",
+        )
+        child_id = asset_catalog.ensure_catalog_path(self.catalog_file, "Renamed/Chair")
+        paths = [line.split(":")[1] for line in self.read_catalog_lines()]
+        self.assertEqual(paths, ["Renamed", "Renamed/Chair"])
+        self.assertEqual(child_id, asset_catalog.catalog_path_to_uuid("Renamed/Chair"))
+
+
+class ReadCatalogsCacheTest(CatalogTestCase):
+    def write_catalog(self, catalog_path):
+        catalog_id = asset_catalog.catalog_path_to_uuid(catalog_path)
+        self.catalog_file.write_text(
+            asset_catalog.CATALOG_HEADER + f"{catalog_id}:{catalog_path}:{catalog_path}\n",
+            encoding="utf-8",
+        )
+
+    def test_unchanged_file_is_parsed_once(self):
+        self.write_catalog("Alpha")
+        first = asset_catalog.read_catalogs(self.catalog_file)
+        with mock.patch.object(asset_catalog, "parse_catalog_text") as parse:
+            self.assertIs(asset_catalog.read_catalogs(self.catalog_file), first)
+        parse.assert_not_called()
+
+    def test_size_change_invalidates_cache(self):
+        self.write_catalog("Alpha")
+        asset_catalog.read_catalogs(self.catalog_file)
+        self.write_catalog("Alpha/Longer")
+        self.assertIn("Alpha/Longer", asset_catalog.read_catalogs(self.catalog_file)["ids_by_path"])
+
+    def test_replaced_file_with_same_size_and_mtime_invalidates_cache(self):
+        self.write_catalog("Alpha")
+        asset_catalog.read_catalogs(self.catalog_file)
+        stat_before = os.stat(self.catalog_file)
+
+        replacement = self.directory / "replacement.txt"
+        catalog_id = asset_catalog.catalog_path_to_uuid("Alpha")
+        replacement.write_text(
+            asset_catalog.CATALOG_HEADER + f"{catalog_id}:Gamma:Gamma\n",
+            encoding="utf-8",
+        )
+        os.utime(replacement, ns=(stat_before.st_atime_ns, stat_before.st_mtime_ns))
+        os.replace(replacement, self.catalog_file)
+
+        stat_after = os.stat(self.catalog_file)
+        self.assertEqual(stat_before.st_size, stat_after.st_size)
+        self.assertEqual(stat_before.st_mtime_ns, stat_after.st_mtime_ns)
+        self.assertIn("Gamma", asset_catalog.read_catalogs(self.catalog_file)["ids_by_path"])
+
+    def test_missing_file_returns_empty_catalogs(self):
+        self.write_catalog("Alpha")
+        asset_catalog.read_catalogs(self.catalog_file)
+        self.catalog_file.unlink()
+        self.assertEqual(asset_catalog.read_catalogs(self.catalog_file)["ids_by_path"], {})
+
+
+class AtomicWriteTest(CatalogTestCase):
+    def list_temp_files(self):
+        return [path.name for path in self.directory.iterdir() if path.suffix == ".tmp"]
+
+    def test_write_replaces_file_without_leftovers(self):
+        self.catalog_file.write_text("old\n", encoding="utf-8")
+        asset_catalog.write_text_atomic(self.catalog_file, "new\n")
+        self.assertEqual(self.catalog_file.read_text(encoding="utf-8"), "new\n")
+        self.assertEqual(self.list_temp_files(), [])
+
+    def test_failed_replace_keeps_old_file_and_removes_temp(self):
+        self.catalog_file.write_text("old\n", encoding="utf-8")
+        with mock.patch.object(asset_catalog.os, "replace", side_effect=OSError("denied")):
+            with self.assertRaises(OSError):
+                asset_catalog.write_text_atomic(self.catalog_file, "new\n")
+        self.assertEqual(self.catalog_file.read_text(encoding="utf-8"), "old\n")
+        self.assertEqual(self.list_temp_files(), [])
+
+
+class CatalogLockTest(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.lock_path = Path(str(self.catalog_file) + asset_catalog.CATALOG_LOCK_SUFFIX)
+
+    def test_lock_is_exclusive_and_removed_on_exit(self):
+        with asset_catalog.catalog_file_lock(self.catalog_file):
+            self.assertTrue(self.lock_path.exists())
+            with self.assertRaises(asset_catalog.CatalogLockError):
+                with asset_catalog.catalog_file_lock(self.catalog_file, timeout=0.1):
+                    pass
+        self.assertFalse(self.lock_path.exists())
+
+    def test_stale_lock_is_taken_over(self):
+        self.lock_path.write_text("12345", encoding="ascii")
+        stale_time = os.path.getmtime(self.lock_path) - asset_catalog.CATALOG_LOCK_STALE_SECONDS - 1
+        os.utime(self.lock_path, (stale_time, stale_time))
+
+        with asset_catalog.catalog_file_lock(self.catalog_file, timeout=0.1):
+            self.assertEqual(self.lock_path.read_text(encoding="ascii"), str(os.getpid()))
+        self.assertFalse(self.lock_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+# 不依赖 Blender 运行: python -m pytest 或 python -m unittest discover -s tests
+
+import importlib.util
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_path_check():
+    """PathCheck 不依赖 bpy，直接按文件路径载入，不经过 add-on 包的 __init__.py"""
+    spec = importlib.util.spec_from_file_location("PathCheck", ROOT / "PathCheck.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+path_check = load_path_check()
+
+
+class PathCheckTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_files(self, *names):
+        for name in names:
+            (self.directory / name).write_bytes(b"")
+        return [str(self.directory / name) for name in names]
+
+    def normalized(self, name, directory=None):
+        return path_check.normalize_check_path(str((directory or self.directory) / name))
+
+
+class CheckPathsTest(PathCheckTestCase):
+    def test_existing_and_missing_paths(self):
+        existing = self.make_files("a.png")[0]
+        missing = str(self.directory / "missing.png")
+
+        results = path_check.check_paths([existing, missing])
+
+        self.assertEqual(
+            results,
+            {self.normalized("a.png"): True, self.normalized("missing.png"): False},
+        )
+
+    def test_paths_are_deduplicated_and_grouped_by_directory(self):
+        other_directory = self.directory / "other"
+        other_directory.mkdir()
+        first = self.make_files("a.png")[0]
+        paths = [
+            first,
+            first,
+            os.path.join(str(self.directory), ".", "a.png"),
+            str(other_directory / "b.png"),
+            "",
+        ]
+
+        calls = []
+        original = path_check.check_directory_paths
+
+        def record(directory, directory_paths):
+            calls.append((directory, sorted(directory_paths)))
+            return original(directory, directory_paths)
+
+        with mock.patch.object(path_check, "check_directory_paths", side_effect=record):
+            results = path_check.check_paths(paths)
+
+        self.assertEqual(
+            sorted(calls),
+            sorted(
+                [
+                    (path_check.normalize_check_path(str(self.directory)), [self.normalized("a.png")]),
+                    (
+                        path_check.normalize_check_path(str(other_directory)),
+                        [self.normalized("b.png", other_directory)],
+                    ),
+                ]
+            ),
+        )
+        self.assertEqual(len(results), 2)
+
+    def test_empty_input(self):
+        self.assertEqual(path_check.check_paths(["", None]), {})
+
+
+class CheckDirectoryPathsTest(PathCheckTestCase):
+    def test_few_paths_use_stat(self):
+        paths = [self.normalized(name) for name in self.make_files("a.png")]
+        with mock.patch.object(path_check, "list_directory_names") as list_names:
+            results = path_check.check_directory_paths(str(self.directory), paths)
+        list_names.assert_not_called()
+        self.assertEqual(results, {paths[0]: True})
+
+    def test_many_paths_use_one_directory_listing(self):
+        names = [f"{index}.png" for index in range(path_check.SCANDIR_MIN_PATHS)]
+        paths = [path_check.normalize_check_path(path) for path in self.make_files(*names)]
+        with mock.patch.object(path_check.os.path, "exists") as exists:
+            results = path_check.check_directory_paths(
+                path_check.normalize_check_path(str(self.directory)), paths
+            )
+        exists.assert_not_called()
+        self.assertEqual(results, dict.fromkeys(paths, True))
+
+    def test_names_missing_from_listing_fall_back_to_stat(self):
+        # 模拟大小写不敏感的文件系统：列表中的名称大小写与请求不同，但 stat 能找到
+        paths = [
+            path_check.normalize_check_path(str(self.directory / f"Texture{index}.PNG"))
+            for index in range(path_check.SCANDIR_MIN_PATHS)
+        ]
+        listed_names = {f"texture{index}.png" for index in range(path_check.SCANDIR_MIN_PATHS)}
+        with mock.patch.object(path_check, "list_directory_names", return_value=listed_names):
+            with mock.patch.object(path_check.os.path, "exists", return_value=True) as exists:
+                results = path_check.check_directory_paths(str(self.directory), paths)
+        self.assertEqual(results, dict.fromkeys(paths, True))
+        self.assertEqual(exists.call_count, len(paths))
+
+    def test_missing_directory_reports_all_missing(self):
+        missing_directory = self.directory / "missing"
+        paths = [
+            path_check.normalize_check_path(str(missing_directory / f"{index}.png"))
+            for index in range(path_check.SCANDIR_MIN_PATHS)
+        ]
+        results = path_check.check_directory_paths(str(missing_directory), paths)
+        self.assertEqual(results, dict.fromkeys(paths, False))
+
+
+class TimeoutTest(PathCheckTestCase):
+    def setUp(self):
+        super().setUp()
+        self.release = threading.Event()
+        self.stuck_directories = set()
+        self.original = path_check.check_directory_paths
+
+    def tearDown(self):
+        # 放开卡住的 worker，daemon 线程随后自行退出
+        self.release.set()
+        super().tearDown()
+
+    def make_stuck_path(self, directory_name):
+        stuck_directory = self.directory / directory_name
+        self.stuck_directories.add(path_check.normalize_check_path(str(stuck_directory)))
+        return str(stuck_directory / "a.png")
+
+    def check_with_stuck_directories(self, directory, directory_paths):
+        if directory in self.stuck_directories:
+            self.release.wait()
+        return self.original(directory, directory_paths)
+
+    def run_check_paths(self, paths, workers):
+        with mock.patch.object(
+            path_check, "check_directory_paths", side_effect=self.check_with_stuck_directories
+        ):
+            start = time.monotonic()
+            results = path_check.check_paths(paths, workers=workers, timeout=0.2)
+        self.assertLess(time.monotonic() - start, 2.0)
+        return results
+
+    def test_stuck_directory_is_reported_unknown(self):
+        stuck_path = self.make_stuck_path("stuck")
+        existing = self.make_files("b.png")[0]
+
+        results = self.run_check_paths([stuck_path, existing], workers=2)
+
+        self.assertIsNone(results[path_check.normalize_check_path(stuck_path)])
+        self.assertTrue(results[self.normalized("b.png")])
+
+    def test_all_workers_stuck_abandons_queued_directories(self):
+        # 只有一个 worker：先开始的目录超时后，另一个目录还没开始也记为 None
+        paths = [self.make_stuck_path("first"), self.make_stuck_path("second")]
+
+        results = self.run_check_paths(paths, workers=1)
+
+        self.assertEqual(results, dict.fromkeys(map(path_check.normalize_check_path, paths)))
+
+
+if __name__ == "__main__":
+    unittest.main()
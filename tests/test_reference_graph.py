@@ -0,0 +1,190 @@
+# 不依赖 Blender 运行: python -m pytest 或 python -m unittest discover -s tests
+
+import importlib.util
+import itertools
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_reference_graph():
+    """在没有 Blender 的环境中用最小的 bpy 替身载入 ReferenceGraph，替身只在载入期间放入 sys.modules"""
+    handlers = types.SimpleNamespace(
+        persistent=lambda function: function,
+        depsgraph_update_post=[],
+        load_post=[],
+        undo_post=[],
+        redo_post=[],
+    )
+    bpy = types.ModuleType("bpy")
+    bpy.app = types.SimpleNamespace(handlers=handlers)
+    bpy.data = types.SimpleNamespace(node_groups=[], materials=[])
+    bpy.types = types.SimpleNamespace(ID=type("ID", (), {}))
+    app_module = types.ModuleType("bpy.app")
+    app_module.handlers = handlers
+    fake_modules = {"bpy": bpy, "bpy.app": app_module, "bpy.app.handlers": handlers}
+
+    with mock.patch.dict(sys.modules, fake_modules):
+        spec = importlib.util.spec_from_file_location("ReferenceGraph", ROOT / "ReferenceGraph.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    for name in module.REFERENCE_ID_COLLECTIONS:
+        if not hasattr(bpy.data, name):
+            setattr(bpy.data, name, [])
+    return module
+
+
+class FakeNode:
+    def __init__(self, node_tree):
+        self.type = "GROUP"
+        self.node_tree = node_tree
+
+
+class FakeNodeTree:
+    def __init__(self, name):
+        self.name = name
+        self.nodes = []
+        self.children = []
+
+    def link(self, *children):
+        self.children.extend(children)
+        self.nodes.extend(FakeNode(child) for child in children)
+
+    def __repr__(self):
+        return self.name
+
+
+class FakeMaterial:
+    def __init__(self, name, node_tree):
+        self.name = name
+        self.use_nodes = True
+        self.node_tree = node_tree
+
+
+class FakeObject:
+    id_type = "OBJECT"
+
+    def __init__(self, session_uid):
+        self.session_uid = session_uid
+        self.data = None
+        self.parent = None
+        self.instance_collection = None
+        self.material_slots = []
+        self.modifiers = []
+        self.constraints = []
+
+    @property
+    def original(self):
+        return self
+
+
+class FakeID:
+    def __init__(self, id_type, session_uid):
+        self.id_type = id_type
+        self.session_uid = session_uid
+
+    @property
+    def original(self):
+        return self
+
+
+def make_depsgraph(*ids):
+    return types.SimpleNamespace(updates=[types.SimpleNamespace(id=id_data) for id_data in ids])
+
+
+class NodeGroupClosureTest(unittest.TestCase):
+    def setUp(self):
+        # 每个测试载入一份独立的模块，测试中替换的函数与缓存不会互相影响
+        self.reference_graph = load_reference_graph()
+
+    def build_closures_for_every_order(self, node_groups):
+        """按所有 node group 顺序与子节点顺序计算 closure，结果必须一致"""
+        closures = []
+        for child_order in (list, lambda children: list(reversed(children))):
+            self.reference_graph.get_direct_node_groups = lambda tree, order=child_order: order(tree.children)
+            for ordered_groups in itertools.permutations(node_groups):
+                closures.append(self.reference_graph.build_node_group_closure(ordered_groups))
+        return closures
+
+    def test_diamond(self):
+        group_a, group_b, group_c, group_d = (FakeNodeTree(name) for name in "ABCD")
+        group_a.link(group_b, group_c)
+        group_c.link(group_b)
+        group_b.link(group_d)
+
+        for closure in self.build_closures_for_every_order([group_a, group_b, group_c, group_d]):
+            self.assertEqual(closure[group_a], {group_b, group_c, group_d})
+            self.assertEqual(closure[group_b], {group_d})
+            self.assertEqual(closure[group_c], {group_b, group_d})
+            self.assertEqual(closure[group_d], set())
+
+    def test_shared_child(self):
+        group_a, group_b, shared, leaf = (FakeNodeTree(name) for name in ("A", "B", "Shared", "Leaf"))
+        group_a.link(shared)
+        group_b.link(shared)
+        shared.link(leaf)
+
+        for closure in self.build_closures_for_every_order([group_a, group_b, shared, leaf]):
+            self.assertEqual(closure[group_a], {shared, leaf})
+            self.assertEqual(closure[group_b], {shared, leaf})
+            self.assertEqual(closure[shared], {leaf})
+
+    def test_cycle_terminates(self):
+        group_a, group_b = FakeNodeTree("A"), FakeNodeTree("B")
+        group_a.link(group_b)
+        group_b.link(group_a)
+
+        for closure in self.build_closures_for_every_order([group_a, group_b]):
+            self.assertIn(group_b, closure[group_a])
+            self.assertIn(group_a, closure[group_b])
+
+    def test_materials_reach_nested_groups(self):
+        group_a, group_b, group_c, group_d = (FakeNodeTree(name) for name in "ABCD")
+        group_a.link(group_b, group_c)
+        group_c.link(group_b)
+        group_b.link(group_d)
+        material_tree = FakeNodeTree("MaterialTree")
+        material_tree.link(group_c)
+        material = FakeMaterial("Material", material_tree)
+
+        self.reference_graph.get_direct_node_groups = lambda tree: tree.children
+        self.reference_graph.bpy.data.node_groups = [group_a, group_b, group_c, group_d]
+        self.reference_graph.bpy.data.materials = [material]
+        self.assertEqual(self.reference_graph.get_materials_using_node_group(group_d), [material])
+        self.assertEqual(self.reference_graph.get_materials_using_node_group(group_a), [])
+
+
+class DepsgraphFilterTest(unittest.TestCase):
+    def setUp(self):
+        self.reference_graph = load_reference_graph()
+        self.child, self.parent = FakeObject(1), FakeObject(2)
+        self.reference_graph.bpy.data.objects = [self.child, self.parent]
+        self.reference_graph.record_reference_state()
+
+    def test_transform_update_keeps_cache(self):
+        self.assertFalse(self.reference_graph.depsgraph_changes_references(make_depsgraph(self.child)))
+
+    def test_parent_change_invalidates(self):
+        self.child.parent = self.parent
+        self.assertTrue(self.reference_graph.depsgraph_changes_references(make_depsgraph(self.child)))
+
+    def test_reference_id_type_invalidates(self):
+        material = FakeID("MATERIAL", 3)
+        self.assertTrue(self.reference_graph.depsgraph_changes_references(make_depsgraph(material)))
+
+    def test_added_id_invalidates(self):
+        self.reference_graph.bpy.data.objects.append(FakeObject(4))
+        self.assertTrue(self.reference_graph.depsgraph_changes_references(make_depsgraph()))
+
+    def test_handler_ignores_empty_cache(self):
+        self.reference_graph.invalidate_reference_graph()
+        self.reference_graph.on_depsgraph_update_post(None, make_depsgraph(FakeID("MATERIAL", 3)))
+        self.assertIsNone(self.reference_graph._graph_state["signatures"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,6 @@
 import bpy
+import time
+import numpy as np
 from mathutils import Vector
 from pathlib import Path
 
@@ -25,43 +27,103 @@ MG_SOCKET_OFFSET = "Socket_7"
 DECAL_OFFSET = 0.008
 DEFAULT_IO_TEMP_DIR="C:\\Temp\\UBIO\\"
 GROUP_ROOT_COLL="_CAT_SourceGroups"
+GEOMETRY_OBJECT_TYPES = {"MESH", "CURVE", "SURFACE", "META", "FONT"}
+# 可以用 foreach_get/foreach_set 读写的 mesh attribute: data_type -> (属性名, 分量数, numpy 类型)
+MESH_ATTRIBUTE_FORMATS = {
+    "FLOAT": ("value", 1, np.float32),
+    "INT": ("value", 1, np.int32),
+    "INT8": ("value", 1, np.int32),
+    "BOOLEAN": ("value", 1, bool),
+    "FLOAT2": ("vector", 2, np.float32),
+    "FLOAT_VECTOR": ("vector", 3, np.float32),
+    "FLOAT_COLOR": ("color", 4, np.float32),
+    "BYTE_COLOR": ("color", 4, np.float32),
+}
+BOUNDS_MODE_ITEMS = [
+    ("CORNERS", "Corner Mean", "Use the mean of all bounding box corners (legacy)", 1),
+    ("AABB", "World Bounds", "Use the center of the world space bounding box extents", 2),
+]
 
 # functions
-def import_node_group(file_path, node_name) -> bpy.types.NodeGroup:
-    """从文件载入NodeGroup"""
-
-    INNER_PATH = "/NodeTree"
-    FULL_PATH = str(file_path) + INNER_PATH
-    node_exist = False
-    for node in bpy.data.node_groups:
-        if node_name not in node.name:
-            node_exist = False
-        else:
-            node_exist = True
-            node_import = node
-            break
+def get_id_key(id_data):
+    """获取可跨 undo 保存的 ID 查找键 (name, library filepath)"""
+    if id_data.library:
+        return id_data.name, id_data.library.filepath
+    return id_data.name, None
+
+
+def resolve_id_key(id_collection, id_key):
+    """通过 get_id_key 生成的键取回 ID，找不到时返回 None"""
+    try:
+        return id_collection.get(id_key)
+    except (KeyError, TypeError, ReferenceError):
+        return None
 
-    if node_exist is False:  # 如果没有导入，导入
-        bpy.ops.wm.append(
-            filepath=str(file_path),
-            directory=FULL_PATH,
-            filename=node_name,
-        )
 
-    for node in bpy.data.node_groups:
-        if node.name == node_name:
-            node_import = node
-            break
+def import_node_group(file_path, node_name, appended_ids=None) -> bpy.types.NodeGroup:
+    """从文件载入NodeGroup, appended_ids 用于记录本次新 append 进来的 datablock"""
+
+    node_import = bpy.data.node_groups.get(node_name)
+    if node_import is None:
+        for node in bpy.data.node_groups:
+            if node_name in node.name:
+                node_import = node
+                break
+
+    if node_import is None:  # 如果没有导入，导入
+        with bpy.data.libraries.load(str(file_path), link=False) as (data_from, data_to):
+            data_to.node_groups = [name for name in data_from.node_groups if name == node_name]
+        node_import = bpy.data.node_groups.get(node_name)
+        if appended_ids is not None:
+            appended_ids.extend(node for node in data_to.node_groups if node is not None)
 
     return node_import
 
 
-def add_mesh_group_modifier(mesh, target_group=None, offset=Vector((0, 0, 0))):
+def remove_orphaned_datablocks(datablocks) -> int:
+    """只删除传入列表中已经没有 user 的 datablock, 代替全局 orphans_purge"""
+    orphaned = []
+    for datablock in datablocks:
+        try:
+            if datablock.users == 0:
+                orphaned.append(datablock)
+        except ReferenceError:
+            continue
+    if orphaned:
+        bpy.data.batch_remove(orphaned)
+    return len(orphaned)
+
+
+class StageTimer:
+    """记录 Operator 各阶段耗时, 用于 report 输出"""
+
+    def __init__(self):
+        self.stages = []
+        self._start = time.perf_counter()
+        self._last = self._start
+
+    def mark(self, stage_name):
+        now = time.perf_counter()
+        self.stages.append((stage_name, now - self._last))
+        self._last = now
+
+    @property
+    def total(self):
+        return self._last - self._start
+
+    def format(self):
+        stages = ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in self.stages)
+        return f"{self.total * 1000:.1f}ms ({stages})"
+
+
+def add_mesh_group_modifier(mesh, target_group=None, offset=Vector((0, 0, 0)), node_group=None):
     """添加Geometry Nodes Mesh Group Modifier"""
 
     check_modifier = False
     offset = Vector(offset)
     offset = WORLD_ORIGIN - offset
+    if node_group is None:
+        node_group = bpy.data.node_groups[GROUP_NODE]
 
     for modifier in mesh.modifiers:
         if modifier.name == GROUP_MOD:
@@ -70,10 +132,11 @@ def add_mesh_group_modifier(mesh, target_group=None, offset=Vector((0, 0, 0))):
 
     if check_modifier is False:
         geo_node_modifier = mesh.modifiers.new(name=GROUP_MOD, type="NODES")
-        geo_node_modifier.node_group = bpy.data.node_groups[GROUP_NODE]
+        geo_node_modifier.node_group = node_group
     else:
         geo_node_modifier = mesh.modifiers[GROUP_MOD]
-        geo_node_modifier.node_group = bpy.data.node_groups[GROUP_NODE]
+        if geo_node_modifier.node_group != node_group:
+            geo_node_modifier.node_group = node_group
 
     # set Collection Instance to target group
     geo_node_modifier[MG_SOCKET_GROUP] = target_group
@@ -116,36 +179,22 @@ def add_array_modifier(mesh):
         array_modifier = mesh.modifiers.new(name="CAT_Array", type="ARRAY")
 
 
-def realize_mesh_group_modifier(mesh, realize=True):
-    """Realize Geometry Nodes Mesh Group Modifier"""
-    # check if the mesh has the modifier
-    check_modifier = False
-
-    for modifier in mesh.modifiers:
-        if modifier.name == GROUP_MOD:
-            check_modifier = True
-            geo_node_modifier = mesh.modifiers[GROUP_MOD]
-            geo_node_modifier[MG_SOCKET_REALIZE] = realize
-            # 刷新gn， 否则结果不会更新
-            mesh.modifiers[GROUP_MOD].show_viewport = True
-            break
-
-    if check_modifier is False:
-        print("Mesh does not have the Mesh Group modifier")
-
-    return check_modifier
-
-
-def check_is_mesh_group_instance(obj):
-    """Check if the object is a Mesh Group instance"""
+def check_is_mesh_group_instance(obj, group_node=None):
+    """Check if the object is a Mesh Group instance
+    直接按 GROUP_MOD 名称取 modifier, 传入 group_node 时只按 node group 身份比较, 不再比较名称
+    """
     if obj.type != "MESH" or obj.get(CUSTOM_NAME) != INSTANCE_NAME:
         return False
 
-    for modifier in obj.modifiers:
-        if modifier.type == "NODES" and modifier.node_group:
-            if modifier.node_group.name == GROUP_NODE:
-                return True
-    return False
+    modifier = obj.modifiers.get(GROUP_MOD)
+    if modifier is None or modifier.type != "NODES":
+        return False
+    node_group = modifier.node_group
+    if node_group is None:
+        return False
+    if group_node is not None:
+        return node_group == group_node
+    return node_group.name == GROUP_NODE
 
 
 def set_work_mode(work_mode):
@@ -293,46 +342,59 @@ def set_work_mode(work_mode):
             bpy.context.space_data.show_object_select_empty = True
 
 
-def find_objs_bb_center(objs) -> Vector:
-    """Find the center of the bounding box of all objects"""
+def get_objs_world_bb_corners(objs) -> np.ndarray:
+    """一次性收集所有 object 的 bound_box 与 matrix_world, 返回 world space 角点 (N*8, 3)"""
+
+    objs = list(objs)
+    if not objs:
+        return np.empty((0, 3), dtype=np.float64)
+
+    local_corners = np.empty((len(objs), 8, 3), dtype=np.float64)
+    matrices = np.empty((len(objs), 4, 4), dtype=np.float64)
+    for index, obj in enumerate(objs):
+        local_corners[index] = obj.bound_box
+        matrices[index] = obj.matrix_world
 
-    all_coords = []
-    for obj in objs:
-        bb = obj.bound_box
-        mat = obj.matrix_world
-        for vert in bb:
-            coord = mat @ Vector(vert)
-            all_coords.append(coord)
+    world_corners = np.einsum("nij,nkj->nki", matrices[:, :3, :3], local_corners)
+    world_corners += matrices[:, np.newaxis, :3, 3]
+    return world_corners.reshape(-1, 3)
 
-    if not all_coords:
-        return Vector((0, 0, 0))
 
-    center = sum(all_coords, Vector((0, 0, 0))) / len(all_coords)
-    return center
+def calculate_bb_pivots(world_corners) -> dict:
+    """根据 world space 角点计算全部 pivot: CORNERS 为角点平均, AABB 为真实包围盒"""
 
+    if len(world_corners) == 0:
+        origin = Vector((0, 0, 0))
+        return {
+            (pivot, bounds_mode): origin.copy()
+            for pivot in ("CENTER", "LOWEST")
+            for bounds_mode in ("CORNERS", "AABB")
+        }
 
-def find_objs_bb_lowest_center(objs) -> Vector:
-    """Find the lowest_center of the bounding box of all objects"""
+    corner_mean = world_corners.mean(axis=0)
+    bounds_min = world_corners.min(axis=0)
+    bounds_max = world_corners.max(axis=0)
+    aabb_center = (bounds_min + bounds_max) * 0.5
+    lowest_z = bounds_min[2]
+    return {
+        ("CENTER", "CORNERS"): Vector(corner_mean),
+        ("LOWEST", "CORNERS"): Vector((corner_mean[0], corner_mean[1], lowest_z)),
+        ("CENTER", "AABB"): Vector(aabb_center),
+        ("LOWEST", "AABB"): Vector((aabb_center[0], aabb_center[1], lowest_z)),
+    }
 
-    all_coords = []
-    for obj in objs:
-        bb = obj.bound_box
-        mat = obj.matrix_world
-        for vert in bb:
-            coord = mat @ Vector(vert)
-            all_coords.append(coord)
 
-    if not all_coords:
-        return Vector((0, 0, 0))
+def find_objs_bb_pivot(objs, pivot="CENTER", bounds_mode="CORNERS") -> Vector:
+    """Find the CENTER / LOWEST pivot of all objects, CORNERS or AABB bounds mode"""
 
-    # Find the lowest Z value among all bounding box coordinates
-    lowest_z = min(coord.z for coord in all_coords)
-    # Find the center in X and Y
-    center_xy = sum(
-        (Vector((coord.x, coord.y, 0)) for coord in all_coords), Vector((0, 0, 0))
-    ) / len(all_coords)
-    center = Vector((center_xy.x, center_xy.y, lowest_z))
-    return center
+    pivots = calculate_bb_pivots(get_objs_world_bb_corners(objs))
+    return pivots[(pivot, bounds_mode)]
+
+
+def find_objs_bb_center(objs, bounds_mode="CORNERS") -> Vector:
+    """Find the center of the bounding box of all objects"""
+
+    return find_objs_bb_pivot(objs, "CENTER", bounds_mode)
 
 
 def find_selected_element_center() -> Vector:
@@ -389,3 +451,51 @@ def clean_user(target_object: bpy.types.Object) -> None:
     """如果所选object有多个user，转为single user"""
     if target_object.users > 1:
         target_object.data = target_object.data.copy()
+
+
+# 常见 attribute 类型每个元素的字节数，用于粗略估算 mesh 内存
+MESH_ATTRIBUTE_BYTES = {
+    "FLOAT": 4,
+    "INT": 4,
+    "FLOAT_VECTOR": 12,
+    "FLOAT_COLOR": 16,
+    "BYTE_COLOR": 4,
+    "BOOLEAN": 1,
+    "FLOAT2": 8,
+    "INT8": 1,
+    "INT32_2D": 8,
+    "QUATERNION": 16,
+    "FLOAT4X4": 64,
+}
+
+
+def estimate_mesh_bytes(mesh) -> int:
+    """估算 mesh datablock 的几何数据大小 (positions, edges, corners, faces 与自定义 attribute)"""
+    vertex_count = len(mesh.vertices)
+    edge_count = len(mesh.edges)
+    loop_count = len(mesh.loops)
+    face_count = len(mesh.polygons)
+    domain_sizes = {
+        "POINT": vertex_count,
+        "EDGE": edge_count,
+        "CORNER": loop_count,
+        "FACE": face_count,
+    }
+
+    # position float3, edge int2, corner vert/edge int, face offset int
+    total = vertex_count * 12 + edge_count * 8 + loop_count * 8 + face_count * 4
+    for attribute in mesh.attributes:
+        if attribute.name == "position" or attribute.name.startswith("."):
+            continue
+        element_bytes = MESH_ATTRIBUTE_BYTES.get(attribute.data_type, 4)
+        total += domain_sizes.get(attribute.domain, 0) * element_bytes
+    return total
+
+
+def format_bytes(byte_count) -> str:
+    """把字节数格式化为便于阅读的字符串"""
+    size = float(byte_count)
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024